@@ -0,0 +1,47 @@
+# Compares JSON decode time of ids= batch payloads across the installed backends.
+#
+#   python -m benchmarks.bench_json --tweets 100 --number 200
+
+import argparse
+import json
+import timeit
+from typing import Callable, Dict
+
+from benchmarks import payloads
+from twitter_api_v2 import Json
+
+
+def batch_payload(count: int) -> bytes:
+    return json.dumps(
+        {
+            "data": [payloads.full_tweet(i) for i in range(count)],
+            "includes": {"users": [payloads.full_user(i) for i in range(count)]},
+        }
+    ).encode("utf-8")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--tweets", type=int, default=100)
+    parser.add_argument("--number", type=int, default=200)
+    args: argparse.Namespace = parser.parse_args()
+
+    body: bytes = batch_payload(args.tweets)
+
+    decoders: Dict[str, Callable[[bytes], object]] = {
+        # What TwitterAPI did before: json.loads(response.text)
+        "json(text)": lambda data: json.loads(data.decode("utf-8")),
+        **Json.BACKENDS,
+    }
+
+    print(f"payload: {len(body) / 1024:.0f} KiB ({args.tweets} tweets)")
+    print(f"{'backend':<12} {'ms/decode':>10}")
+    for name, loads in decoders.items():
+        seconds: float = min(
+            timeit.repeat(lambda: loads(body), number=args.number, repeat=3)
+        )
+        print(f"{name:<12} {seconds / args.number * 1e3:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Reports bytes per object and construction time of the models.
+#
+#   python -m benchmarks.bench_memory --count 100000
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks import payloads
+from twitter_api_v2 import Tweet, User
+
+
+def bytes_per_object(build: Callable[[Dict], object], data: List[Dict]) -> float:
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    objects: List[object] = [build(item) for item in data]
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del objects
+    return (after - before) / len(data)
+
+
+def seconds_per_object(build: Callable[[Dict], object], data: List[Dict]) -> float:
+    start: float = time.perf_counter()
+    for item in data:
+        build(item)
+    return (time.perf_counter() - start) / len(data)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    args: argparse.Namespace = parser.parse_args()
+
+    cases: Dict[str, Callable[[Dict], object]] = {
+        "tweet": lambda data: Tweet.Tweet(**data),
+        "tweet(lazy)": lambda data: Tweet.Tweet(**data, lazy=True),
+        "user": lambda data: User.User(**data),
+    }
+    datasets: Dict[str, List[Dict]] = {
+        "minimal": [payloads.minimal_tweet(i) for i in range(args.count)],
+        "full": [payloads.full_tweet(i) for i in range(args.count)],
+        "user": [payloads.full_user(i) for i in range(args.count)],
+    }
+
+    print(f"{'case':<12} {'payload':<8} {'bytes/obj':>10} {'us/obj':>8}")
+    for case, build in cases.items():
+        for payload, data in datasets.items():
+            if (case == "user") != (payload == "user"):
+                continue
+            print(
+                f"{case:<12} {payload:<8} "
+                f"{bytes_per_object(build, data):>10.0f} "
+                f"{seconds_per_object(build, data) * 1e6:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
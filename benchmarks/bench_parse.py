@@ -0,0 +1,184 @@
+# Measures throughput and allocations of model construction and _make_params,
+# and compares them with a saved baseline to catch regressions.
+#
+#   python -m benchmarks.bench_parse --output before.json
+#   python -m benchmarks.bench_parse --baseline before.json --output after.json
+#
+# Exits with 1 when a case is slower or allocates more than --tolerance.
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks import payloads
+from twitter_api_v2 import Media, Poll, Tweet, User
+from twitter_api_v2.Includes import Includes
+from twitter_api_v2.TwitterAPI import TwitterAPI
+
+# (build one object, inputs)
+Case = Tuple[Callable[[Any], object], List[Any]]
+
+
+def make_cases(count: int) -> Dict[str, Case]:
+    response: Dict = payloads.includes_response(count)
+
+    def parse_response(res_json: Dict) -> object:
+        includes: Includes = Includes(res_json["includes"])
+        return [TwitterAPI._parse_tweet(data, includes) for data in res_json["data"]]
+
+    return {
+        "tweet/minimal": (
+            lambda data: Tweet.Tweet(**data),
+            [payloads.minimal_tweet(i) for i in range(count)],
+        ),
+        "tweet/full": (
+            lambda data: Tweet.Tweet(**data),
+            [payloads.full_tweet(i) for i in range(count)],
+        ),
+        "tweet/full(lazy)": (
+            lambda data: Tweet.Tweet(**data, lazy=True),
+            [payloads.full_tweet(i) for i in range(count)],
+        ),
+        "tweet/entities": (
+            lambda data: Tweet.Tweet(**data),
+            [payloads.entities_heavy_tweet(i) for i in range(count)],
+        ),
+        # One response of `count` tweets; reported per tweet.
+        "tweet/includes": (parse_response, [response]),
+        "user/full": (
+            lambda data: User.User(**data),
+            [payloads.full_user(i) for i in range(count)],
+        ),
+        "media": (Media.Media, [payloads.media(i) for i in range(count)]),
+        "poll": (Poll.Poll, [payloads.poll(i) for i in range(count)]),
+        "make_params": (
+            lambda fields: TwitterAPI._make_params(*fields),
+            [
+                (
+                    list(Tweet.Expantion),
+                    list(Tweet.Field),
+                    list(Media.Field),
+                    list(Poll.Field),
+                )
+            ]
+            * count,
+        ),
+    }
+
+
+def objects_per_input(name: str, count: int) -> int:
+    return count if name == "tweet/includes" else 1
+
+
+def measure(build: Callable[[Any], object], inputs: List[Any], repeat: int) -> float:
+    # Best seconds per input over `repeat` runs.
+    def run() -> None:
+        for item in inputs:
+            build(item)
+
+    run()  # warm up
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / len(inputs)
+
+
+def allocations(build: Callable[[Any], object], inputs: List[Any]) -> Tuple[int, int]:
+    # Bytes and memory blocks retained by the built objects.
+    tracemalloc.start()
+    before: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+    objects: List[object] = [build(item) for item in inputs]
+    after: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del objects
+
+    stats: List[tracemalloc.StatisticDiff] = after.compare_to(before, "filename")
+    return (
+        sum(stat.size_diff for stat in stats),
+        sum(stat.count_diff for stat in stats),
+    )
+
+
+def run_cases(count: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (build, inputs) in make_cases(count).items():
+        per_input: int = objects_per_input(name, count)
+        seconds: float = measure(build, inputs, repeat) / per_input
+        size, blocks = allocations(build, inputs)
+        results[name] = {
+            "ops_per_sec": 1 / seconds,
+            "bytes_per_op": size / len(inputs) / per_input,
+            "blocks_per_op": blocks / len(inputs) / per_input,
+        }
+
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    # Returns the regressed cases.
+    regressions: List[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base: Dict[str, float] = baseline[name]
+        slower: bool = result["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance)
+        larger: bool = result["bytes_per_op"] > base["bytes_per_op"] * (1 + tolerance)
+        if slower or larger:
+            regressions.append(name)
+
+    return regressions
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args: argparse.Namespace = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = run_cases(args.count, args.repeat)
+    baseline: Dict[str, Dict[str, float]] = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    print(
+        f"{'case':<18} {'ops/s':>10} {'bytes/op':>10} {'blocks/op':>10} {'vs base':>8}"
+    )
+    for name, result in results.items():
+        change: str = ""
+        if name in baseline:
+            ratio: float = result["ops_per_sec"] / baseline[name]["ops_per_sec"]
+            change = f"{(ratio - 1) * 100:+.1f}%"
+        print(
+            f"{name:<18} {result['ops_per_sec']:>10.0f} "
+            f"{result['bytes_per_op']:>10.0f} {result['blocks_per_op']:>10.1f} "
+            f"{change:>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "count": args.count,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if regressions := compare(results, baseline, args.tolerance):
+        print(f"Regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Compares size and speed of pickle, JSON of to_dict() and msgpack for Tweet/User.
+#
+#   python -m benchmarks.bench_serialization --count 1000 --number 20
+
+import argparse
+import json
+import pickle
+import timeit
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks import payloads
+from twitter_api_v2 import Serialization
+from twitter_api_v2.Includes import Includes
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.User import User
+
+# (dumps, loads) of a list of models
+Format = Tuple[Callable[[List[Any]], bytes], Callable[[bytes], List[Any]]]
+
+
+def decoded(data: Dict) -> Dict:
+    # As decoded from a response, with a string object per value instead of
+    # the ones the payloads share, which pickle would store once.
+    return json.loads(json.dumps(data))
+
+
+def make_cases(count: int) -> Dict[str, List[Any]]:
+    res_json: Dict = decoded(payloads.includes_response(count))
+    includes: Includes = Includes(res_json["includes"])
+    return {
+        "full": [Tweet(**decoded(payloads.full_tweet(i))) for i in range(count)],
+        "entities": [
+            Tweet(**decoded(payloads.entities_heavy_tweet(i))) for i in range(count)
+        ],
+        "includes": [includes.resolve(Tweet(**data)) for data in res_json["data"]],
+        "user": [User(**decoded(payloads.full_user(i))) for i in range(count)],
+    }
+
+
+def json_dumps(models: List[Any]) -> bytes:
+    return json.dumps([model.to_dict() for model in models]).encode("utf-8")
+
+
+def json_loads(data: bytes) -> List[Any]:
+    # Only for a list of one kind of model, as in make_cases().
+    items: List[Dict] = json.loads(data)
+    from_dict: Callable[[Dict], Any] = (
+        User.from_dict if items and "username" in items[0] else Tweet.from_dict
+    )
+    return [from_dict(item) for item in items]
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    args: argparse.Namespace = parser.parse_args()
+
+    formats: Dict[str, Format] = {
+        "pickle-5": (lambda models: pickle.dumps(models, 5), pickle.loads),
+        "json": (json_dumps, json_loads),
+    }
+    if Serialization.msgpack is not None:
+        formats["msgpack"] = (Serialization.dumps, Serialization.loads)
+
+    print(
+        f"{'case':<10} {'format':<9} {'bytes/obj':>10} "
+        f"{'dump us/obj':>12} {'load us/obj':>12}"
+    )
+    for case, models in make_cases(args.count).items():
+        for name, (dumps, loads) in formats.items():
+            data: bytes = dumps(models)
+            dump: float = timeit.timeit(lambda: dumps(models), number=args.number)
+            load: float = timeit.timeit(lambda: loads(data), number=args.number)
+            scale: float = 1e6 / args.number / len(models)
+            print(
+                f"{case:<10} {name:<9} {len(data) / len(models):>10.0f} "
+                f"{dump * scale:>12.2f} {load * scale:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+from typing import Dict, List
+
+# Representative "data" objects of Twitter API v2 responses.
+# ref: https://developer.twitter.com/en/docs/twitter-api/data-dictionary/object-model/tweet
+
+
+def minimal_tweet(i: int) -> Dict:
+    return {
+        "id": str(1212092628029698048 + i),
+        "text": f"We believe the best future version of our API will come from building it with YOU. #{i}",
+    }
+
+
+def full_tweet(i: int) -> Dict:
+    return {
+        **minimal_tweet(i),
+        "author_id": "2244994945",
+        "conversation_id": str(1212092628029698048 + i),
+        "created_at": "2019-12-31T19:26:16.000Z",
+        "lang": "en",
+        "possibly_sensitive": False,
+        "source": "Twitter Web App",
+        "public_metrics": {
+            "retweet_count": 7,
+            "reply_count": 3,
+            "like_count": 38,
+            "quote_count": 4,
+        },
+        "context_annotations": [
+            {
+                "domain": {
+                    "id": "46",
+                    "name": "Brand Category",
+                    "description": "Categories within Brand Verticals that narrow down the scope of Brands",
+                },
+                "entity": {
+                    "id": "781974596752842752",
+                    "name": "Services",
+                },
+            },
+            {
+                "domain": {
+                    "id": "47",
+                    "name": "Brand",
+                    "description": "Brands and Companies",
+                },
+                "entity": {"id": "10045225402", "name": "Twitter"},
+            },
+        ],
+        "entities": {
+            "annotations": [
+                {
+                    "start": 78,
+                    "end": 84,
+                    "probability": 0.4688,
+                    "type": "Organization",
+                    "normalized_text": "Twitter",
+                }
+            ],
+            "hashtags": [{"start": 86, "end": 92, "tag": "TwitterDev"}],
+            "mentions": [{"start": 0, "end": 11, "tag": "TwitterAPI"}],
+            "urls": [
+                {
+                    "start": 95,
+                    "end": 118,
+                    "url": "https://t.co/yvxdK6aOo2",
+                    "expanded_url": "https://twitter.com/LovesNandos/status/1211797914437259264/photo/1",
+                    "display_url": "pic.twitter.com/yvxdK6aOo2",
+                }
+            ],
+        },
+    }
+
+
+def full_user(i: int) -> Dict:
+    return {
+        "id": str(2244994945 + i),
+        "name": "Twitter Dev",
+        "username": f"TwitterDev{i}",
+        "created_at": "2013-12-14T04:35:55.000Z",
+        "description": "The voice of the #TwitterDev team and your official source for updates.",
+        "location": "127.0.0.1",
+        "pinned_tweet_id": "1255542774432063488",
+        "profile_image_url": "https://pbs.twimg.com/profile_images/1283786620521652229/lEODkLTh_normal.jpg",
+        "protected": False,
+        "verified": True,
+        "url": "https://t.co/3ZX3TNiZCY",
+        "public_metrics": {
+            "followers_count": 513962,
+            "following_count": 2039,
+            "tweet_count": 3635,
+            "listed_count": 1672,
+        },
+        "entities": {
+            "url": {
+                "urls": [
+                    {
+                        "start": 0,
+                        "end": 23,
+                        "url": "https://t.co/3ZX3TNiZCY",
+                        "expanded_url": "https://developer.twitter.com/en/community",
+                        "display_url": "developer.twitter.com/en/community",
+                    }
+                ]
+            },
+            "description": {
+                "hashtags": [{"start": 17, "end": 28, "tag": "TwitterDev"}],
+            },
+        },
+    }
+
+
+def entities_heavy_tweet(i: int) -> Dict:
+    # A full tweet with many entities and context annotations.
+    tweet: Dict = full_tweet(i)
+    tweet["entities"] = {
+        "annotations": [
+            {
+                "start": n * 10,
+                "end": n * 10 + 6,
+                "probability": 0.5,
+                "type": "Organization",
+                "normalized_text": f"Org{n}",
+            }
+            for n in range(5)
+        ],
+        "cashtags": [
+            {"start": n * 6, "end": n * 6 + 5, "tag": "TWTR"} for n in range(3)
+        ],
+        "hashtags": [
+            {"start": n * 8, "end": n * 8 + 7, "tag": f"tag{n}"} for n in range(10)
+        ],
+        "mentions": [
+            {"start": n * 9, "end": n * 9 + 8, "tag": f"user{n}"} for n in range(10)
+        ],
+        "urls": [
+            {
+                "start": n * 24,
+                "end": n * 24 + 23,
+                "url": f"https://t.co/{n:010d}",
+                "expanded_url": f"https://example.com/{i}/{n}",
+                "display_url": f"example.com/{i}/{n}",
+            }
+            for n in range(5)
+        ],
+    }
+    tweet["context_annotations"] = tweet["context_annotations"] * 5
+    return tweet
+
+
+def media(i: int) -> Dict:
+    return {
+        "media_key": f"3_{1212092628029698048 + i}",
+        "type": "video",
+        "height": 720,
+        "width": 1280,
+        "duration_ms": 46947,
+        "preview_image_url": "https://pbs.twimg.com/ext_tw_video_thumb/1/pu/img/a.jpg",
+        "public_metrics": {"view_count": 1162},
+    }
+
+
+def poll(i: int) -> Dict:
+    return {
+        "id": str(1199786642468413448 + i),
+        "options": [
+            {"position": 1, "label": "“C Sharp”", "votes": 795},
+            {"position": 2, "label": "“C Hashtag”", "votes": 156},
+        ],
+        "duration_minutes": 1440,
+        "end_datetime": "2019-11-28T20:26:41.000Z",
+        "voting_status": "closed",
+    }
+
+
+def includes_response(count: int) -> Dict:
+    # An ids= response whose tweets have media or a poll and an author.
+    data: List[Dict] = []
+    for i in range(count):
+        tweet: Dict = full_tweet(i)
+        tweet["author_id"] = str(2244994945 + i % 10)
+        if i % 2:
+            tweet["attachments"] = {"poll_ids": [poll(i)["id"]]}
+        else:
+            tweet["attachments"] = {"media_keys": [media(i)["media_key"]]}
+        data.append(tweet)
+
+    return {
+        "data": data,
+        "includes": {
+            "media": [media(i) for i in range(0, count, 2)],
+            "polls": [poll(i) for i in range(1, count, 2)],
+            "users": [full_user(i) for i in range(min(count, 10))],
+        },
+    }
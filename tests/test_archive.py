@@ -0,0 +1,129 @@
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from twitter_api_v2 import Archive
+from twitter_api_v2.Columnar import TweetColumns
+from twitter_api_v2.Error import Error
+from twitter_api_v2.User import User
+
+RESPONSES: List[Dict] = [
+    {
+        "data": [
+            {"id": str(i), "text": f"t{i}", "author_id": "10"}
+            for i in range(n * 3, n * 3 + 3)
+        ],
+        "includes": {"users": [{"id": "10", "name": "a", "username": "a"}]},
+    }
+    for n in range(10)
+] + [{"data": {"id": "30", "text": "t30"}}]
+
+
+def write(path: Path, responses: List[Dict]) -> str:
+    lines: bytes = b"".join(
+        json.dumps(response).encode() + b"\n" for response in responses
+    )
+    if path.suffix == ".gz":
+        path.write_bytes(gzip.compress(lines))
+    else:
+        path.write_bytes(lines)
+    return str(path)
+
+
+@pytest.fixture(params=["dump.ndjson", "dump.ndjson.gz"])
+def dump(request: Any, tmp_path: Path) -> str:
+    return write(tmp_path / request.param, RESPONSES)
+
+
+def test_split(dump: str) -> None:
+    chunks: List[Archive.Chunk] = list(Archive.split(dump, 100))
+
+    assert len(chunks) > 2, "file should be split."
+
+    data: List[Any] = [Archive.parse_chunk(chunk) for chunk in chunks]
+    ids: List[str] = [tweet.id for batch in data for tweet in batch]
+    assert ids == [str(i) for i in range(31)], "chunks should end on a line."
+
+
+def test_load_models(dump: str) -> None:
+    batches: List[Any] = list(Archive.load(dump, chunk_size=100, workers=2))
+    tweets: List[Any] = [tweet for batch in batches for tweet in batch]
+
+    assert [tweet.id for tweet in tweets] == [str(i) for i in range(31)], "in order."
+    assert tweets[0].author.username == "a", "includes should be resolved."
+    assert tweets[30].author is None, "single lookups should be parsed."
+
+    unordered: List[Any] = list(
+        Archive.load([dump, dump], chunk_size=100, workers=2, ordered=False)
+    )
+    assert sorted(tweet.id for batch in unordered for tweet in batch) == sorted(
+        [str(i) for i in range(31)] * 2
+    ), "every file should be parsed."
+
+
+def test_load_columns(dump: str, tmp_path: Path) -> None:
+    batches: List[Any] = list(
+        Archive.load(dump, output="columns", chunk_size=100, workers=2)
+    )
+
+    assert all(isinstance(batch, TweetColumns) for batch in batches)
+    assert sum(len(batch) for batch in batches) == 31, "every row should be kept."
+
+    users: str = write(
+        tmp_path / "users.ndjson",
+        [
+            {"data": [{"id": str(i), "name": "n", "username": f"u{i}"}]}
+            for i in range(5)
+        ],
+    )
+    user_batches: List[Any] = list(Archive.load(users, "users"))
+    assert [user.username for batch in user_batches for user in batch] == [
+        f"u{i}" for i in range(5)
+    ], "users should be parsed."
+
+    with pytest.raises(ValueError):
+        next(Archive.load(dump, "spaces"))
+
+
+def test_read(dump: str) -> None:
+    items: List[Any] = list(Archive.read(dump))
+
+    assert [tweet.id for _, tweet in items] == [str(i) for i in range(31)]
+    assert items[0][1].author.username == "a", "includes should be resolved."
+    assert items[0][0] == 0 and items[3][0] > 0, "offsets are of the lines."
+
+    resumed: List[Any] = list(Archive.read(dump, offset=items[6][0]))
+    assert [tweet.id for _, tweet in resumed] == [
+        str(i) for i in range(6, 31)
+    ], "reading should resume at the offset."
+
+    with pytest.raises(ValueError):
+        next(Archive.read(dump, "spaces"))
+
+
+def test_read_errors(tmp_path: Path) -> None:
+    path: str = write(
+        tmp_path / "errors.ndjson",
+        [
+            {
+                "data": [{"id": "1", "name": "n", "username": "u"}],
+                "errors": [{"title": "Not Found Error", "value": "2"}],
+            },
+            {"errors": [{"title": "Not Found Error", "value": "3"}]},
+        ],
+    )
+    (tmp_path / "empty.ndjson").write_bytes(b"")
+
+    users: List[Any] = list(Archive.read(path, "users"))
+    assert [user.id for _, user in users] == ["1"], "errors are skipped by default."
+    items: List[Any] = [item for _, item in Archive.read(path, "users", errors=True)]
+    assert [item.id if isinstance(item, User) else item.value for item in items] == [
+        "1",
+        "2",
+        "3",
+    ], "partial errors should follow the objects of their response."
+    assert isinstance(items[1], Error)
+    assert list(Archive.read(str(tmp_path / "empty.ndjson"))) == []
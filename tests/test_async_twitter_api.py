@@ -0,0 +1,88 @@
+import asyncio
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from twitter_api_v2 import Tweet, User
+from twitter_api_v2.AsyncTwitterAPI import AsyncTwitterAPI, gather_bounded
+from twitter_api_v2.FakeServer import FakeServer
+
+
+def test_get_tweet_and_users() -> None:
+    async def lookup() -> None:
+        async with AsyncTwitterAPI(os.environ["TWITTER_BEARER_TOKEN"]) as client:
+            tweet: Tweet.Tweet = await client.get_tweet(
+                "1212092628029698048", tweet_fields=[Tweet.Field.AUTHOR_ID]
+            )
+            users: Dict[str, User.User] = (
+                await client.get_users_by_ids([tweet.author_id or ""])
+            )[0]
+
+        assert tweet.author_id == "2244994945", "User ID is wrong."
+        assert users["2244994945"].username == "TwitterDev", "username is wrong."
+
+    asyncio.run(lookup())
+
+
+def test_gather_bounded() -> None:
+    running: List[int] = [0]
+    peak: List[int] = [0]
+
+    async def job(value: int) -> int:
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0)
+        running[0] -= 1
+        return value * 2
+
+    results: List[int] = asyncio.run(
+        gather_bounded((job(i) for i in range(1000)), limit=8)
+    )
+
+    assert results == [i * 2 for i in range(1000)], "results should keep order."
+    assert peak[0] <= 8, "concurrency should be bounded."
+
+
+def test_gather_bounded_exceptions() -> None:
+    async def job(value: int) -> int:
+        if value % 2:
+            raise ValueError(value)
+        return value
+
+    results: List = asyncio.run(
+        gather_bounded((job(i) for i in range(4)), limit=2, return_exceptions=True)
+    )
+    assert results[0] == 0 and results[2] == 2, "results are wrong."
+    assert isinstance(results[1], ValueError), "exception should be returned."
+
+    with pytest.raises(ValueError):
+        asyncio.run(gather_bounded((job(i) for i in range(4)), limit=2))
+
+
+def test_batch_lookups_are_bounded() -> None:
+    users: List[Dict] = [
+        {"id": str(i), "name": "n", "username": f"u{i}"} for i in range(1000)
+    ]
+    peak: List[int] = [0, 0]
+
+    async def lookup(url: str) -> Dict[str, User.User]:
+        async with AsyncTwitterAPI("token", api_url=url, max_concurrency=3) as client:
+            call = client._call
+
+            async def counted(*args: Any) -> Any:
+                peak[0] += 1
+                peak[1] = max(peak)
+                try:
+                    return await call(*args)
+                finally:
+                    peak[0] -= 1
+
+            client._call = counted  # type: ignore
+            return (await client.get_users_by_ids([user["id"] for user in users]))[0]
+
+    with FakeServer(users=users, latency=0.01) as server:
+        found: Dict[str, User.User] = asyncio.run(lookup(server.url))
+
+    assert len(found) == 1000, "every chunk should be fetched."
+    assert 1 < peak[1] <= 3, "chunks should run concurrently up to the limit."
@@ -0,0 +1,72 @@
+from typing import Dict, List
+
+from twitter_api_v2 import Tweet, TwitterAPI, User
+from twitter_api_v2.Cache import ResponseCache, make_field_set
+
+
+class Clock:
+    def __init__(self, now: float) -> None:
+        self.now: float = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_make_field_set() -> None:
+    assert make_field_set(None) == frozenset(), "empty params should be empty."
+    assert make_field_set({"tweet.fields": "lang,source"}) == make_field_set(
+        {"tweet.fields": "source,lang"}
+    ), "order of fields should not matter."
+    assert make_field_set({"ids": "1,2"}) == frozenset(), "ids should be ignored."
+
+
+def test_ttl() -> None:
+    clock: Clock = Clock(0.0)
+    cache: ResponseCache = ResponseCache(ttl=10.0, clock=clock)
+    cache.set("/tweets/:id", "1", None, "tweet")
+
+    assert cache.get("/tweets/:id", "1", None) == "tweet", "entry should hit."
+
+    clock.now = 10.0
+    assert cache.get("/tweets/:id", "1", None) is None, "entry should expire."
+    assert len(cache) == 0, "expired entry should be removed."
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_lru_eviction() -> None:
+    cache: ResponseCache = ResponseCache(maxsize=2)
+    cache.set("/tweets/:id", "1", None, "1")
+    cache.set("/tweets/:id", "2", None, "2")
+    cache.get("/tweets/:id", "1", None)
+    cache.set("/tweets/:id", "3", None, "3")
+
+    assert cache.get("/tweets/:id", "2", None) is None, "LRU entry should be evicted."
+    assert cache.get("/tweets/:id", "1", None) == "1", "recently used should stay."
+    assert cache.evictions == 1, "evictions is wrong."
+
+
+def test_superset_of_fields() -> None:
+    cache: ResponseCache = ResponseCache()
+    cache.set("/users/:id", "1", {"user.fields": "created_at,location"}, "full")
+
+    assert cache.get("/users/:id", "1", {"user.fields": "location"}) == "full"
+    assert cache.get("/users/:id", "1", None) == "full", "no fields is a subset."
+    assert cache.get("/users/:id", "1", {"user.fields": "url"}) is None
+
+
+def test_client_uses_cache() -> None:
+    cache: ResponseCache = ResponseCache()
+    client: TwitterAPI.TwitterAPI = TwitterAPI.TwitterAPI("", cache=cache)
+
+    tweet: Tweet.Tweet = Tweet.Tweet(id="1", text="cached", lang="en")
+    cache.set("/tweets/:id", "1", {"tweet.fields": "lang,source"}, tweet)
+    user: User.User = User.User(id="2", name="Name", username="UserName")
+    client._cache_user(None, user)
+
+    assert client.get_tweet("1", tweet_fields=[Tweet.Field.LANG]) is tweet
+    tweets: List[Tweet.Tweet] = client.get_tweets(["1"])[0]
+    assert tweets == [tweet], "batch lookup should hit."
+    assert client.get_user_by_id("2") is user, "user should hit by ID."
+    assert client.get_user_by_username("username") is user, "user should hit."
+    users: Dict[str, User.User] = client.get_users_by_usernames(["USERNAME"])[0]
+    assert users == {"USERNAME": user}, "key should be the given username."
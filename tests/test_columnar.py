@@ -0,0 +1,112 @@
+from typing import Dict, List, Tuple
+
+import pytest
+
+from benchmarks import payloads
+from twitter_api_v2 import Columnar
+from twitter_api_v2.Columnar import (
+    MISSING_INT,
+    TWEET_SCHEMA,
+    Columns,
+    TweetColumns,
+    UserColumns,
+)
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.User import User
+
+numpy = pytest.importorskip("numpy")
+
+
+def tweet_data() -> List[Dict]:
+    return [payloads.full_tweet(0), payloads.minimal_tweet(1)]
+
+
+def test_tweet_columns_to_numpy() -> None:
+    array = TweetColumns(tweet_data()).to_numpy()
+
+    assert array.shape == (2,), "one row per tweet."
+    assert array["id"].dtype == numpy.int64, "id should be int64."
+    assert array["id"][0] == 1212092628029698048, "id should be parsed."
+    assert array["author_id"][1] == MISSING_INT, "missing ints should be -1."
+    assert array["created_at"][0] == numpy.datetime64(
+        "2019-12-31T19:26:16.000"
+    ), "created_at should be datetime64."
+    assert numpy.isnat(array["created_at"][1]), "missing created_at should be NaT."
+    assert array["like_count"][0] == 38, "public metrics should be columns."
+    assert array["hashtags"][0] == ["TwitterDev"], "hashtags should be a list."
+    assert array["mentions"][0] == ["TwitterAPI"], "mentions should be a list."
+    assert array["hashtags"][1] == [], "missing hashtags should be empty."
+
+
+def test_models_and_raw_match() -> None:
+    raw = TweetColumns(tweet_data()).to_numpy()
+    models = TweetColumns([Tweet(**data) for data in tweet_data()]).to_numpy()
+    lazy = TweetColumns([Tweet(**data, lazy=True) for data in tweet_data()]).to_numpy()
+
+    for name, _ in TWEET_SCHEMA:
+        if name == "created_at":
+            assert (
+                raw[name][0] == models[name][0] == lazy[name][0]
+            ), "created_at should match."
+        else:
+            assert list(raw[name]) == list(models[name]), f"{name} should match."
+            assert list(raw[name]) == list(lazy[name]), f"{name} should match."
+
+
+def test_extend_response() -> None:
+    columns: TweetColumns = TweetColumns()
+    columns.extend_response({"data": payloads.full_tweet(0)})
+    columns.extend_response({"data": tweet_data()})
+    columns.extend_response({"errors": []})
+
+    assert len(columns) == 3, "single and batch responses should be appended."
+
+
+def test_user_columns() -> None:
+    data: List[Dict] = [payloads.full_user(0), payloads.full_user(1)]
+    raw = UserColumns(data).to_numpy()
+    models = UserColumns([User(**user) for user in data]).to_numpy()
+
+    assert list(raw["username"]) == list(models["username"]), "usernames match."
+    assert list(raw["followers_count"]) == list(
+        models["followers_count"]
+    ), "metrics should match."
+
+
+def test_to_arrow() -> None:
+    pyarrow = pytest.importorskip("pyarrow")
+    table = TweetColumns(tweet_data()).to_arrow()
+
+    assert table.num_rows == 2, "one row per tweet."
+    assert table.schema.field("created_at").type == pyarrow.timestamp(
+        "ms", tz="UTC"
+    ), "created_at should be a UTC timestamp."
+    assert table.column("author_id").null_count == 1, "missing ints are null."
+
+
+def test_to_arrow_requires_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(Columnar, "numpy", None)
+
+    with pytest.raises(ImportError, match="numpy"):
+        TweetColumns(tweet_data()).to_arrow()
+
+
+def test_to_pandas() -> None:
+    pytest.importorskip("pandas")
+    frame = TweetColumns(tweet_data()).to_pandas()
+
+    assert len(frame) == 2, "one row per tweet."
+    assert str(frame["created_at"].dtype).startswith(
+        "datetime64"
+    ), "created_at should be datetime."
+    assert frame["author_id"].isna().iloc[1], "missing ints are NA."
+
+
+def test_columns_is_abstract() -> None:
+    class Incomplete(Columns):
+        def _from_raw(self, data: Dict) -> Tuple:
+            return ()
+
+    with pytest.raises(TypeError):
+        Incomplete()  # type: ignore
@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from twitter_api_v2.DiskCache import DiskCache, decode_field_set, encode_field_set
+from twitter_api_v2.Includes import select_includes
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.TwitterAPI import TwitterAPI
+
+
+class Clock:
+    def __init__(self, now: float) -> None:
+        self.now: float = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def write_entries(path: str, start: int) -> None:
+    cache: DiskCache = DiskCache(path)
+    for i in range(start, start + 50):
+        cache.set("/tweets/:id", str(i), None, {"data": {"id": str(i)}})
+    cache.close()
+
+
+def test_field_set_round_trip() -> None:
+    field_set = frozenset({("tweet.fields", "lang"), ("expansions", "author_id")})
+
+    assert decode_field_set(encode_field_set(field_set)) == field_set
+    assert decode_field_set(encode_field_set(frozenset())) == frozenset()
+
+
+def test_survives_reopen(tmp_path: Any) -> None:
+    path: str = os.path.join(tmp_path, "cache.sqlite3")
+    cache: DiskCache = DiskCache(path)
+    cache.set("/tweets/:id", "1", {"tweet.fields": "lang,source"}, {"data": 1})
+    cache.close()
+
+    reopened: DiskCache = DiskCache(path)
+    assert reopened.get("/tweets/:id", "1", {"tweet.fields": "lang,source"}) == {
+        "data": 1
+    }, "entry should be read after reopening."
+    assert reopened.get("/tweets/:id", "1", {"tweet.fields": "source"}) == {
+        "data": 1
+    }, "superset of the fields should hit."
+    assert (
+        reopened.get("/tweets/:id", "1", {"tweet.fields": "geo"}) is None
+    ), "other fields should miss."
+    assert reopened.get("/users/:id", "1", None) is None, "endpoint should match."
+
+
+def test_ttl_and_eviction(tmp_path: Any) -> None:
+    clock: Clock = Clock(0.0)
+    cache: DiskCache = DiskCache(
+        os.path.join(tmp_path, "cache.sqlite3"), ttl=10.0, max_bytes=100, clock=clock
+    )
+    cache.set_many("/tweets/:id", None, {str(i): {"i": i} for i in range(20)})
+
+    clock.now = 10.0
+    found, missing = cache.get_many("/tweets/:id", ["1", "2"], None)
+    assert not found and missing == ["1", "2"], "expired entries should miss."
+
+    clock.now = 11.0
+    cache.set_many("/tweets/:id", None, {str(i): {"i": i} for i in range(20)})
+    cache.evict()
+    assert 0 < len(cache) < 20, "entries over max_bytes should be evicted."
+    assert cache.stats()["evictions"] == 20 - len(cache), "evictions are counted."
+
+
+def test_concurrent_processes(tmp_path: Any) -> None:
+    path: str = os.path.join(tmp_path, "cache.sqlite3")
+    DiskCache(path).close()
+
+    processes: List[multiprocessing.Process] = [
+        multiprocessing.Process(target=write_entries, args=(path, start))
+        for start in (0, 50, 100)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert len(DiskCache(path)) == 150, "every process should write."
+
+
+def test_select_includes() -> None:
+    includes: Dict = {
+        "users": [{"id": "10"}, {"id": "11"}, {"id": "12"}],
+        "media": [{"media_key": "3_1"}, {"media_key": "3_2"}],
+        "tweets": [{"id": "2", "author_id": "11"}],
+    }
+    data: Dict = {
+        "id": "1",
+        "author_id": "10",
+        "attachments": {"media_keys": ["3_2"]},
+        "referenced_tweets": [{"type": "quoted", "id": "2"}],
+    }
+
+    assert select_includes(data, includes) == {
+        "users": [{"id": "10"}, {"id": "11"}],
+        "media": [{"media_key": "3_2"}],
+        "tweets": [{"id": "2", "author_id": "11"}],
+    }, "only the objects data points at should be selected."
+
+
+def test_client_reads_disk_before_network(
+    tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path: str = os.path.join(tmp_path, "cache.sqlite3")
+    requests: List[Dict[str, str]] = []
+
+    def request(endpoint: str, path: str, params: Dict[str, str]) -> Dict:
+        requests.append(params)
+        return {
+            "data": [
+                {"id": id, "text": "t", "author_id": "10"}
+                for id in params["ids"].split(",")
+            ],
+            "includes": {"users": [{"id": "10", "name": "Ten", "username": "ten"}]},
+        }
+
+    client: TwitterAPI = TwitterAPI("token", disk_cache=DiskCache(path))
+    monkeypatch.setattr(client, "_request", request)
+    client.get_tweets(["1", "2"], expansions=[])
+
+    # A new client, as after a restart
+    restarted: TwitterAPI = TwitterAPI("token", disk_cache=DiskCache(path))
+    monkeypatch.setattr(restarted, "_request", request)
+    tweets, _ = restarted.get_tweets(["1", "2", "3"])
+    single: Tweet = restarted.get_tweet("2")
+
+    assert [tweet.id for tweet in tweets] == ["1", "2", "3"], "order is kept."
+    assert requests[1]["ids"] == "3", "stored tweets should not be fetched."
+    assert len(requests) == 2, "single lookup should hit the disk."
+    assert single.author and single.author.username == "ten", "includes stored."
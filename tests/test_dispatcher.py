@@ -0,0 +1,71 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Tuple
+
+import pytest
+
+from twitter_api_v2 import Error, Tweet, TwitterAPI, User
+from twitter_api_v2.Dispatcher import Dispatcher
+
+
+class BatchClient(TwitterAPI.TwitterAPI):
+    # Answers batch lookups without network and records them.
+    def __init__(self) -> None:
+        super().__init__("")
+        self.requests: List[List[str]] = []
+
+    def get_tweets(
+        self, ids: Iterable[str], *args: Any, **kwargs: Any
+    ) -> Tuple[List[Tweet.Tweet], List[Error.Error]]:
+        ids = list(ids)
+        self.requests.append(ids)
+        return (
+            [Tweet.Tweet(id=id, text=f"text {id}") for id in ids if id != "0"],
+            [Error.Error({"title": "Not Found Error", "value": "0", "detail": "0"})],
+        )
+
+    def get_users_by_usernames(
+        self, usernames: Iterable[str], *args: Any, **kwargs: Any
+    ) -> Tuple[Dict[str, User.User], List[Error.Error]]:
+        usernames = list(usernames)
+        self.requests.append(usernames)
+        return {u: User.User(id=u, name=u, username=u) for u in usernames}, []
+
+
+def test_merge_single_lookups() -> None:
+    client: BatchClient = BatchClient()
+
+    with Dispatcher(client, window=0.05) as dispatcher:
+        with ThreadPoolExecutor(10) as executor:
+            tweets: List[Tweet.Tweet] = list(
+                executor.map(dispatcher.get_tweet, [str(i) for i in range(1, 11)])
+            )
+
+    assert [tweet.id for tweet in tweets] == [str(i) for i in range(1, 11)]
+    assert len(client.requests) == 1, "lookups should be sent as one request."
+
+
+def test_max_batch_size() -> None:
+    client: BatchClient = BatchClient()
+
+    with Dispatcher(client, window=10.0, max_batch_size=2) as dispatcher:
+        futures: List[Future] = [dispatcher.submit_tweet(str(i)) for i in range(1, 6)]
+        assert futures[0].result(timeout=5).id == "1", "full batch should be sent."
+
+    assert sorted(map(len, client.requests)) == [1, 2, 2], "batch size is wrong."
+
+
+def test_missing_and_field_sets() -> None:
+    client: BatchClient = BatchClient()
+
+    with Dispatcher(client, window=0.05) as dispatcher:
+        missing: Future = dispatcher.submit_tweet("0")
+        with_lang: Future = dispatcher.submit_tweet(
+            "1", tweet_fields=[Tweet.Field.LANG]
+        )
+        user: Future = dispatcher.submit_user_by_username("TwitterDev")
+
+    with pytest.raises(Exception):
+        missing.result()
+    assert with_lang.result().id == "1", "tweet is wrong."
+    assert user.result().username == "twitterdev", "user is wrong."
+    assert len(client.requests) == 3, "each kind and field set is a batch."
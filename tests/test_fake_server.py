@@ -0,0 +1,141 @@
+import json
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from twitter_api_v2 import Tweet
+from twitter_api_v2.FakeServer import FakeServer
+from twitter_api_v2.RateLimit import RateLimiter
+from twitter_api_v2.Stream import Stream
+from twitter_api_v2.TwitterAPI import TwitterAPI
+
+TWEETS: List[Dict] = [
+    {
+        "id": str(i),
+        "text": f"tweet {i}",
+        "author_id": "10",
+        "lang": "en",
+        "attachments": {"media_keys": [f"3_{i}"]},
+    }
+    for i in range(1, 26)
+]
+USERS: List[Dict] = [
+    {"id": "10", "name": "Ten", "username": "ten", "location": "here"},
+    {"id": "11", "name": "Eleven", "username": "eleven"},
+]
+MEDIA: List[Dict] = [{"media_key": f"3_{i}", "type": "photo"} for i in range(1, 26)]
+
+
+@pytest.fixture
+def server() -> Any:
+    with FakeServer(
+        tweets=TWEETS, users=USERS, media=MEDIA, following={"11": ["10"]}
+    ) as server:
+        yield server
+
+
+def test_lookups(server: FakeServer) -> None:
+    client: TwitterAPI = TwitterAPI("token", api_url=server.url)
+
+    tweet: Tweet.Tweet = client.get_tweet(
+        "1",
+        expansions=[Tweet.Expantion.AUTHOR_ID, Tweet.Expantion.MEDIA_KEYS],
+        tweet_fields=[Tweet.Field.LANG],
+    )
+    assert tweet.lang == "en", "requested field should be returned."
+    assert tweet.author and tweet.author.username == "ten", "author is expanded."
+    assert tweet.medias and tweet.medias[0].media_key == "3_1", "media is expanded."
+
+    bare: Tweet.Tweet = client.get_tweet("1")
+    assert bare.lang is None, "fields should not be returned unless requested."
+
+    tweets, errors = client.get_tweets(["2", "999", "3"])
+    assert [tweet.id for tweet in tweets] == ["2", "3"], "found tweets are wrong."
+    assert [error.value for error in errors] == ["999"], "missing ID is an error."
+
+    users, _ = client.get_users_by_usernames(["TEN", "eleven"])
+    assert set(users) == {"TEN", "eleven"}, "usernames are case-insensitive."
+    assert client.get_user_by_id("11").username == "eleven", "user is wrong."
+
+
+def test_pagination(server: FakeServer) -> None:
+    client: TwitterAPI = TwitterAPI("token", api_url=server.url)
+
+    timeline: List[str] = [
+        tweet.id for tweet in client.get_user_tweets("10", max_results=10)
+    ]
+    assert timeline == [str(i) for i in range(25, 0, -1)], "newest first."
+    assert (
+        server.requests.count(("GET", "/users/:id/tweets")) == 3
+    ), "25 tweets should take 3 pages."
+
+    found: List[str] = [
+        tweet.id for tweet in client.search_recent_tweets("tweet 2", prefetch=1)
+    ]
+    assert found[:2] == ["25", "24"], "search should match keywords."
+    assert [user.id for user in client.get_followers("10")] == ["11"]
+    assert [user.id for user in client.get_following("11")] == ["10"]
+
+
+def test_rate_limit(server: FakeServer) -> None:
+    server.rate_limits = {"/tweets/:id": 2}
+    rate_limiter: RateLimiter = RateLimiter()
+    client: TwitterAPI = TwitterAPI("token", api_url=server.url)
+    client.rate_limiter = rate_limiter
+
+    client.get_tweet("1")
+    client.get_tweet("1")
+    bucket = rate_limiter.bucket("/tweets/:id")
+    assert bucket.limit == 2 and bucket.remaining == 0, "headers should be read."
+
+    client.rate_limiter = None
+    with pytest.raises(Exception, match="429"):
+        client.get_tweet("1")
+
+
+def test_injected_errors(server: FakeServer) -> None:
+    client: TwitterAPI = TwitterAPI("token", api_url=server.url)
+    server.inject(503)
+
+    with pytest.raises(Exception, match="503"):
+        client.get_tweet("1")
+    assert client.get_tweet("1").id == "1", "only one request should fail."
+
+    with pytest.raises(Exception, match="401"):
+        TwitterAPI("", api_url=server.url)._send("GET", "/tweets/1").raise_for_status()
+
+
+def test_stream(server: FakeServer) -> None:
+    client: TwitterAPI = TwitterAPI("token", api_url=server.url)
+    stream: Stream = Stream(client)
+
+    rules = stream.add_rules([], dry_run=True)
+    assert rules == [], "no rules should be added."
+
+    tweets: List[str] = []
+    for tweet in stream.sample():
+        tweets.append(tweet.id)
+        if len(tweets) == len(TWEETS):
+            break
+    assert tweets == [tweet["id"] for tweet in TWEETS], "every tweet is streamed."
+
+
+def test_replay(tmp_path: Any) -> None:
+    path: str = os.path.join(tmp_path, "cassette.json")
+    with open(path, "w") as f:
+        json.dump(
+            [
+                {
+                    "key": "GET /2/tweets/1?",
+                    "status": 200,
+                    "headers": {},
+                    "body": {"data": {"id": "1", "text": "recorded"}},
+                }
+            ],
+            f,
+        )
+
+    with FakeServer(cassette=path) as server:
+        client: TwitterAPI = TwitterAPI("token", api_url=server.url)
+        assert client.get_tweet("1").text == "recorded", "reply should be replayed."
@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from twitter_api_v2 import Error
+from twitter_api_v2.FakeServer import FakeServer
+from twitter_api_v2.FanOut import Outcome, fan_out
+from twitter_api_v2.RateLimit import RateLimiter
+from twitter_api_v2.TwitterAPI import TwitterAPI
+
+
+def test_ordered_and_failures() -> None:
+    def fetch(item: int) -> int:
+        time.sleep(0.001 * (10 - item))
+        if item == 3:
+            raise ValueError(item)
+        return item * 2
+
+    outcomes: List[Outcome[int, int]] = list(fan_out(fetch, range(10), 4))
+
+    assert [outcome.item for outcome in outcomes] == list(range(10)), "in order."
+    assert [outcome.value for outcome in outcomes if outcome.ok] == [
+        0,
+        2,
+        4,
+        8,
+        10,
+        12,
+        14,
+        16,
+        18,
+    ], "values should be kept."
+    assert isinstance(outcomes[3].error, ValueError), "failure should be kept."
+
+
+def test_unordered() -> None:
+    def fetch(item: int) -> int:
+        time.sleep(0.05 if item == 0 else 0)
+        return item
+
+    outcomes: List[Outcome[int, int]] = list(fan_out(fetch, range(4), 2, ordered=False))
+
+    assert outcomes[-1].item == 0, "slow item should come last."
+    assert sorted(outcome.index for outcome in outcomes) == [0, 1, 2, 3]
+
+
+def test_bounded() -> None:
+    lock: threading.Lock = threading.Lock()
+    running: List[int] = [0, 0]
+    pulled: List[int] = []
+
+    def items() -> Iterator[int]:
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    def fetch(item: int) -> int:
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.001)
+        with lock:
+            running[0] -= 1
+        return item
+
+    outcomes: Iterator[Outcome[int, int]] = fan_out(fetch, items(), 3)
+    next(outcomes)
+    assert len(pulled) <= 6, "items should be pulled lazily."
+
+    assert len(list(outcomes)) == 99, "every item should be fetched."
+    assert running[1] <= 3, "at most max_workers should run at once."
+
+    with pytest.raises(ValueError):
+        next(fan_out(fetch, [1], 0))
+
+
+def test_close_cancels() -> None:
+    fetched: List[int] = []
+
+    def fetch(item: int) -> int:
+        fetched.append(item)
+        time.sleep(0.01)
+        return item
+
+    outcomes: Iterator[Outcome[int, int]] = fan_out(fetch, range(100), 2)
+    next(outcomes)
+    outcomes.close()  # type: ignore
+
+    assert len(fetched) <= 4, "items not started should be cancelled."
+
+
+def test_client_fetch_many() -> None:
+    tweets: List[Dict] = [{"id": str(i), "text": f"t{i}"} for i in range(16)]
+    rate_limiter: RateLimiter = RateLimiter(burst=20)
+    with FakeServer(tweets=tweets) as server:
+        server.rate_limits = {"/tweets/:id": 20}
+        client: TwitterAPI = TwitterAPI(
+            "token", api_url=server.url, rate_limiter=rate_limiter
+        )
+        client.get_tweet("0")
+
+        outcomes: List[Any] = list(
+            client.fetch_many(client.get_tweet, [str(i) for i in range(1, 16)], 4)
+        )
+        outcomes.extend(client.fetch_many(client.get_tweet, ["99"]))
+
+    assert [outcome.value.id for outcome in outcomes[:15]] == [
+        str(i) for i in range(1, 16)
+    ], "values should be in input order."
+    assert isinstance(
+        outcomes[15].error, Error.ResourceError
+    ), "a missing tweet should fail only its own item."
+    assert (
+        rate_limiter.bucket("/tweets/:id").remaining == 3
+    ), "workers should share the quota of the client."
@@ -0,0 +1,138 @@
+import gc
+import json
+from typing import Dict, List
+
+from twitter_api_v2.IdentityMap import IdentityMap
+from twitter_api_v2.Includes import Includes
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.TwitterAPI import TwitterAPI
+from twitter_api_v2.User import User
+
+
+def page(tweet_id: str, followers: int) -> Dict:
+    # Decoded separately, like two responses.
+    return json.loads(
+        json.dumps(
+            {
+                "data": [
+                    {"id": tweet_id, "text": "t", "author_id": "10", "lang": "en"}
+                ],
+                "includes": {
+                    "users": [
+                        {
+                            "id": "10",
+                            "name": "Ten",
+                            "username": "ten",
+                            "public_metrics": {
+                                "followers_count": followers,
+                                "following_count": 0,
+                                "tweet_count": 0,
+                                "listed_count": 0,
+                            },
+                        }
+                    ]
+                },
+            }
+        )
+    )
+
+
+def parse(res_json: Dict, identity_map: IdentityMap) -> List[Tweet]:
+    includes: Includes = Includes(res_json["includes"], False, identity_map)
+    return [
+        TwitterAPI._parse_tweet(data, includes, False, identity_map)
+        for data in res_json["data"]
+    ]
+
+
+def test_repeated_author_is_shared() -> None:
+    identity_map: IdentityMap = IdentityMap()
+    first: Tweet = parse(page("1", 1), identity_map)[0]
+    second: Tweet = parse(page("2", 2), identity_map)[0]
+
+    assert first.author is second.author, "same author should be one instance."
+    assert first.author and first.author.public_metrics
+    assert (
+        first.author.public_metrics.followers_count == 2
+    ), "later fields should be visible to earlier holders."
+    assert first.lang is second.lang, "lang should be interned."
+
+
+def test_without_identity_map() -> None:
+    first: Tweet = TwitterAPI._parse_tweet(
+        page("1", 1)["data"][0], Includes(page("1", 1)["includes"])
+    )
+    second: Tweet = TwitterAPI._parse_tweet(
+        page("2", 2)["data"][0], Includes(page("2", 2)["includes"])
+    )
+
+    assert first.author is not second.author, "authors should not be shared."
+
+
+def test_update_keeps_missing_fields() -> None:
+    identity_map: IdentityMap = IdentityMap()
+    full: Tweet = identity_map.tweet(
+        Tweet(
+            "1",
+            "text",
+            lang="ja",
+            created_at="2019-12-31T19:26:16.000Z",
+            entities={"hashtags": [{"start": 0, "end": 1, "tag": "a"}]},
+        )
+    )
+    lazy: Tweet = identity_map.tweet(
+        Tweet("1", "edited", entities={"hashtags": []}, lazy=True)
+    )
+
+    assert lazy is full, "same ID should return the known instance."
+    assert full.text == "edited", "new fields should be taken."
+    assert full.lang == "ja", "fields missing in the update should be kept."
+    assert full.created_at and full.created_at.year == 2019, "created_at is kept."
+    assert full.entities and full.entities.hashtags == [], "entities are updated."
+
+
+def test_instances_are_held_weakly() -> None:
+    identity_map: IdentityMap = IdentityMap()
+    user: User = identity_map.user(User("10", "Ten", "ten"))
+
+    assert identity_map.get_user("10") is user, "user should be known."
+    del user
+    gc.collect()
+    assert identity_map.get_user("10") is None, "unreferenced user is dropped."
+    assert len(identity_map) == 0, "map should be empty."
+
+
+def test_reparse_without_expansions_keeps_links() -> None:
+    identity_map: IdentityMap = IdentityMap()
+    data: Dict = {
+        "id": "1",
+        "text": "t",
+        "author_id": "10",
+        "attachments": {"media_keys": ["3_1"]},
+        "referenced_tweets": [{"type": "quoted", "id": "2"}],
+    }
+    includes: Includes = Includes(
+        {
+            "users": [{"id": "10", "name": "Ten", "username": "ten"}],
+            "media": [{"media_key": "3_1", "type": "photo"}],
+            "tweets": [{"id": "2", "text": "quoted", "author_id": "10"}],
+        },
+        False,
+        identity_map,
+    )
+    tweet: Tweet = TwitterAPI._parse_tweet(data, includes, False, identity_map)
+
+    again: Tweet = TwitterAPI._parse_tweet(
+        json.loads(json.dumps(data)), Includes(None), False, identity_map
+    )
+    # The included tweet is seen again without its author's expansion too.
+    Includes(
+        {"tweets": [{"id": "2", "text": "quoted", "author_id": "10"}]},
+        False,
+        identity_map,
+    )
+
+    assert again is tweet, "same ID should be one instance."
+    assert tweet.author and tweet.author.username == "ten", "author should stay."
+    assert tweet.medias and tweet.medias[0].media_key == "3_1", "media should stay."
+    assert tweet.referenced and tweet.referenced[0][1].author, "links should stay."
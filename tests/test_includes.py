@@ -0,0 +1,99 @@
+from typing import Dict, List
+
+from twitter_api_v2.Includes import Includes
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.TwitterAPI import TwitterAPI
+
+SAMPLE_RESPONSE: Dict = {
+    "data": [
+        {
+            "id": "1",
+            "text": "photo",
+            "author_id": "10",
+            "attachments": {"media_keys": ["3_1"]},
+            "referenced_tweets": [{"type": "quoted", "id": "3"}],
+        },
+        {
+            "id": "2",
+            "text": "poll",
+            "author_id": "11",
+            "in_reply_to_user_id": "10",
+            "attachments": {"poll_ids": ["100"]},
+        },
+    ],
+    "includes": {
+        "media": [
+            {"media_key": "3_1", "type": "photo"},
+            {"media_key": "3_2", "type": "video"},
+        ],
+        "polls": [
+            {"id": "100", "options": [{"position": 1, "label": "A", "votes": 0}]}
+        ],
+        "users": [
+            {"id": "10", "name": "Ten", "username": "ten"},
+            {"id": "11", "name": "Eleven", "username": "eleven"},
+        ],
+        "tweets": [
+            {
+                "id": "3",
+                "text": "quoted",
+                "author_id": "11",
+                "attachments": {"media_keys": ["3_2"]},
+            }
+        ],
+    },
+}
+
+
+def parse(lazy: bool) -> List[Tweet]:
+    includes: Includes = Includes(SAMPLE_RESPONSE["includes"], lazy)
+    return [
+        TwitterAPI._parse_tweet(data, includes, lazy)
+        for data in SAMPLE_RESPONSE["data"]
+    ]
+
+
+def test_index() -> None:
+    includes: Includes = Includes(SAMPLE_RESPONSE["includes"])
+
+    assert set(includes.media) == {"3_1", "3_2"}, "media should be keyed."
+    assert set(includes.users) == {"10", "11"}, "users should be keyed."
+    assert set(includes.polls) == {"100"}, "polls should be keyed."
+    assert set(includes.tweets) == {"3"}, "tweets should be keyed."
+    assert not Includes(None).media, "missing includes should be empty."
+
+
+def test_resolve_own_objects() -> None:
+    for lazy in (False, True):
+        photo, poll = parse(lazy)
+
+        assert photo.medias and [m.media_key for m in photo.medias] == [
+            "3_1"
+        ], "tweet should only get its own media."
+        assert photo.polls is None, "tweet without poll should have no polls."
+        assert photo.author and photo.author.username == "ten", "author is wrong."
+
+        assert poll.medias is None, "tweet without media should have no media."
+        assert poll.polls and poll.polls[0].id == "100", "poll is wrong."
+        assert poll.author and poll.author.username == "eleven", "author is wrong."
+        assert poll.in_reply_to_user is photo.author, "users should be shared."
+
+
+def test_resolve_referenced_tweets() -> None:
+    photo, poll = parse(False)
+
+    assert photo.referenced, "referenced tweet should be resolved."
+    kind, quoted = photo.referenced[0]
+    assert kind == "quoted", "reference type is wrong."
+    assert quoted.text == "quoted", "referenced tweet is wrong."
+    assert quoted.author is poll.author, "referenced tweet should be resolved too."
+    assert quoted.medias and quoted.medias[0].media_key == "3_2", "media is wrong."
+    assert poll.referenced is None, "tweet without references has none."
+
+
+def test_attachments_without_includes() -> None:
+    data: Dict = SAMPLE_RESPONSE["data"][0]
+    tweet: Tweet = TwitterAPI._parse_tweet(data, Includes({"users": []}))
+
+    assert tweet.medias is None, "media without its expansion was not requested."
+    assert tweet.polls is None, "tweet without poll should have no polls."
@@ -0,0 +1,143 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from twitter_api_v2.AsyncTwitterAPI import AsyncTwitterAPI
+from twitter_api_v2.FakeServer import FakeServer
+from twitter_api_v2.Instrumentation import Instrumentation, RequestMetrics
+from twitter_api_v2.TwitterAPI import TwitterAPI
+
+TWEETS: List[Dict] = [
+    {"id": str(i), "text": f"tweet {i}", "author_id": "10"} for i in range(1, 16)
+]
+USERS: List[Dict] = [{"id": "10", "name": "Ten", "username": "ten"}]
+
+
+@pytest.fixture
+def server() -> Any:
+    with FakeServer(tweets=TWEETS, users=USERS) as server:
+        yield server
+
+
+def test_request_metrics(server: FakeServer) -> None:
+    recorded: List[RequestMetrics] = []
+    client: TwitterAPI = TwitterAPI(
+        "token", api_url=server.url, instrumentation=Instrumentation([recorded.append])
+    )
+
+    client.get_tweet("1")
+    client.get_tweets(["1", "2"])
+
+    assert [metrics.endpoint for metrics in recorded] == [
+        "/tweets/:id",
+        "/tweets",
+    ], "every request should be reported once."
+    for metrics in recorded:
+        assert metrics.status == 200, "status should be reported."
+        assert metrics.response_bytes > 0, "body size should be reported."
+        assert metrics.rate_limit_remaining is not None, "quota should be read."
+        assert metrics.rate_limit_reset is not None, "reset should be read."
+        for phase in (metrics.ttfb, metrics.total, metrics.decode, metrics.parse):
+            assert phase is not None and phase >= 0, "phases should be timed."
+        assert metrics.error is None, "request did not fail."
+
+
+def test_failed_request_metrics(server: FakeServer) -> None:
+    recorded: List[RequestMetrics] = []
+    client: TwitterAPI = TwitterAPI(
+        "token", api_url=server.url, instrumentation=Instrumentation([recorded.append])
+    )
+    server.inject(503)
+
+    with pytest.raises(Exception, match="503"):
+        client.get_tweet("1")
+    assert recorded[0].status == 503, "error status should be reported."
+    assert recorded[0].decode is None, "an error is not decoded."
+    assert recorded[0].parse is None, "an error is not parsed."
+
+    client = TwitterAPI(
+        "token",
+        api_url="http://127.0.0.1:9/2",
+        instrumentation=Instrumentation([recorded.append]),
+    )
+    with pytest.raises(Exception):
+        client.get_tweet("1")
+    assert recorded[1].status == 0, "no response was received."
+    assert recorded[1].error == "ConnectionError", "exception should be named."
+
+
+def test_pagination_metrics(server: FakeServer) -> None:
+    recorded: List[RequestMetrics] = []
+    client: TwitterAPI = TwitterAPI(
+        "token", api_url=server.url, instrumentation=Instrumentation([recorded.append])
+    )
+
+    assert len(list(client.get_user_tweets("10", max_results=10, prefetch=1))) == 15
+    assert len(recorded) == 2, "each page should be reported."
+    assert all(metrics.parse is not None for metrics in recorded), "parse timed."
+
+
+def test_failing_hook(server: FakeServer) -> None:
+    def hook(metrics: RequestMetrics) -> None:
+        raise ValueError("broken hook")
+
+    client: TwitterAPI = TwitterAPI(
+        "token", api_url=server.url, instrumentation=Instrumentation([hook])
+    )
+    assert client.get_tweet("1").id == "1", "a hook should not fail the request."
+
+
+def test_async_request_metrics(server: FakeServer) -> None:
+    recorded: List[RequestMetrics] = []
+
+    async def lookup() -> None:
+        async with AsyncTwitterAPI(
+            "token",
+            api_url=server.url,
+            instrumentation=Instrumentation([recorded.append]),
+        ) as client:
+            await client.get_tweets([str(i) for i in range(1, 16)])
+            await client.get_user_by_id("10")
+
+    asyncio.run(lookup())
+
+    assert sorted(metrics.endpoint for metrics in recorded) == [
+        "/tweets",
+        "/users/:id",
+    ], "every request should be reported once."
+    for metrics in recorded:
+        assert metrics.status == 200, "status should be reported."
+        assert metrics.dns is not None and metrics.connect is not None, "traced."
+        assert metrics.ttfb is not None and metrics.parse is not None, "timed."
+
+
+def test_prometheus_hook(server: FakeServer) -> None:
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from twitter_api_v2.Instrumentation import PrometheusHook
+
+    registry = prometheus_client.CollectorRegistry()
+    client: TwitterAPI = TwitterAPI(
+        "token",
+        api_url=server.url,
+        instrumentation=Instrumentation([PrometheusHook(registry=registry)]),
+    )
+    client.get_tweet("1")
+    client.get_tweet("2")
+
+    labels: Dict[str, str] = {"endpoint": "/tweets/:id"}
+    assert (
+        registry.get_sample_value(
+            "twitter_api_requests_total",
+            {**labels, "method": "GET", "status": "200"},
+        )
+        == 2
+    ), "requests should be counted by status."
+    assert (
+        registry.get_sample_value("twitter_api_request_total_seconds_count", labels)
+        == 2
+    ), "latency should be observed."
+    assert (
+        registry.get_sample_value("twitter_api_rate_limit_remaining", labels)
+        is not None
+    ), "quota should be set."
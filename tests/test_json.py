@@ -0,0 +1,25 @@
+import json
+from typing import Dict
+
+import pytest
+
+from twitter_api_v2 import Json
+
+SAMPLE_BODY: bytes = json.dumps(
+    {"data": {"id": "1", "text": "こんにちは \U0001f426"}}
+).encode("utf-8")
+
+
+def test_backends_decode_bytes() -> None:
+    expected: Dict = json.loads(SAMPLE_BODY.decode("utf-8"))
+
+    for name, loads in Json.BACKENDS.items():
+        assert loads(SAMPLE_BODY) == expected, f"{name} decodes differently."
+
+
+def test_get_loads() -> None:
+    assert Json.get_loads("json") is json.loads, "stdlib should be selectable."
+    assert Json.get_loads() in Json.BACKENDS.values(), "default should be installed."
+
+    with pytest.raises(ValueError):
+        Json.get_loads("not-installed")
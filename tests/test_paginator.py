@@ -0,0 +1,112 @@
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import pytest
+
+from twitter_api_v2.Paginator import paginate
+from twitter_api_v2.TwitterAPI import TwitterAPI
+from twitter_api_v2.User import User
+
+
+def make_pages(count: int) -> Dict[Optional[str], Dict]:
+    # next_token -> page
+    pages: Dict[Optional[str], Dict] = {}
+    for page in range(count):
+        res_json: Dict = {"data": [page * 2, page * 2 + 1], "meta": {}}
+        if page + 1 < count:
+            res_json["meta"]["next_token"] = f"token{page + 1}"
+        pages[f"token{page}" if page else None] = res_json
+    return pages
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_paginate(prefetch: int) -> None:
+    pages: Dict[Optional[str], Dict] = make_pages(5)
+    fetched: List[Optional[str]] = []
+
+    def fetch_page(next_token: Optional[str]) -> Dict:
+        fetched.append(next_token)
+        return pages[next_token]
+
+    items: List[int] = list(
+        paginate(fetch_page, lambda res_json: res_json["data"], prefetch)
+    )
+
+    assert items == list(range(10)), "items should be yielded in order."
+    assert fetched == [
+        None,
+        "token1",
+        "token2",
+        "token3",
+        "token4",
+    ], "every page should be fetched once."
+
+
+def test_prefetch_overlaps_consumption() -> None:
+    pages: Dict[Optional[str], Dict] = make_pages(4)
+
+    def fetch_page(next_token: Optional[str]) -> Dict:
+        time.sleep(0.05)
+        return pages[next_token]
+
+    def consume(prefetch: int) -> float:
+        start: float = time.monotonic()
+        for _ in paginate(fetch_page, lambda res_json: res_json["data"], prefetch):
+            time.sleep(0.025)
+        return time.monotonic() - start
+
+    assert consume(1) < consume(0), "prefetch should hide the fetch latency."
+
+
+def test_prefetch_propagates_error() -> None:
+    def fetch_page(next_token: Optional[str]) -> Dict:
+        if next_token is not None:
+            raise ValueError("failed")
+        return {"data": [0], "meta": {"next_token": "token1"}}
+
+    items: Iterator[int] = paginate(fetch_page, lambda res_json: res_json["data"], 2)
+
+    assert next(items) == 0, "first page should be yielded."
+    with pytest.raises(ValueError):
+        next(items)
+
+
+def test_prefetch_stops_on_close() -> None:
+    fetched: List[Optional[str]] = []
+
+    def fetch_page(next_token: Optional[str]) -> Dict:
+        fetched.append(next_token)
+        return {"data": [len(fetched)], "meta": {"next_token": "more"}}
+
+    threads: int = threading.active_count()
+    items: Iterator[int] = paginate(fetch_page, lambda res_json: res_json["data"], 2)
+    next(items)
+    items.close()  # type: ignore
+    time.sleep(0.3)
+
+    assert threading.active_count() == threads, "producer thread should exit."
+    assert len(fetched) <= 4, "no more pages should be fetched after close."
+
+
+def test_get_followers(monkeypatch: pytest.MonkeyPatch) -> None:
+    client: TwitterAPI = TwitterAPI("token")
+    requested: List[Dict[str, str]] = []
+
+    def request(endpoint: str, path: str, params: Dict[str, str]) -> Dict[str, Any]:
+        requested.append(params)
+        if "pagination_token" in params:
+            return {"data": [{"id": "2", "name": "b", "username": "b"}], "meta": {}}
+        return {
+            "data": [{"id": "1", "name": "a", "username": "a"}],
+            "meta": {"next_token": "next"},
+        }
+
+    monkeypatch.setattr(client, "_request", request)
+    users: List[User] = list(client.get_followers("0", max_results=1))
+
+    assert [user.id for user in users] == ["1", "2"], "both pages should be read."
+    assert requested == [
+        {"max_results": "1"},
+        {"max_results": "1", "pagination_token": "next"},
+    ], "next_token should be sent as pagination_token."
@@ -0,0 +1,75 @@
+from typing import Dict, List
+
+from twitter_api_v2.RateLimit import Bucket, RateLimiter
+
+
+class Clock:
+    def __init__(self, now: float) -> None:
+        self.now: float = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def headers(limit: int, remaining: int, reset: float) -> Dict[str, str]:
+    return {
+        "x-rate-limit-limit": str(limit),
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(int(reset)),
+    }
+
+
+def test_unknown_quota_does_not_wait() -> None:
+    bucket: Bucket = Bucket(clock=Clock(1000.0))
+
+    assert bucket.reserve() == 0.0, "Bucket without headers should not wait."
+
+
+def test_spread_over_window() -> None:
+    clock: Clock = Clock(1000.0)
+    bucket: Bucket = Bucket(clock=clock)
+    bucket.update(headers(300, 10, 1100.0), 200)
+
+    delays: List[float] = [bucket.reserve() for _ in range(3)]
+
+    assert delays == [0.0, 10.0, 20.0], "requests should be spaced evenly."
+    assert bucket.remaining == 7, "remaining should be consumed."
+
+
+def test_burst() -> None:
+    bucket: Bucket = Bucket(burst=3, clock=Clock(1000.0))
+    bucket.update(headers(300, 10, 1100.0), 200)
+
+    delays: List[float] = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:3] == [0.0, 0.0, 0.0], "burst should be sent back to back."
+    assert delays[3] > 0.0, "requests after burst should wait."
+
+
+def test_wait_until_reset_when_exhausted() -> None:
+    clock: Clock = Clock(1000.0)
+    bucket: Bucket = Bucket(window=900.0, clock=clock)
+    bucket.update(headers(300, 0, 1060.0), 429)
+
+    assert bucket.reserve() == 60.0, "exhausted bucket should wait for reset."
+    assert bucket.reset == 1960.0, "window should roll over."
+    assert bucket.remaining == 299, "quota should be refilled."
+
+
+def test_lowest_remaining_wins_in_same_window() -> None:
+    bucket: Bucket = Bucket(clock=Clock(1000.0))
+    bucket.update(headers(300, 5, 1100.0), 200)
+    bucket.update(headers(300, 8, 1100.0), 200)
+
+    assert bucket.remaining == 5, "stale response should not raise remaining."
+
+    bucket.update(headers(300, 299, 2000.0), 200)
+    assert bucket.remaining == 299, "new window should reset remaining."
+
+
+def test_buckets_are_per_endpoint() -> None:
+    limiter: RateLimiter = RateLimiter(clock=Clock(1000.0))
+    limiter.update("/tweets/:id", headers(300, 0, 1100.0), 429)
+
+    assert limiter.bucket("/tweets/:id").remaining == 0, "remaining is wrong."
+    assert limiter.bucket("/users/:id").remaining is None, "bucket should be new."
@@ -0,0 +1,176 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+import requests
+
+from twitter_api_v2 import Error
+from twitter_api_v2.AsyncTwitterAPI import AsyncTwitterAPI
+from twitter_api_v2.FakeServer import FakeServer
+from twitter_api_v2.Retry import CircuitBreaker, RetryPolicy
+from twitter_api_v2.TwitterAPI import TwitterAPI
+
+TWEETS: List[Dict] = [{"id": "1", "text": "one"}]
+
+
+@pytest.fixture
+def server() -> Any:
+    with FakeServer(tweets=TWEETS) as server:
+        yield server
+
+
+def test_response_errors() -> None:
+    assert isinstance(
+        Error.response_error("/tweets", 404, ""), Error.NotFoundError
+    ), "404 should be NotFoundError."
+    assert isinstance(
+        Error.response_error("/tweets", 403, ""), Error.AuthError
+    ), "403 should be AuthError."
+    assert isinstance(
+        Error.response_error("/tweets", 502, ""), Error.ServerError
+    ), "5xx should be ServerError."
+    assert type(Error.response_error("/tweets", 418, "")) is Error.ResponseError
+
+    error: Error.ResponseError = Error.response_error(
+        "/tweets", 429, "", {"retry-after": "7", "x-rate-limit-reset": "100"}
+    )
+    assert isinstance(error, Error.RateLimitError), "429 should be RateLimitError."
+    assert error.retry_after == 7.0 and error.reset == 100.0, "headers are read."
+    assert "429" in str(error), "status should be in the message."
+
+
+def test_retry_delays() -> None:
+    policy: RetryPolicy = RetryPolicy(
+        max_retries=3, backoff=1.0, max_backoff=3.0, clock=lambda: 1000.0
+    )
+    server_error: Error.ResponseError = Error.response_error("/tweets", 503, "")
+
+    for attempt, cap in enumerate([1.0, 2.0, 3.0]):
+        delay = policy.delay(attempt, server_error)
+        assert delay is not None and 0 <= delay <= cap, "backoff should be capped."
+    assert policy.delay(3, server_error) is None, "retries should be limited."
+    assert policy.delay(0, requests.ConnectionError()) is not None, "transient."
+    assert policy.delay(0, Error.response_error("/", 404, "")) is None, "final."
+    assert policy.delay(0, server_error, "POST") is None, "POST is not retried."
+
+    jitterless: RetryPolicy = RetryPolicy(
+        backoff=1.0, max_rate_limit_wait=60.0, clock=lambda: 1000.0, jitter=lambda: 0
+    )
+    reset: Error.ResponseError = Error.response_error(
+        "/", 429, "", {"x-rate-limit-reset": "1030"}
+    )
+    assert jitterless.delay(0, reset) == 30.0, "429 should wait until reset."
+    retry_after: Error.ResponseError = Error.response_error(
+        "/", 429, "", {"retry-after": "5", "x-rate-limit-reset": "1030"}
+    )
+    assert jitterless.delay(0, retry_after) == 5.0, "Retry-After should win."
+    far: Error.ResponseError = Error.response_error(
+        "/", 429, "", {"x-rate-limit-reset": "2000"}
+    )
+    assert jitterless.delay(0, far) is None, "too long a wait should raise."
+
+
+def test_circuit_breaker() -> None:
+    now: List[float] = [0.0]
+    breaker: CircuitBreaker = CircuitBreaker(
+        threshold=2, cooldown=10.0, clock=lambda: now[0]
+    )
+
+    breaker.failure("/tweets")
+    breaker.before("/tweets")
+    breaker.failure("/tweets")
+    assert breaker.state("/tweets") == "open", "threshold should open it."
+    with pytest.raises(Error.CircuitOpenError) as raised:
+        breaker.before("/tweets")
+    assert raised.value.retry_after == 10.0, "remaining cooldown is reported."
+    breaker.before("/users")
+
+    now[0] = 10.0
+    assert breaker.state("/tweets") == "half-open", "cooldown has passed."
+    breaker.before("/tweets")
+    with pytest.raises(Error.CircuitOpenError):
+        breaker.before("/tweets")
+    breaker.failure("/tweets")
+    assert breaker.state("/tweets") == "open", "failed trial should reopen it."
+
+    now[0] = 20.0
+    breaker.before("/tweets")
+    breaker.success("/tweets")
+    assert breaker.state("/tweets") == "closed", "successful trial closes it."
+
+
+def test_client_retries(server: FakeServer) -> None:
+    sleeps: List[float] = []
+    client: TwitterAPI = TwitterAPI(
+        "token",
+        api_url=server.url,
+        retry=RetryPolicy(max_retries=2, sleep=sleeps.append),
+    )
+
+    server.inject(503, times=2)
+    assert client.get_tweet("1").id == "1", "should succeed after retries."
+    assert len(sleeps) == 2, "should wait before each retry."
+
+    server.inject(503, times=3)
+    with pytest.raises(Error.ServerError):
+        client.get_tweet("1")
+
+    server.inject(404)
+    with pytest.raises(Error.NotFoundError):
+        client.get_tweet("1")
+    assert len(sleeps) == 4, "404 should not be retried."
+
+    with pytest.raises(Error.ResourceError) as raised:
+        client.get_tweet("999")
+    assert raised.value.error.value == "999", "partial error should be kept."
+
+
+def test_client_rate_limit(server: FakeServer) -> None:
+    server.rate_limits = {"/tweets/:id": 1}
+    sleeps: List[float] = []
+    client: TwitterAPI = TwitterAPI(
+        "token",
+        api_url=server.url,
+        retry=RetryPolicy(max_rate_limit_wait=0.0, sleep=sleeps.append),
+    )
+
+    client.get_tweet("1")
+    with pytest.raises(Error.RateLimitError) as raised:
+        client.get_tweet("1")
+    assert raised.value.reset is not None, "reset should be known."
+    assert sleeps == [], "a wait beyond max_rate_limit_wait should raise."
+
+
+def test_client_circuit_breaker(server: FakeServer) -> None:
+    breaker: CircuitBreaker = CircuitBreaker(threshold=2, cooldown=60.0)
+    client: TwitterAPI = TwitterAPI(
+        "token", api_url=server.url, circuit_breaker=breaker
+    )
+
+    server.inject(500, times=2)
+    for _ in range(2):
+        with pytest.raises(Error.ServerError):
+            client.get_tweet("1")
+    with pytest.raises(Error.CircuitOpenError):
+        client.get_tweet("1")
+    assert len(server.requests) == 2, "open circuit should not send requests."
+    assert client.get_users_by_ids([]) == ({}, []), "other endpoints still work."
+
+
+def test_async_client_retries(server: FakeServer) -> None:
+    async def lookup() -> str:
+        async with AsyncTwitterAPI(
+            "token", api_url=server.url, retry=RetryPolicy(backoff=0.01)
+        ) as client:
+            return (await client.get_tweet("1")).id
+
+    server.inject(502, times=2)
+    assert asyncio.run(lookup()) == "1", "should succeed after retries."
+
+    async def unauthorized() -> None:
+        async with AsyncTwitterAPI("token", api_url=server.url) as client:
+            await client.get_tweet("1")
+
+    server.inject(401)
+    with pytest.raises(Error.AuthError):
+        asyncio.run(unauthorized())
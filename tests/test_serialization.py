@@ -0,0 +1,104 @@
+import json
+import pickle
+from typing import Any, Dict, List
+
+import pytest
+
+from benchmarks import payloads
+from twitter_api_v2 import Serialization
+from twitter_api_v2.Includes import Includes
+from twitter_api_v2.Media import Type
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.User import User
+
+
+def hydrated_tweets() -> List[Tweet]:
+    res_json: Dict = payloads.includes_response(4)
+    includes: Includes = Includes(res_json["includes"])
+    return [includes.resolve(Tweet(**data)) for data in res_json["data"]]
+
+
+def plain(data: Dict) -> Any:
+    # Same values as after a JSON or msgpack round trip, e.g. lists for tuples
+    return json.loads(json.dumps(data))
+
+
+def test_tweet_dict_round_trip() -> None:
+    tweets: List[Tweet] = hydrated_tweets() + [
+        Tweet(**payloads.entities_heavy_tweet(0)),
+        Tweet(**payloads.minimal_tweet(1)),
+    ]
+
+    for original in tweets:
+        data: Dict = plain(original.to_dict())
+        assert plain(Tweet.from_dict(data).to_dict()) == data, "should round trip."
+
+    tweet: Tweet = Tweet.from_dict(plain(tweets[0].to_dict()))
+    assert tweet.created_at == tweets[0].created_at, "created_at is a datetime."
+    assert tweet.author is not None and tweet.author.username == "TwitterDev0"
+    assert tweet.medias is not None and tweet.medias[0].type is Type.VIDEO
+    assert tweet.context_annotations is not None
+    assert tweet.context_annotations[0][0] is not None
+    assert tweet.context_annotations[0][0].name == "Brand Category"
+
+    heavy: Tweet = Tweet.from_dict(plain(tweets[4].to_dict()))
+    assert heavy.entities is not None and heavy.entities.annotations is not None
+    assert heavy.entities.annotations[0].probability == 0.5, "args are in order."
+    assert heavy.entities.urls is not None
+    assert heavy.entities.urls[0].display_url == "example.com/0/0"
+
+    minimal: Dict = tweets[5].to_dict()
+    assert minimal.keys() == {"id", "text", "possibly_sensitive"}, "None is left out."
+    assert "author" not in tweets[0].to_dict(expanded=False)
+
+
+def test_lazy_and_user_round_trip() -> None:
+    data: Dict = payloads.full_tweet(0)
+    assert (
+        Tweet(**data, lazy=True).to_dict() == Tweet(**data).to_dict()
+    ), "lazy fields should be parsed."
+
+    user: User = User(**payloads.full_user(0))
+    copy: User = User.from_dict(plain(user.to_dict()))
+    assert plain(copy.to_dict()) == plain(user.to_dict()), "should round trip."
+    assert copy.description is not None and copy.description.hashtags is not None
+    assert copy.description.hashtags[0].tag == "TwitterDev"
+    assert copy.created_at == user.created_at
+
+
+def test_msgpack() -> None:
+    msgpack = pytest.importorskip("msgpack")
+
+    tweets: List[Tweet] = hydrated_tweets()
+    user: User = User(**payloads.full_user(5))
+    models: List[Any] = [*tweets, user]
+    loaded: List[Any] = Serialization.loads(Serialization.dumps(models))
+
+    assert [plain(model.to_dict()) for model in loaded] == [
+        plain(model.to_dict()) for model in models
+    ], "should round trip."
+    assert loaded[0].author is not loaded[1].author, "different authors."
+
+    shared: List[Tweet] = hydrated_tweets() * 2
+    reloaded: List[Any] = Serialization.loads(Serialization.dumps(shared))
+    assert reloaded[0].author is reloaded[4].author, "shared users are stored once."
+
+    for tweet in tweets:
+        assert set(tweet.to_dict(expanded=False)) <= set(
+            Serialization.TWEET_FIELDS
+        ), "every field should be encoded."
+    assert set(user.to_dict()) <= set(Serialization.USER_FIELDS)
+
+    unpacked: List[Any] = msgpack.unpackb(Serialization.dumps([user]))
+    unpacked[0] = Serialization.SCHEMA_VERSION + 1
+    with pytest.raises(ValueError):
+        Serialization.loads(msgpack.packb(unpacked))
+
+
+def test_pickle() -> None:
+    tweets: List[Tweet] = hydrated_tweets()
+    loaded: List[Tweet] = pickle.loads(pickle.dumps(tweets, 5))
+
+    assert [plain(tweet.to_dict()) for tweet in loaded] == [
+        plain(tweet.to_dict()) for tweet in tweets
+    ], "models should still pickle."
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from twitter_api_v2.SingleFlight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_call() -> None:
+    single_flight: SingleFlight = SingleFlight()
+    calls: List[int] = []
+    started: threading.Event = threading.Event()
+
+    def fetch() -> object:
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return object()
+
+    with ThreadPoolExecutor(8) as executor:
+        leader = executor.submit(single_flight.do, "key", fetch)
+        started.wait()
+        followers = [executor.submit(single_flight.do, "key", fetch) for _ in range(7)]
+        results: List[object] = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1, "fetch should be called once."
+    assert all(result is results[0] for result in results), "result should be shared."
+
+    single_flight.do("key", fetch)
+    assert len(calls) == 2, "finished call should not be reused."
+
+
+def test_exception_is_shared() -> None:
+    single_flight: SingleFlight = SingleFlight()
+
+    def fetch() -> None:
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        single_flight.do("key", fetch)
+
+
+def test_async_concurrent_calls_share_one_call() -> None:
+    calls: List[int] = []
+
+    async def fetch() -> object:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def run() -> List[object]:
+        single_flight: AsyncSingleFlight = AsyncSingleFlight()
+        return await asyncio.gather(
+            *[single_flight.do("key", fetch) for _ in range(10)],
+            single_flight.do("other", fetch),
+        )
+
+    results: List[object] = asyncio.run(run())
+
+    assert len(calls) == 2, "fetch should be called once per key."
+    assert all(result is results[0] for result in results[:10]), "result is wrong."
+    assert results[10] is not results[0], "other key should not be shared."
+
+
+def test_async_cancelled_leader_does_not_cancel_followers() -> None:
+    calls: List[int] = []
+
+    async def fetch() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "user"
+
+    async def run() -> str:
+        single_flight: AsyncSingleFlight = AsyncSingleFlight()
+        leader: asyncio.Task = asyncio.ensure_future(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        follower: asyncio.Task = asyncio.ensure_future(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == "user", "follower should still get the result."
+    assert len(calls) == 1, "fetch should not be called again."
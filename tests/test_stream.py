@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import pytest
+import requests
+
+from twitter_api_v2 import Error
+from twitter_api_v2.Stream import MAX_LINE_BYTES, Stream, iter_lines
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.TwitterAPI import TwitterAPI
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, chunks: List[bytes] = []) -> None:
+        self.status_code: int = status_code
+        self.text: str = ""
+        self.__chunks: List[bytes] = chunks
+
+    def __enter__(self) -> "FakeResponse":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def iter_content(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        return iter(self.__chunks)
+
+
+def test_iter_lines() -> None:
+    chunks: List[bytes] = [
+        b'{"a":',
+        b' 1}\r\n\r\n{"b"',
+        b": 2}\r\n",
+        b"\r\n",
+        b'{"c": 3}',
+    ]
+
+    assert list(iter_lines(chunks)) == [
+        b'{"a": 1}',
+        b'{"b": 2}',
+    ], "lines should be joined across chunks, keep-alives and cut lines skipped."
+
+    with pytest.raises(ValueError):
+        list(iter_lines([b"a" * (MAX_LINE_BYTES + 1)]))
+
+
+def test_reconnect(monkeypatch: pytest.MonkeyPatch) -> None:
+    client: TwitterAPI = TwitterAPI("token")
+    line: bytes = json.dumps({"data": {"id": "1", "text": "hello"}}).encode()
+    responses: List[Any] = [
+        requests.ConnectionError("reset"),
+        FakeResponse(503),
+        FakeResponse(429),
+        FakeResponse(200, [line + b"\r\n"]),
+    ]
+
+    def send(*args: Any, **kwargs: Any) -> FakeResponse:
+        response: Any = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(client, "_send", send)
+    sleeps: List[float] = []
+    stream: Stream = Stream(client, sleep=sleeps.append)
+
+    tweet: Tweet = next(stream.sample())
+
+    assert tweet.id == "1", "tweet should be parsed after reconnecting."
+    assert sleeps == [0.25, 5.0, 60.0], "each failure should back off as documented."
+
+
+def test_reconnect_after_end(monkeypatch: pytest.MonkeyPatch) -> None:
+    client: TwitterAPI = TwitterAPI("token")
+    line: bytes = json.dumps({"data": {"id": "1", "text": "hello"}}).encode()
+    responses: List[FakeResponse] = [
+        FakeResponse(200, [line + b"\r\n"]),
+        FakeResponse(200),
+        FakeResponse(200, [line + b"\r\n"]),
+    ]
+    monkeypatch.setattr(client, "_send", lambda *args, **kwargs: responses.pop(0))
+    sleeps: List[float] = []
+    stream: Iterator[Tweet] = Stream(client, sleep=sleeps.append).sample()
+
+    next(stream)
+    next(stream)
+
+    assert sleeps == [0.25, 0.5], "a closed body should back off like a disconnect."
+
+
+def test_reconnect_after_broken_line(monkeypatch: pytest.MonkeyPatch) -> None:
+    client: TwitterAPI = TwitterAPI("token")
+    line: bytes = json.dumps({"data": {"id": "1", "text": "hello"}}).encode()
+    responses: List[FakeResponse] = [
+        FakeResponse(200, [line + b'\r\n{"data":{"id":"2","te']),
+        FakeResponse(200, [b'{"data":{"id":"3",\r\n']),
+        FakeResponse(200, [b"a" * (MAX_LINE_BYTES + 1)]),
+        FakeResponse(200, [line + b"\r\n"]),
+    ]
+    monkeypatch.setattr(client, "_send", lambda *args, **kwargs: responses.pop(0))
+    sleeps: List[float] = []
+    stream: Iterator[Tweet] = Stream(client, sleep=sleeps.append).sample()
+
+    assert next(stream).id == "1"
+    assert next(stream).id == "1", "broken lines should reconnect, not raise."
+    assert sleeps == [0.25, 0.25, 0.5], "each broken stream should back off."
+
+
+def test_empty_responses_hit_max_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    client: TwitterAPI = TwitterAPI("token")
+    monkeypatch.setattr(client, "_send", lambda *args, **kwargs: FakeResponse(200))
+    sleeps: List[float] = []
+    stream: Stream = Stream(client, max_retries=2, sleep=sleeps.append)
+
+    with pytest.raises(Error.TwitterAPIError):
+        next(stream.sample())
+    assert sleeps == [0.25, 0.5, 0.75], "200s without a line should not reset."
+
+
+def test_max_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    client: TwitterAPI = TwitterAPI("token")
+    monkeypatch.setattr(client, "_send", lambda *args, **kwargs: FakeResponse(503))
+    stream: Stream = Stream(client, max_retries=2, sleep=lambda _: None)
+
+    with pytest.raises(Exception):
+        next(stream.filter())
+
+
+def test_consume() -> None:
+    stream: Stream = Stream(TwitterAPI("token"))
+    handled: List[str] = []
+    lock: threading.Lock = threading.Lock()
+
+    def handler(tweet: Tweet) -> None:
+        with lock:
+            handled.append(tweet.id)
+
+    stream.consume((Tweet(str(i), "text") for i in range(100)), handler, workers=4)
+
+    assert sorted(handled, key=int) == [
+        str(i) for i in range(100)
+    ], "every tweet should be handled."
+    assert stream.dropped == 0, "no tweet should be dropped."
+
+
+def test_consume_drops_when_busy(caplog: pytest.LogCaptureFixture) -> None:
+    stream: Stream = Stream(TwitterAPI("token"))
+    handled: Dict[str, bool] = {}
+
+    def handler(tweet: Tweet) -> None:
+        time.sleep(0.05)
+        handled[tweet.id] = True
+
+    stream.consume(
+        (Tweet(str(i), "text") for i in range(20)),
+        handler,
+        workers=1,
+        queue_size=1,
+        block=False,
+    )
+
+    assert stream.dropped > 0, "tweets should be dropped when the queue is full."
+    assert len(handled) + stream.dropped == 20, "every tweet should be counted."
+    assert (
+        len([r for r in caplog.records if "dropped" in r.getMessage()]) == 1
+    ), "drops should be logged at most once a minute."
@@ -1,6 +1,9 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
+from typing import Any, Dict, List
 
 import pytest
 
@@ -326,7 +329,7 @@ def test_context_annotation(client: TwitterAPI.TwitterAPI) -> None:
 
     SAMPLE_CONTEXT_ANNOTATIONS: List[Dict] = SAMPLE_TWEET["context_annotations"]
     for idx, context_annotation in enumerate(tweet.context_annotations):
-        if (domain := context_annotation[0]) :
+        if domain := context_annotation[0]:
             SAMPLE_DOMAIN: Dict = SAMPLE_CONTEXT_ANNOTATIONS[idx]["domain"]
             assert (
                 domain.id == SAMPLE_DOMAIN["id"]
@@ -339,7 +342,7 @@ def test_context_annotation(client: TwitterAPI.TwitterAPI) -> None:
                     domain.description == SAMPLE_DOMAIN["description"]
                 ), f"context_annotation[{idx}].domain.description is wrong."
 
-        if (entity := context_annotation[1]) :
+        if entity := context_annotation[1]:
             SAMPLE_ENTITY: Dict = SAMPLE_CONTEXT_ANNOTATIONS[idx]["entity"]
             assert (
                 entity.id == SAMPLE_ENTITY["id"]
@@ -351,3 +354,94 @@ def test_context_annotation(client: TwitterAPI.TwitterAPI) -> None:
                 assert (
                     entity.description == SAMPLE_ENTITY["description"]
                 ), f"context_annotation[{idx}].domain.description is wrong."
+
+
+def test_get_tweets(client: TwitterAPI.TwitterAPI) -> None:
+    SAMPLE_IDS: List[str] = [
+        "1263145271946551300",
+        "1212092628029698048",
+        "0",
+        "1204084171334832128",
+    ]
+
+    tweets, errors = client.get_tweets(SAMPLE_IDS, tweet_fields=[Tweet.Field.LANG])
+
+    assert [tweet.id for tweet in tweets] == [
+        "1263145271946551300",
+        "1212092628029698048",
+        "1204084171334832128",
+    ], "tweets should be in input order."
+    assert all(tweet.lang for tweet in tweets), "lang should exist."
+    assert len(errors) == 1, "Not found ID should be reported as an error."
+    assert errors[0].value == "0", "error.value should be the missing ID."
+
+
+def test_lazy_tweet() -> None:
+    SAMPLE_RESPONSE: Dict = {
+        "id": "1",
+        "text": "#Python and $TWTR",
+        "author_id": "2244994945",
+        "created_at": "2019-12-31T19:26:16.000Z",
+        "context_annotations": [{"domain": {"id": "46", "name": "Brand Category"}}],
+        "entities": {
+            "hashtags": [{"start": 0, "end": 7, "tag": "Python"}],
+            "cashtags": [{"start": 12, "end": 17, "tag": "TWTR"}],
+        },
+        "media": [{"media_key": "3_1", "type": "photo"}],
+        "polls": [{"id": "1", "options": [{"position": 1, "label": "A", "votes": 0}]}],
+    }
+
+    eager: Tweet.Tweet = Tweet.Tweet(**SAMPLE_RESPONSE)
+    lazy: Tweet.Tweet = Tweet.Tweet(**SAMPLE_RESPONSE, lazy=True)
+
+    assert not eager._raw, "eager tweet should parse everything."
+    assert lazy.author_id == "2244994945", "author_id is wrong."
+    assert set(lazy._raw.keys()) == {
+        "context_annotations",
+        "created_at",
+        "entities",
+        "media",
+        "polls",
+    }, "lazy tweet should not parse on construction."
+
+    assert lazy.created_at == eager.created_at, "created_at is wrong."
+    assert lazy.entities and lazy.entities.hashtags, "hashtags should exist."
+    assert lazy.entities.hashtags[0].tag == "Python", "hashtag is wrong."
+    assert lazy.entities is lazy.entities, "entities should be memoized."
+    assert "entities" not in lazy._raw, "parsed raw field should be released."
+
+    assert lazy.context_annotations and lazy.context_annotations[0][0]
+    assert lazy.context_annotations[0][0].name == "Brand Category"
+    assert lazy.medias and lazy.medias[0].type == Media.Type.PHOTO
+    assert lazy.polls and lazy.polls[0].options[0].label == "A"
+    assert not lazy._raw, "every raw field should be released."
+
+
+def test_lazy_tweet_concurrent_access(monkeypatch: Any) -> None:
+    parse_entities = Tweet.parse_entities
+    barrier: threading.Barrier = threading.Barrier(2)
+
+    def slow_parse_entities(data: Dict) -> Tweet.Entities:
+        entities: Tweet.Entities = parse_entities(data)
+        time.sleep(0.05)
+        return entities
+
+    monkeypatch.setattr(Tweet, "parse_entities", slow_parse_entities)
+    lazy: Tweet.Tweet = Tweet.Tweet(
+        "1",
+        "#Python",
+        entities={"hashtags": [{"start": 0, "end": 7, "tag": "Python"}]},
+        lazy=True,
+    )
+
+    def read(_: int) -> Any:
+        barrier.wait()
+        return lazy.entities
+
+    with ThreadPoolExecutor(2) as executor:
+        results: List[Any] = list(executor.map(read, range(2)))
+
+    assert all(
+        entities is not None for entities in results
+    ), "a concurrent reader should not get None."
+    assert "entities" not in lazy._raw, "parsed raw field should be released."
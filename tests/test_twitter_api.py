@@ -0,0 +1,16 @@
+import os
+
+from twitter_api_v2 import Tweet, TwitterAPI, User
+
+
+def test_reuse_session_with_context_manager() -> None:
+
+    with TwitterAPI.TwitterAPI(
+        os.environ["TWITTER_BEARER_TOKEN"], pool_maxsize=4, timeout=10.0
+    ) as client:
+        tweet: Tweet.Tweet = client.get_tweet("1212092628029698048")
+        user: User.User = client.get_user_by_id("2244994945")
+        user_by_username: User.User = client.get_user_by_username("TwitterDev")
+
+    assert tweet.id == "1212092628029698048", "Tweet ID is wrong."
+    assert user.id == user_by_username.id, "Users should be same."
@@ -190,3 +190,25 @@ def test_entities_for_user(client: TwitterAPI.TwitterAPI) -> None:
     assert (
         user.url.display_url == SAMPLE_USER["url"]["display_url"]
     ), "display_url is wrong."
+
+
+def test_get_users_by_ids(client: TwitterAPI.TwitterAPI) -> None:
+
+    users, errors = client.get_users_by_ids(
+        ["2244994945", "859754215748419584", "0"],
+        user_fields=[User.Field.CREATED_AT],
+    )
+
+    assert set(users.keys()) == {"2244994945", "859754215748419584"}, "IDs are wrong."
+    assert users["2244994945"].username == "TwitterDev", "username is wrong."
+    assert all(user.created_at for user in users.values()), "created_at should exist."
+    assert [error.value for error in errors] == ["0"], "errors are wrong."
+
+
+def test_get_users_by_usernames(client: TwitterAPI.TwitterAPI) -> None:
+
+    users, errors = client.get_users_by_usernames(["twitterdev", "OldBigBuddha"])
+
+    assert set(users.keys()) == {"twitterdev", "OldBigBuddha"}, "keys are wrong."
+    assert users["twitterdev"].id == "2244994945", "User ID is wrong."
+    assert not errors, "errors should not exist."
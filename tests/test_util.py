@@ -0,0 +1,28 @@
+from typing import List
+
+from twitter_api_v2.Entity import Url
+from twitter_api_v2.util import chunked, slots_from_dict, slots_to_dict, unique
+
+
+def test_chunked() -> None:
+    ids: List[str] = [str(i) for i in range(250)]
+
+    chunks: List[List[str]] = list(chunked(ids, 100))
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50], "chunk size is wrong."
+    assert sum(chunks, []) == ids, "chunks should keep order."
+    assert list(chunked([], 100)) == [], "empty input should yield nothing."
+
+
+def test_unique() -> None:
+    assert unique(["3", "1", "3", "2", "1"]) == ["3", "1", "2"], "order is wrong."
+
+
+def test_slots_dict() -> None:
+    url: Url = Url(0, 23, "https://t.co/x", "https://example.com", "example.com")
+
+    data = slots_to_dict(url)
+    assert data["display_url"] == "example.com", "slots should be exported."
+    copy: Url = slots_from_dict(Url, data)
+    assert slots_to_dict(copy) == data, "should round trip."
+    assert slots_from_dict(Url, {"start": 0}).url is None, "missing slots are None."
@@ -0,0 +1,217 @@
+import gzip
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from twitter_api_v2 import Json
+from twitter_api_v2.Columnar import Columns, TweetColumns, UserColumns
+from twitter_api_v2.Error import Error
+from twitter_api_v2.FanOut import Outcome, fan_out
+from twitter_api_v2.Includes import Includes
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.User import User
+
+# Bytes of NDJSON lines handed to a worker at once
+CHUNK_SIZE: int = 8 * 1024 * 1024
+
+# (path, start, end) of a plain file, read by the worker itself, or the
+# lines of a compressed file, which has to be decompressed from the start.
+Chunk = Union[Tuple[str, int, int], bytes]
+
+Batch = Union[List[Tweet], List[User], Columns]
+
+Item = Union[Tweet, User, Error]
+
+
+def load(
+    paths: Union[str, Iterable[str]],
+    kind: str = "tweets",
+    output: str = "models",
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    ordered: bool = True,
+    lazy: bool = False,
+    json_backend: Optional[str] = None,
+) -> Iterator[Batch]:
+    # Parses archived API v2 responses, one JSON response per line, on a
+    # process pool and yields one batch per chunk of lines.
+    #
+    # kind is "tweets" or "users". With output="models", a batch is a list of
+    # Tweet/User objects with their includes resolved; with
+    # output="columns", it is a TweetColumns/UserColumns built straight from
+    # the raw objects, which is faster and much cheaper to send back from the
+    # workers. Batches follow the order of the files unless ordered=False.
+    #
+    # Files ending in .gz are decompressed on this process and their lines
+    # sent to the workers; plain files are split into byte ranges which the
+    # workers read themselves.
+    if kind not in ("tweets", "users"):
+        raise ValueError(f"Unknown kind: {kind}")
+    if output not in ("models", "columns"):
+        raise ValueError(f"Unknown output: {output}")
+
+    if isinstance(paths, str):
+        paths = [paths]
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(workers) as executor:
+        outcome: Outcome[Chunk, Batch]
+        for outcome in fan_out(
+            partial(
+                parse_chunk,
+                kind=kind,
+                output=output,
+                lazy=lazy,
+                json_backend=json_backend,
+            ),
+            (chunk for path in paths for chunk in split(path, chunk_size)),
+            workers,
+            ordered,
+            executor,
+        ):
+            if outcome.error is not None:
+                raise outcome.error
+            yield outcome.value  # type: ignore
+
+
+def split(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Chunk]:
+    # Cuts a file into chunks of about chunk_size bytes which end on a line.
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            yield from _split_stream(f.read, chunk_size)
+        return
+
+    size: int = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start: int = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end: int = min(f.tell(), size)
+            yield (path, start, end)
+            start = end
+
+
+def parse_chunk(
+    chunk: Chunk,
+    kind: str = "tweets",
+    output: str = "models",
+    lazy: bool = False,
+    json_backend: Optional[str] = None,
+) -> Batch:
+    # Runs on a worker process.
+    loads: Json.Loads = Json.get_loads(json_backend)
+    lines: Iterator[Tuple[int, bytes]] = (
+        read_lines(chunk[0], chunk[1], chunk[2])
+        if isinstance(chunk, tuple)
+        else _split_lines(chunk, 0, len(chunk))
+    )
+
+    if output == "columns":
+        columns: Columns = TweetColumns() if kind == "tweets" else UserColumns()
+        for _, line in lines:
+            columns.extend_response(loads(line))
+        return columns
+
+    models: List[Any] = []
+    for _, line in lines:
+        models.extend(parse_response(loads(line), kind, lazy))
+    return models
+
+
+def read(
+    path: str,
+    kind: str = "tweets",
+    offset: int = 0,
+    errors: bool = False,
+    lazy: bool = False,
+    json_backend: Optional[str] = None,
+) -> Iterator[Tuple[int, Item]]:
+    # Yields (offset, model) for every object in the "data" of the responses
+    # of a file, one at a time, where offset is where the line of its
+    # response starts. Memory use does not grow with the size of the file.
+    #
+    # read(path, kind, offset) resumes at the response of that offset, whose
+    # objects yielded before are yielded again. Offsets of .gz files count
+    # decompressed bytes, so resuming one decompresses up to the offset.
+    # With errors=True, the partial errors of a response follow its objects
+    # as Error objects.
+    if kind not in ("tweets", "users"):
+        raise ValueError(f"Unknown kind: {kind}")
+
+    loads: Json.Loads = Json.get_loads(json_backend)
+    for line_offset, line in read_lines(path, offset):
+        res_json: Dict = loads(line)
+        for model in parse_response(res_json, kind, lazy):
+            yield line_offset, model
+        if errors:
+            for error in res_json.get("errors", ()):
+                yield line_offset, Error(error)
+
+
+def read_lines(
+    path: str, start: int = 0, end: Optional[int] = None
+) -> Iterator[Tuple[int, bytes]]:
+    # Yields (offset, line) for the non-blank lines between the offsets.
+    # Plain files are mapped rather than read, so that pages already read are
+    # left to the OS to drop; .gz files are decompressed as they are read.
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            f.seek(start)
+            offset: int = start
+            for line in f:
+                if end is not None and offset >= end:
+                    return
+                if line.strip():
+                    yield offset, line
+                offset += len(line)
+        return
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from _split_lines(
+                buffer, start, len(buffer) if end is None else min(end, len(buffer))
+            )
+
+
+def parse_response(res_json: Dict, kind: str = "tweets", lazy: bool = False) -> List:
+    # Models of the "data" of one response, which is an object for single
+    # lookups and stream lines and a list otherwise.
+    data: Any = res_json.get("data", [])
+    items: List = [data] if isinstance(data, dict) else data
+
+    if kind == "users":
+        return [User(**item) for item in items]
+
+    includes: Includes = Includes(res_json.get("includes"), lazy)
+    return [includes.resolve(Tweet(**item, lazy=lazy)) for item in items]
+
+
+def _split_lines(
+    buffer: Union[bytes, mmap.mmap], start: int, end: int
+) -> Iterator[Tuple[int, bytes]]:
+    while start < end:
+        cut: int = buffer.find(b"\n", start, end)
+        cut = end if cut == -1 else cut + 1
+        line: bytes = buffer[start:cut]
+        if line.strip():
+            yield start, line
+        start = cut
+
+
+def _split_stream(read: Callable[[int], bytes], chunk_size: int) -> Iterator[bytes]:
+    # Reads decompressed blocks and cuts them after their last line.
+    rest: bytes = b""
+    while block := read(chunk_size):
+        block = rest + block
+        if (cut := block.rfind(b"\n") + 1) == 0:
+            rest = block
+            continue
+        yield block[:cut]
+        rest = block[cut:]
+    if rest:
+        yield rest
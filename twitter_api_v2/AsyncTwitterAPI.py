@@ -0,0 +1,525 @@
+import asyncio
+import logging
+import time
+from logging import Logger
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from twitter_api_v2 import Error, Json, Media, Poll, Tweet, User
+from twitter_api_v2.Cache import make_field_set
+from twitter_api_v2.IdentityMap import IdentityMap
+from twitter_api_v2.Includes import Includes
+from twitter_api_v2.Instrumentation import Instrumentation, RequestMetrics
+from twitter_api_v2.RateLimit import RateLimiter
+from twitter_api_v2.Retry import CircuitBreaker, RetryPolicy, is_transient
+from twitter_api_v2.SingleFlight import AsyncSingleFlight
+from twitter_api_v2.TwitterAPI import (
+    API_URL,
+    MAX_IDS_PER_REQUEST,
+    TwitterAPI,
+    check_data,
+)
+from twitter_api_v2.util import chunked, unique
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+logger: Logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def gather_bounded(
+    aws: Iterable[Awaitable[T]], limit: int, return_exceptions: bool = False
+) -> List[Any]:
+    # Like asyncio.gather, but at most `limit` awaitables run at once and
+    # awaitables are pulled from `aws` lazily, so a generator of thousands of
+    # lookups does not create thousands of tasks up front.
+    # Results are returned in input order.
+
+    if limit < 1:
+        raise ValueError("limit must be positive.")
+
+    iterator: Iterator[Tuple[int, Awaitable[T]]] = enumerate(aws)
+    results: Dict[int, Any] = {}
+
+    async def worker() -> None:
+        for idx, aw in iterator:
+            try:
+                results[idx] = await aw
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[idx] = e
+
+    workers: List[asyncio.Task] = [
+        asyncio.ensure_future(worker()) for _ in range(limit)
+    ]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        # Close coroutines which were never started to avoid warnings.
+        for _, aw in iterator:
+            if asyncio.iscoroutine(aw):
+                aw.close()
+        raise
+
+    return [results[idx] for idx in range(len(results))]
+
+
+def _trace_config() -> "aiohttp.TraceConfig":
+    # Records when each phase of a request started and ended into the dict
+    # passed as trace_request_ctx.
+    trace_config: "aiohttp.TraceConfig" = aiohttp.TraceConfig()
+
+    def mark(name: str) -> Callable[[Any, Any, Any], Awaitable[None]]:
+        async def on_signal(session: Any, context: Any, params: Any) -> None:
+            if isinstance(context.trace_request_ctx, dict):
+                context.trace_request_ctx[name] = time.perf_counter()
+
+        return on_signal
+
+    trace_config.on_request_start.append(mark("request_start"))
+    trace_config.on_dns_resolvehost_start.append(mark("dns_start"))
+    trace_config.on_dns_resolvehost_end.append(mark("dns_end"))
+    trace_config.on_connection_create_start.append(mark("connect_start"))
+    trace_config.on_connection_create_end.append(mark("connect_end"))
+    # Fired once the response headers were read
+    trace_config.on_request_end.append(mark("request_end"))
+
+    return trace_config
+
+
+def _read_trace(metrics: RequestMetrics, trace: Dict[str, float]) -> None:
+    # A pooled connection skips DNS and connect, which are then 0.0.
+    dns: float = 0.0
+    if "dns_start" in trace and "dns_end" in trace:
+        dns = trace["dns_end"] - trace["dns_start"]
+    metrics.dns = dns
+
+    metrics.connect = 0.0
+    if "connect_start" in trace and "connect_end" in trace:
+        # Creating a connection includes resolving the host.
+        metrics.connect = trace["connect_end"] - trace["connect_start"] - dns
+
+    if "request_start" in trace and "request_end" in trace:
+        metrics.ttfb = trace["request_end"] - trace["request_start"]
+
+
+class AsyncTwitterAPI:
+    def __init__(
+        self,
+        bearer_token: str,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        timeout: float = 30.0,
+        connect_timeout: float = 3.05,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce: bool = False,
+        lazy: bool = False,
+        json_backend: Optional[str] = None,
+        identity_map: Optional[IdentityMap] = None,
+        api_url: str = API_URL,
+        instrumentation: Optional[Instrumentation] = None,
+        retry: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError("AsyncTwitterAPI requires aiohttp to be installed.")
+
+        self.__BEARER_TOKEN: str = bearer_token
+        self.__REQUEST_HEADERS: Dict = {
+            "Authorization": f"Bearer {self.__BEARER_TOKEN}"
+        }
+
+        self.__API_URL: str = api_url
+
+        # limit is the total number of pooled connections and limit_per_host is
+        # the maximum per host (0 means no per-host limit).
+        # aiohttp requires the session to be created inside a running event
+        # loop, so it is created on the first request.
+        self.__limit: int = limit
+        self.__limit_per_host: int = limit_per_host
+        self.__keepalive_timeout: float = keepalive_timeout
+        self.__timeout: "aiohttp.ClientTimeout" = aiohttp.ClientTimeout(
+            total=timeout, connect=connect_timeout
+        )
+        self.__session: Optional["aiohttp.ClientSession"] = None
+        self.__loads: Json.Loads = Json.get_loads(json_backend)
+
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.lazy: bool = lazy
+        self.identity_map: Optional[IdentityMap] = identity_map
+        self.instrumentation: Optional[Instrumentation] = instrumentation
+        self.retry: Optional[RetryPolicy] = retry
+        self.circuit_breaker: Optional[CircuitBreaker] = circuit_breaker
+        # Requests of one batch lookup in flight at once, by default as many
+        # as pooled connections (limit=0 means no limit to aiohttp).
+        self.max_concurrency: int = max_concurrency or limit or 100
+
+        self.__single_flight: Optional[AsyncSingleFlight] = (
+            AsyncSingleFlight() if coalesce else None
+        )
+
+    async def __aenter__(self) -> "AsyncTwitterAPI":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def get_tweet(
+        self,
+        id: str,
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+    ) -> Tweet.Tweet:
+
+        params: Optional[Dict[str, str]] = TwitterAPI._make_params(
+            expansions, tweet_fields, media_fields, poll_fields
+        )
+
+        return await self._coalesce(
+            "/tweets/:id", id, params, lambda: self._fetch_tweet(id, params)
+        )
+
+    async def get_tweets(
+        self,
+        ids: Iterable[str],
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+    ) -> Tuple[List[Tweet.Tweet], List[Error.Error]]:
+        # Returns found tweets in the order of ids and the errors of missing ones.
+
+        ids = list(ids)
+        params: Dict[str, str] = (
+            TwitterAPI._make_params(expansions, tweet_fields, media_fields, poll_fields)
+            or {}
+        )
+
+        responses: List[Tuple[Dict, List[Tweet.Tweet]]] = await gather_bounded(
+            (
+                self._call(
+                    "/tweets",
+                    "/tweets",
+                    {**params, "ids": ",".join(chunk)},
+                    self._parse_tweets,
+                )
+                for chunk in chunked(unique(ids), MAX_IDS_PER_REQUEST)
+            ),
+            self.max_concurrency,
+        )
+
+        tweets: Dict[str, Tweet.Tweet] = {}
+        errors: List[Error.Error] = []
+        for res_json, chunk_tweets in responses:
+            for tweet in chunk_tweets:
+                tweets[tweet.id] = tweet
+            for error in res_json.get("errors", []):
+                errors.append(Error.Error(error))
+
+        return [tweets[id] for id in ids if id in tweets], errors
+
+    async def get_user_by_id(
+        self, id: str, user_fields: List[User.Field] = []
+    ) -> User.User:
+        params: Optional[Dict[str, str]] = TwitterAPI._make_user_params(user_fields)
+
+        return await self._coalesce(
+            "/users/:id",
+            id,
+            params,
+            lambda: self._fetch_user("/users/:id", f"/users/{id}", params),
+        )
+
+    async def get_user_by_username(
+        self, username: str, user_fields: List[User.Field] = []
+    ) -> User.User:
+        params: Optional[Dict[str, str]] = TwitterAPI._make_user_params(user_fields)
+
+        return await self._coalesce(
+            "/users/by/username/:username",
+            username.lower(),
+            params,
+            lambda: self._fetch_user(
+                "/users/by/username/:username",
+                f"/users/by/username/{username}",
+                params,
+            ),
+        )
+
+    async def get_users_by_ids(
+        self, ids: Iterable[str], user_fields: List[User.Field] = []
+    ) -> Tuple[Dict[str, User.User], List[Error.Error]]:
+        # Returns found users keyed by ID and the errors of missing ones.
+
+        params: Dict[str, str] = TwitterAPI._make_user_params(user_fields) or {}
+
+        responses: List[Tuple[Dict, List[User.User]]] = await gather_bounded(
+            (
+                self._call(
+                    "/users",
+                    "/users",
+                    {**params, "ids": ",".join(chunk)},
+                    self._parse_users,
+                )
+                for chunk in chunked(unique(ids), MAX_IDS_PER_REQUEST)
+            ),
+            self.max_concurrency,
+        )
+
+        users: Dict[str, User.User] = {}
+        errors: List[Error.Error] = []
+        for res_json, chunk_users in responses:
+            for user in chunk_users:
+                users[user.id] = user
+            for error in res_json.get("errors", []):
+                errors.append(Error.Error(error))
+
+        return users, errors
+
+    async def get_users_by_usernames(
+        self, usernames: Iterable[str], user_fields: List[User.Field] = []
+    ) -> Tuple[Dict[str, User.User], List[Error.Error]]:
+        # Returns found users keyed by the given username and the errors of missing
+        # ones. Usernames are case-insensitive, so they are matched as lowercase.
+
+        params: Dict[str, str] = TwitterAPI._make_user_params(user_fields) or {}
+
+        requested: Dict[str, str] = {
+            username.lower(): username for username in usernames
+        }
+        responses: List[Tuple[Dict, List[User.User]]] = await gather_bounded(
+            (
+                self._call(
+                    "/users/by",
+                    "/users/by",
+                    {**params, "usernames": ",".join(chunk)},
+                    self._parse_users,
+                )
+                for chunk in chunked(requested.values(), MAX_IDS_PER_REQUEST)
+            ),
+            self.max_concurrency,
+        )
+
+        users: Dict[str, User.User] = {}
+        errors: List[Error.Error] = []
+        for res_json, chunk_users in responses:
+            for user in chunk_users:
+                users[requested.get(user.username.lower(), user.username)] = user
+            for error in res_json.get("errors", []):
+                errors.append(Error.Error(error))
+
+        return users, errors
+
+    async def _fetch_tweet(
+        self, id: str, params: Optional[Dict[str, str]]
+    ) -> Tweet.Tweet:
+        _, tweet = await self._call(
+            "/tweets/:id", f"/tweets/{id}", params, self._parse_tweet_response
+        )
+
+        return tweet
+
+    async def _fetch_user(
+        self, endpoint: str, path: str, params: Optional[Dict[str, str]]
+    ) -> User.User:
+        _, user = await self._call(
+            endpoint,
+            path,
+            params,
+            self._parse_user_response,
+        )
+
+        return user
+
+    async def _coalesce(
+        self,
+        endpoint: str,
+        key: str,
+        params: Optional[Dict[str, str]],
+        fetch: Callable[[], Awaitable[T]],
+    ) -> T:
+        if self.__single_flight is None:
+            return await fetch()
+
+        return await self.__single_flight.do(
+            (endpoint, key, make_field_set(params)), fetch
+        )
+
+    async def _call(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, str]],
+        parse: Callable[[Dict], T],
+    ) -> Tuple[Dict, T]:
+        # Like TwitterAPI._call; the context of the task keeps concurrent
+        # requests apart.
+        if self.instrumentation is None:
+            res_json: Dict = await self._request(endpoint, path, params)
+            return res_json, parse(res_json)
+
+        with self.instrumentation.defer() as deferred:
+            res_json = await self._request(endpoint, path, params)
+
+        started: float = time.perf_counter()
+        try:
+            return res_json, parse(res_json)
+        finally:
+            self.instrumentation.flush(deferred, time.perf_counter() - started)
+
+    async def _request(
+        self, endpoint: str, path: str, params: Optional[Dict[str, str]]
+    ) -> Dict:
+        # Retries like TwitterAPI._request.
+        attempt: int = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before(endpoint)
+
+            try:
+                res_json: Dict = await self._attempt(endpoint, path, params)
+            except Exception as e:
+                if self.circuit_breaker is not None:
+                    if is_transient(e):
+                        self.circuit_breaker.failure(endpoint)
+                    else:
+                        self.circuit_breaker.success(endpoint)
+
+                delay: Optional[float] = (
+                    self.retry.delay(attempt, e) if self.retry is not None else None
+                )
+                if delay is None:
+                    raise
+                logger.warning(f"Retrying {endpoint} in {delay:.2f}s: {e}")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.success(endpoint)
+            return res_json
+
+    async def _attempt(
+        self, endpoint: str, path: str, params: Optional[Dict[str, str]]
+    ) -> Dict:
+        metrics: Optional[RequestMetrics] = (
+            RequestMetrics(endpoint) if self.instrumentation is not None else None
+        )
+        trace: Optional[Dict[str, float]] = {} if metrics is not None else None
+        started: float = time.perf_counter()
+        try:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async(endpoint)
+
+            if self.__session is None:
+                self.__session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=self.__limit,
+                        limit_per_host=self.__limit_per_host,
+                        keepalive_timeout=self.__keepalive_timeout,
+                    ),
+                    timeout=self.__timeout,
+                    trace_configs=(
+                        [_trace_config()] if self.instrumentation is not None else None
+                    ),
+                )
+
+            sent: float = time.perf_counter()
+            if metrics is not None:
+                metrics.wait = sent - started
+            async with self.__session.get(
+                f"{self.__API_URL}{path}",
+                params=params,
+                headers=self.__REQUEST_HEADERS,
+                trace_request_ctx=trace,
+            ) as response:
+                body: bytes = await response.read()
+            if metrics is not None and trace is not None:
+                metrics.total = time.perf_counter() - sent
+                metrics.status = response.status
+                metrics.response_bytes = len(body)
+                metrics.read_headers(response.headers)
+                _read_trace(metrics, trace)
+
+            if self.rate_limiter:
+                self.rate_limiter.update(endpoint, response.headers, response.status)
+
+            if response.status != 200:
+                raise Error.response_error(
+                    endpoint,
+                    response.status,
+                    body.decode("utf-8", "replace"),
+                    response.headers,
+                )
+
+            decoding: float = time.perf_counter()
+            res_json: Dict = self.__loads(body)
+            if metrics is not None:
+                metrics.decode = time.perf_counter() - decoding
+        except Exception as e:
+            if metrics is not None and metrics.status == 0:
+                metrics.error = type(e).__name__
+            raise
+        finally:
+            if metrics is not None and self.instrumentation is not None:
+                self.instrumentation.emit(metrics)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(res_json)
+
+        return res_json
+
+    def _parse_tweets(self, res_json: Dict) -> List[Tweet.Tweet]:
+        includes: Includes = Includes(
+            res_json.get("includes"), self.lazy, self.identity_map
+        )
+
+        return [
+            TwitterAPI._parse_tweet(data, includes, self.lazy, self.identity_map)
+            for data in res_json.get("data", [])
+        ]
+
+    def _parse_users(self, res_json: Dict) -> List[User.User]:
+        return [
+            TwitterAPI._parse_user(data, self.identity_map)
+            for data in res_json.get("data", [])
+        ]
+
+    def _parse_tweet_response(self, res_json: Dict) -> Tweet.Tweet:
+        check_data(res_json)
+        return TwitterAPI._parse_tweet(
+            res_json["data"],
+            Includes(res_json.get("includes"), self.lazy, self.identity_map),
+            self.lazy,
+            self.identity_map,
+        )
+
+    def _parse_user_response(self, res_json: Dict) -> User.User:
+        check_data(res_json)
+        return TwitterAPI._parse_user(res_json["data"], self.identity_map)
@@ -0,0 +1,139 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# e.g. frozenset({("tweet.fields", "lang"), ("expansions", "author_id")})
+FieldSet = FrozenSet[Tuple[str, str]]
+# (endpoint, id or username, field set)
+EntryKey = Tuple[str, str, FieldSet]
+
+
+def make_field_set(params: Optional[Dict[str, str]]) -> FieldSet:
+    # Canonicalizes expansions and fields regardless of their order, so that
+    # "lang,source" and "source,lang" share one entry and a subset of fields
+    # can be compared against a cached superset.
+    if not params:
+        return frozenset()
+
+    return frozenset(
+        (name, item)
+        for name, value in params.items()
+        if name not in ("ids", "usernames")
+        for item in value.split(",")
+    )
+
+
+class ResponseCache:
+    # In-memory cache of parsed objects with a per-entry TTL and LRU eviction.
+    # Entries are keyed on (endpoint, id or username, field set). A lookup is
+    # also answered by an entry fetched with a superset of its fields.
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self.__clock: Callable[[], float] = clock
+        self.__entries: "OrderedDict[EntryKey, Tuple[float, Any]]" = OrderedDict()
+        # (endpoint, key) -> field sets cached for it
+        self.__field_sets: Dict[Tuple[str, str], Set[FieldSet]] = {}
+        self.__lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(
+        self, endpoint: str, key: str, params: Optional[Dict[str, str]]
+    ) -> Optional[Any]:
+        field_set: FieldSet = make_field_set(params)
+
+        with self.__lock:
+            now: float = self.__clock()
+            for cached in self.__candidates(endpoint, key, field_set):
+                entry_key: EntryKey = (endpoint, key, cached)
+                expires, value = self.__entries[entry_key]
+                if expires <= now:
+                    self.__remove(entry_key)
+                    continue
+
+                self.__entries.move_to_end(entry_key)
+                self.hits += 1
+                return value
+
+            self.misses += 1
+            return None
+
+    def get_many(
+        self, endpoint: str, keys: Iterable[str], params: Optional[Dict[str, str]]
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        # Returns cached values and the keys which have to be fetched.
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in keys:
+            if (value := self.get(endpoint, key, params)) is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+
+        return found, missing
+
+    def set(
+        self,
+        endpoint: str,
+        key: str,
+        params: Optional[Dict[str, str]],
+        value: Any,
+    ) -> None:
+        field_set: FieldSet = make_field_set(params)
+        entry_key: EntryKey = (endpoint, key, field_set)
+
+        with self.__lock:
+            self.__entries[entry_key] = (self.__clock() + self.ttl, value)
+            self.__entries.move_to_end(entry_key)
+            self.__field_sets.setdefault((endpoint, key), set()).add(field_set)
+
+            while len(self.__entries) > self.maxsize:
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__field_sets.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.__entries),
+        }
+
+    def __candidates(
+        self, endpoint: str, key: str, field_set: FieldSet
+    ) -> List[FieldSet]:
+        cached: Set[FieldSet] = self.__field_sets.get((endpoint, key), set())
+
+        # The exact field set first, then any superset of it
+        return sorted(
+            (superset for superset in cached if field_set <= superset),
+            key=lambda superset: superset != field_set,
+        )
+
+    def __remove(self, entry_key: EntryKey) -> None:
+        endpoint, key, field_set = entry_key
+        del self.__entries[entry_key]
+
+        field_sets: Set[FieldSet] = self.__field_sets[(endpoint, key)]
+        field_sets.discard(field_set)
+        if not field_sets:
+            del self.__field_sets[(endpoint, key)]
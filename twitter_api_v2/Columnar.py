@@ -0,0 +1,268 @@
+from abc import ABCMeta, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.User import User
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+try:
+    import pyarrow  # type: ignore
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+try:
+    import pandas  # type: ignore
+except ImportError:  # pragma: no cover
+    pandas = None
+
+# (column name, kind), where kind is one of "int", "str", "datetime" and "list"
+Schema = Tuple[Tuple[str, str], ...]
+
+TWEET_SCHEMA: Schema = (
+    ("id", "int"),
+    ("author_id", "int"),
+    ("created_at", "datetime"),
+    ("lang", "str"),
+    ("retweet_count", "int"),
+    ("reply_count", "int"),
+    ("like_count", "int"),
+    ("quote_count", "int"),
+    ("hashtags", "list"),
+    ("mentions", "list"),
+)
+
+USER_SCHEMA: Schema = (
+    ("id", "int"),
+    ("username", "str"),
+    ("name", "str"),
+    ("created_at", "datetime"),
+    ("followers_count", "int"),
+    ("following_count", "int"),
+    ("tweet_count", "int"),
+    ("listed_count", "int"),
+)
+
+# Missing integers in NumPy arrays, which have no null. Arrow and pandas use null.
+MISSING_INT: int = -1
+
+
+def to_int(value: Optional[str]) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+def to_datetime(
+    value: Optional[Union[str, datetime]],
+) -> Optional[Union[str, datetime]]:
+    # Returns a naive UTC value which numpy parses as datetime64.
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    return value[:-1] if value.endswith("Z") else value
+
+
+class Columns(metaclass=ABCMeta):
+    # Builds columns from a batch of raw "data" objects or model objects.
+    #
+    # Raw objects are read straight into the columns, without building a model
+    # object per row. Typed arrays are built once per column by to_numpy(),
+    # to_arrow() or to_pandas().
+
+    schema: Schema = ()
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        self.columns: Dict[str, List[Any]] = {name: [] for name, _ in self.schema}
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def extend(self, items: Iterable[Any]) -> "Columns":
+        appends: List[Any] = [column.append for column in self.columns.values()]
+
+        for item in items:
+            row: Tuple = (
+                self._from_raw(item)
+                if isinstance(item, dict)
+                else self._from_model(item)
+            )
+            for append, value in zip(appends, row):
+                append(value)
+
+        return self
+
+    def extend_response(self, res_json: Dict) -> "Columns":
+        # Single lookups return one object in "data" and batches a list.
+        data: Union[Dict, List[Dict]] = res_json.get("data", [])
+
+        return self.extend([data] if isinstance(data, dict) else data)
+
+    def to_numpy(self) -> "numpy.ndarray":
+        # Structured array with int64, datetime64[ms] and object fields.
+        if numpy is None:
+            raise ImportError("to_numpy requires numpy to be installed.")
+
+        array: numpy.ndarray = numpy.empty(
+            len(self),
+            dtype=[(name, self.__numpy_dtype(kind)) for name, kind in self.schema],
+        )
+        for name, kind in self.schema:
+            array[name] = self.__numpy_column(name, kind)
+
+        return array
+
+    def to_arrow(self) -> "pyarrow.Table":
+        if pyarrow is None:
+            raise ImportError("to_arrow requires pyarrow to be installed.")
+        if numpy is None:
+            # for the datetime columns
+            raise ImportError("to_arrow requires numpy to be installed.")
+
+        arrays: Dict[str, Any] = {}
+        for name, kind in self.schema:
+            values: List[Any] = self.columns[name]
+            if kind == "int":
+                arrays[name] = pyarrow.array(values, type=pyarrow.int64())
+            elif kind == "datetime":
+                timestamps: numpy.ndarray = self.__numpy_column(name, kind)
+                arrays[name] = pyarrow.array(
+                    timestamps, mask=numpy.isnat(timestamps)
+                ).cast(pyarrow.timestamp("ms", tz="UTC"))
+            elif kind == "str":
+                arrays[name] = pyarrow.array(values, type=pyarrow.string())
+            else:
+                arrays[name] = pyarrow.array(
+                    values, type=pyarrow.list_(pyarrow.string())
+                )
+
+        return pyarrow.table(arrays)
+
+    def to_pandas(self) -> "pandas.DataFrame":
+        if pandas is None:
+            raise ImportError("to_pandas requires pandas to be installed.")
+
+        series: Dict[str, Any] = {}
+        for name, kind in self.schema:
+            values: List[Any] = self.columns[name]
+            if kind == "int":
+                series[name] = pandas.array(values, dtype="Int64")
+            elif kind == "datetime":
+                series[name] = pandas.Series(
+                    self.__numpy_column(name, kind)
+                ).dt.tz_localize("UTC")
+            else:
+                series[name] = pandas.Series(values, dtype=object)
+
+        return pandas.DataFrame(series)
+
+    @abstractmethod
+    def _from_raw(self, data: Dict) -> Tuple:
+        # Values of one row, in the order of schema
+        pass
+
+    @abstractmethod
+    def _from_model(self, model: Any) -> Tuple:
+        pass
+
+    @staticmethod
+    def __numpy_dtype(kind: str) -> str:
+        return {"int": "i8", "datetime": "datetime64[ms]"}.get(kind, "O")
+
+    def __numpy_column(self, name: str, kind: str) -> "numpy.ndarray":
+        values: List[Any] = self.columns[name]
+        if kind == "int":
+            return numpy.fromiter(
+                (MISSING_INT if value is None else value for value in values),
+                dtype="i8",
+                count=len(values),
+            )
+        if kind == "datetime":
+            return numpy.array(values, dtype="datetime64[ms]")
+
+        # Assigned one by one, since numpy would broadcast nested lists.
+        column: numpy.ndarray = numpy.empty(len(values), dtype=object)
+        for idx, value in enumerate(values):
+            column[idx] = value
+        return column
+
+
+class TweetColumns(Columns):
+    schema: Schema = TWEET_SCHEMA
+
+    def _from_raw(self, data: Dict) -> Tuple:
+        metrics: Dict = data.get("public_metrics") or {}
+        entities: Dict = data.get("entities") or {}
+
+        return (
+            int(data["id"]),
+            to_int(data.get("author_id")),
+            to_datetime(data.get("created_at")),
+            data.get("lang"),
+            to_int(metrics.get("retweet_count")),
+            to_int(metrics.get("reply_count")),
+            to_int(metrics.get("like_count")),
+            to_int(metrics.get("quote_count")),
+            [hashtag["tag"] for hashtag in entities.get("hashtags", [])],
+            # Mentions carry "username" in the API and "tag" in Entity.Mention.
+            [
+                mention.get("username", mention.get("tag"))
+                for mention in entities.get("mentions", [])
+            ],
+        )
+
+    def _from_model(self, tweet: Tweet) -> Tuple:
+        entities: Any = tweet.entities
+        metrics: Any = tweet.public_metrics
+
+        return (
+            int(tweet.id),
+            to_int(tweet.author_id),
+            to_datetime(tweet.created_at),
+            tweet.lang,
+            metrics.retweet_count if metrics else None,
+            metrics.reply_count if metrics else None,
+            metrics.like_count if metrics else None,
+            metrics.quote_count if metrics else None,
+            [hashtag.tag for hashtag in (entities and entities.hashtags) or []],
+            [mention.tag for mention in (entities and entities.mentions) or []],
+        )
+
+
+class UserColumns(Columns):
+    schema: Schema = USER_SCHEMA
+
+    def _from_raw(self, data: Dict) -> Tuple:
+        metrics: Dict = data.get("public_metrics") or {}
+
+        return (
+            int(data["id"]),
+            data["username"],
+            data["name"],
+            to_datetime(data.get("created_at")),
+            to_int(metrics.get("followers_count")),
+            to_int(metrics.get("following_count")),
+            to_int(metrics.get("tweet_count")),
+            to_int(metrics.get("listed_count")),
+        )
+
+    def _from_model(self, user: User) -> Tuple:
+        metrics: Any = user.public_metrics
+
+        return (
+            int(user.id),
+            user.username,
+            user.name,
+            to_datetime(user.created_at),
+            metrics.followers_count if metrics else None,
+            metrics.following_count if metrics else None,
+            metrics.tweet_count if metrics else None,
+            metrics.listed_count if metrics else None,
+        )
@@ -2,6 +2,8 @@ from typing import Optional
 
 
 class Domain:
+    __slots__ = ("id", "name", "description")
+
     def __init__(self, id: str, name: str, description: Optional[str] = None) -> None:
         self.id: str = id
         self.name: str = name
@@ -9,6 +11,8 @@ class Domain:
 
 
 class Entity:
+    __slots__ = ("id", "name", "description")
+
     def __init__(self, id: str, name: str, description: Optional[str] = None) -> None:
         self.id: str = id
         self.name: str = name
@@ -0,0 +1,228 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from twitter_api_v2 import Json
+from twitter_api_v2.Cache import FieldSet, make_field_set
+
+# Entries are checked against max_bytes once every this many writes.
+EVICT_EVERY: int = 64
+
+
+def encode_field_set(field_set: FieldSet) -> str:
+    # e.g. "expansions=author_id&tweet.fields=lang"
+    return "&".join(sorted(f"{name}={item}" for name, item in field_set))
+
+
+def decode_field_set(fields: str) -> FieldSet:
+    if not fields:
+        return frozenset()
+
+    return frozenset(
+        (name, item)
+        for name, item in (pair.split("=", 1) for pair in fields.split("&"))
+    )
+
+
+class DiskCache:
+    # SQLite cache of raw response objects which survives restarts.
+    #
+    # Entries are keyed on (endpoint, id or username, field set) like
+    # ResponseCache and are answered by an entry fetched with a superset of
+    # the fields. The database is in WAL mode, so several processes on one
+    # host can read while one writes. Each thread uses its own connection.
+    # Once the stored values exceed max_bytes, the entries expiring first are
+    # evicted.
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 24 * 60 * 60,
+        max_bytes: int = 256 * 1024 * 1024,
+        json_backend: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path: str = path
+        self.ttl: float = ttl
+        self.max_bytes: int = max_bytes
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self.__loads: Json.Loads = Json.get_loads(json_backend)
+        self.__clock: Callable[[], float] = clock
+        self.__local: threading.local = threading.local()
+        self.__connections: List[sqlite3.Connection] = []
+        self.__lock: threading.Lock = threading.Lock()
+        self.__writes: int = 0
+
+        if directory := os.path.dirname(path):
+            os.makedirs(directory, exist_ok=True)
+
+        with self.__connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " endpoint TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " fields TEXT NOT NULL,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " expires REAL NOT NULL,"
+                " PRIMARY KEY (endpoint, key, fields))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires)"
+            )
+
+    def __len__(self) -> int:
+        return self.__connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        # Closes the connections of every thread.
+        with self.__lock:
+            for connection in self.__connections:
+                connection.close()
+            self.__connections.clear()
+        self.__local = threading.local()
+
+    def get(
+        self, endpoint: str, key: str, params: Optional[Dict[str, str]]
+    ) -> Optional[Dict]:
+        found, _ = self.get_many(endpoint, [key], params)
+
+        return found.get(key)
+
+    def get_many(
+        self, endpoint: str, keys: Iterable[str], params: Optional[Dict[str, str]]
+    ) -> Tuple[Dict[str, Dict], List[str]]:
+        # Returns stored values and the keys which have to be fetched.
+        keys = list(keys)
+        field_set: FieldSet = make_field_set(params)
+        now: float = self.__clock()
+
+        # key -> (is exact, value), preferring the exact field set
+        best: Dict[str, Tuple[bool, bytes]] = {}
+        connection: sqlite3.Connection = self.__connection()
+        # SQLite allows 999 host parameters in older versions.
+        for start in range(0, len(keys), 900):
+            chunk: List[str] = keys[start : start + 900]
+            rows: List[Tuple[str, str, bytes]] = connection.execute(
+                "SELECT key, fields, value FROM entries"
+                f" WHERE endpoint = ? AND key IN ({','.join('?' * len(chunk))})"
+                " AND expires > ?",
+                (endpoint, *chunk, now),
+            ).fetchall()
+
+            for key, fields, value in rows:
+                cached: FieldSet = decode_field_set(fields)
+                if not field_set <= cached:
+                    continue
+                exact: bool = cached == field_set
+                if key not in best or (exact and not best[key][0]):
+                    best[key] = (exact, value)
+
+        found: Dict[str, Dict] = {
+            key: self.__loads(value) for key, (_, value) in best.items()
+        }
+        missing: List[str] = [key for key in keys if key not in found]
+        self.hits += len(found)
+        self.misses += len(missing)
+
+        return found, missing
+
+    def set(
+        self,
+        endpoint: str,
+        key: str,
+        params: Optional[Dict[str, str]],
+        value: Dict,
+    ) -> None:
+        self.set_many(endpoint, params, {key: value})
+
+    def set_many(
+        self, endpoint: str, params: Optional[Dict[str, str]], values: Dict[str, Dict]
+    ) -> None:
+        # Stores all values in one transaction.
+        if not values:
+            return
+
+        fields: str = encode_field_set(make_field_set(params))
+        expires: float = self.__clock() + self.ttl
+        rows: List[Tuple[str, str, str, bytes, int, float]] = []
+        for key, value in values.items():
+            encoded: bytes = json.dumps(value, separators=(",", ":")).encode("utf-8")
+            rows.append((endpoint, key, fields, encoded, len(encoded), expires))
+
+        with self.__connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries"
+                " (endpoint, key, fields, value, size, expires)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+        with self.__lock:
+            self.__writes += 1
+            evict: bool = self.__writes % EVICT_EVERY == 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> None:
+        # Drops expired entries, then the ones expiring first while over max_bytes.
+        with self.__connection() as connection:
+            self.evictions += connection.execute(
+                "DELETE FROM entries WHERE expires <= ?", (self.__clock(),)
+            ).rowcount
+
+            total: int = connection.execute(
+                "SELECT TOTAL(size) FROM entries"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            excess: float = total - self.max_bytes
+            victims: List[Tuple[str, str, str]] = []
+            for endpoint, key, fields, size in connection.execute(
+                "SELECT endpoint, key, fields, size FROM entries ORDER BY expires"
+            ):
+                victims.append((endpoint, key, fields))
+                excess -= size
+                if excess <= 0:
+                    break
+
+            connection.executemany(
+                "DELETE FROM entries WHERE endpoint = ? AND key = ? AND fields = ?",
+                victims,
+            )
+            self.evictions += len(victims)
+
+    def clear(self) -> None:
+        with self.__connection() as connection:
+            connection.execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+        }
+
+    def __connection(self) -> sqlite3.Connection:
+        if (connection := getattr(self.__local, "connection", None)) is None:
+            # Waits up to 30 seconds for a writer of another process. Only
+            # close() touches it from another thread.
+            connection = sqlite3.connect(
+                self.path, timeout=30.0, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.__local.connection = connection
+            with self.__lock:
+                self.__connections.append(connection)
+
+        return connection
@@ -0,0 +1,214 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition, Thread
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from twitter_api_v2 import Error, Media, Poll, Tweet, TwitterAPI, User
+from twitter_api_v2.Cache import make_field_set
+
+
+class Batch:
+    def __init__(self, kind: str, kwargs: Dict[str, Any], deadline: float) -> None:
+        self.kind: str = kind
+        self.kwargs: Dict[str, Any] = kwargs
+        self.deadline: float = deadline
+        # id or username -> callers waiting for it
+        self.futures: Dict[str, List[Future]] = {}
+
+
+class Dispatcher:
+    # Merges single lookups into batch requests, like DataLoader.
+    #
+    # Lookups submitted within `window` seconds of the first one, with the
+    # same kind and field set, are sent as one ids= request once the window
+    # ends or `max_batch_size` distinct IDs are collected. Each caller gets a
+    # Future resolved with its own Tweet/User. get_tweet, get_user_by_id and
+    # get_user_by_username block on that Future, so a Dispatcher can be
+    # passed where a TwitterAPI was used for single lookups.
+
+    def __init__(
+        self,
+        client: TwitterAPI.TwitterAPI,
+        window: float = 0.005,
+        max_batch_size: int = TwitterAPI.MAX_IDS_PER_REQUEST,
+        max_workers: int = 4,
+    ) -> None:
+        self.__client: TwitterAPI.TwitterAPI = client
+        self.__window: float = window
+        self.__max_batch_size: int = min(max_batch_size, TwitterAPI.MAX_IDS_PER_REQUEST)
+
+        self.__pending: Dict[Tuple[str, Hashable], Batch] = {}
+        self.__condition: Condition = Condition()
+        self.__closed: bool = False
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers)
+        self.__thread: Thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def __enter__(self) -> "Dispatcher":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Sends pending batches and waits for them.
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+        self.__thread.join()
+        self.__executor.shutdown(wait=True)
+
+    def get_tweet(
+        self,
+        id: str,
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+    ) -> Tweet.Tweet:
+        return self.submit_tweet(
+            id, expansions, tweet_fields, media_fields, poll_fields
+        ).result()
+
+    def get_user_by_id(self, id: str, user_fields: List[User.Field] = []) -> User.User:
+        return self.submit_user_by_id(id, user_fields).result()
+
+    def get_user_by_username(
+        self, username: str, user_fields: List[User.Field] = []
+    ) -> User.User:
+        return self.submit_user_by_username(username, user_fields).result()
+
+    def submit_tweet(
+        self,
+        id: str,
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+    ) -> "Future[Tweet.Tweet]":
+        return self.__submit(
+            "tweets",
+            id,
+            {
+                "expansions": expansions,
+                "tweet_fields": tweet_fields,
+                "media_fields": media_fields,
+                "poll_fields": poll_fields,
+            },
+            TwitterAPI.TwitterAPI._make_params(
+                expansions, tweet_fields, media_fields, poll_fields
+            ),
+        )
+
+    def submit_user_by_id(
+        self, id: str, user_fields: List[User.Field] = []
+    ) -> "Future[User.User]":
+        return self.__submit(
+            "users",
+            id,
+            {"user_fields": user_fields},
+            TwitterAPI.TwitterAPI._make_user_params(user_fields),
+        )
+
+    def submit_user_by_username(
+        self, username: str, user_fields: List[User.Field] = []
+    ) -> "Future[User.User]":
+        return self.__submit(
+            "usernames",
+            username.lower(),
+            {"user_fields": user_fields},
+            TwitterAPI.TwitterAPI._make_user_params(user_fields),
+        )
+
+    def __submit(
+        self,
+        kind: str,
+        key: str,
+        kwargs: Dict[str, Any],
+        params: Optional[Dict[str, str]],
+    ) -> Future:
+        future: Future = Future()
+
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("Dispatcher is already closed.")
+
+            batch_key: Tuple[str, Hashable] = (kind, make_field_set(params))
+            if (batch := self.__pending.get(batch_key)) is None:
+                batch = self.__pending[batch_key] = Batch(
+                    kind, kwargs, time.monotonic() + self.__window
+                )
+                self.__condition.notify()
+
+            batch.futures.setdefault(key, []).append(future)
+            if len(batch.futures) >= self.__max_batch_size:
+                # Send a full batch right away, without waiting for the window.
+                del self.__pending[batch_key]
+                self.__executor.submit(self.__dispatch, batch)
+
+        return future
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                while True:
+                    now: float = time.monotonic()
+                    due: List[Tuple[str, Hashable]] = [
+                        batch_key
+                        for batch_key, batch in self.__pending.items()
+                        if self.__closed or batch.deadline <= now
+                    ]
+                    if due or (self.__closed and not self.__pending):
+                        break
+
+                    timeout: Optional[float] = None
+                    if self.__pending:
+                        timeout = min(
+                            batch.deadline for batch in self.__pending.values()
+                        )
+                        timeout -= now
+                    self.__condition.wait(timeout)
+
+                batches: List[Batch] = [self.__pending.pop(key) for key in due]
+                closed: bool = self.__closed
+
+            for batch in batches:
+                self.__executor.submit(self.__dispatch, batch)
+
+            if closed and not batches:
+                return
+
+    def __dispatch(self, batch: Batch) -> None:
+        found: Dict[str, Any]
+        errors: List[Error.Error]
+        try:
+            if batch.kind == "tweets":
+                tweets, errors = self.__client.get_tweets(batch.futures, **batch.kwargs)
+                found = {tweet.id: tweet for tweet in tweets}
+            elif batch.kind == "users":
+                found, errors = self.__client.get_users_by_ids(
+                    batch.futures, **batch.kwargs
+                )
+            else:
+                found, errors = self.__client.get_users_by_usernames(
+                    batch.futures, **batch.kwargs
+                )
+        except BaseException as e:
+            for futures in batch.futures.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+
+        details: Dict[Optional[str], Error.Error] = {
+            error.value: error for error in errors
+        }
+        for key, futures in batch.futures.items():
+            for future in futures:
+                if key in found:
+                    future.set_result(found[key])
+                elif (error := details.get(key)) is not None:
+                    future.set_exception(Error.ResourceError(error))
+                else:
+                    future.set_exception(
+                        Error.TwitterAPIError(f"{key} was not returned.")
+                    )
@@ -1,8 +1,11 @@
 from enum import Enum
-from typing import Optional, Tuple
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 class Annotation:
+    __slots__ = ("start", "end", "normalized_text", "probability", "type")
+
     def __init__(
         self, start: int, end: int, probability: float, type: str, normalized_text: str
     ) -> None:
@@ -16,6 +19,8 @@ class Annotation:
 
 
 class CashTag:
+    __slots__ = ("start", "end", "tag")
+
     def __init__(self, start: int, end: int, tag: str) -> None:
 
         self.start: int = start
@@ -25,6 +30,8 @@ class CashTag:
 
 
 class HashTag:
+    __slots__ = ("start", "end", "tag")
+
     def __init__(self, start: int, end: int, tag: str) -> None:
 
         self.start: int = start
@@ -34,6 +41,8 @@ class HashTag:
 
 
 class Mention:
+    __slots__ = ("start", "end", "tag")
+
     def __init__(self, start: int, end: int, tag: str) -> None:
 
         self.start: int = start
@@ -43,6 +52,8 @@ class Mention:
 
 
 class Url:
+    __slots__ = ("start", "end", "url", "expanded_url", "display_url")
+
     def __init__(
         self, start: int, end: int, url: str, expanded_url: str, display_url: str
     ) -> None:
@@ -56,6 +67,8 @@ class Url:
 
 
 class Size:
+    __slots__ = ("h", "w", "resize")
+
     def __init__(self, w: int, h: int, resize: str) -> None:
 
         self.h: int = h
@@ -64,6 +77,8 @@ class Size:
 
 
 class Sizes:
+    __slots__ = ("thumb", "small", "medium", "large")
+
     def __init__(self, thumb: Size, small: Size, medium: Size, large: Size) -> None:
 
         self.thumb: Size = thumb
@@ -79,6 +94,18 @@ class MediaType(Enum):
 
 
 class Media:
+    __slots__ = (
+        "display_url",
+        "expanded_url",
+        "media_id",
+        "indices",
+        "media_url",
+        "sizes",
+        "source_status_id",
+        "type",
+        "url",
+    )
+
     def __init__(self, obj: dict) -> None:
 
         self.display_url: str = obj["display_url"]
@@ -100,3 +127,39 @@ class Media:
         )
         self.type: MediaType = MediaType(obj["type"])
         self.url: str = obj["url"]
+
+
+# Class of each list of entities of Tweet.Entities and User.Description, and
+# the arguments of its __init__
+TYPES: Dict[str, Tuple[Any, Tuple[str, ...]]] = {
+    "annotations": (
+        Annotation,
+        ("start", "end", "probability", "type", "normalized_text"),
+    ),
+    "cashtags": (CashTag, ("start", "end", "tag")),
+    "hashtags": (HashTag, ("start", "end", "tag")),
+    "mentions": (Mention, ("start", "end", "tag")),
+    "urls": (Url, ("start", "end", "url", "expanded_url", "display_url")),
+}
+
+# Reads the arguments of each class of TYPES back from an object
+ARGUMENTS: Dict[str, Callable[[Any], Tuple]] = {
+    name: attrgetter(*fields) for name, (_, fields) in TYPES.items()
+}
+
+
+def lists_to_dict(obj: Any) -> Dict[str, List[Tuple]]:
+    # The lists of entities which obj has, each entity as the arguments of its
+    # __init__, which is much smaller than a dict per entity.
+    return {
+        name: [arguments(entity) for entity in entities]
+        for name, arguments in ARGUMENTS.items()
+        if (entities := getattr(obj, name, None)) is not None
+    }
+
+
+def lists_from_dict(obj: Any, data: Dict[str, Any]) -> None:
+    # Sets the lists of entities of lists_to_dict() on obj.
+    for name, (cls, _) in TYPES.items():
+        if (entities := data.get(name)) is not None:
+            setattr(obj, name, [cls(*arguments) for arguments in entities])
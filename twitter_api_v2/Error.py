@@ -0,0 +1,145 @@
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Type
+
+from twitter_api_v2.util import get_additional_field
+
+
+class Error:
+    __slots__ = (
+        "title",
+        "detail",
+        "type",
+        "value",
+        "parameter",
+        "resource_id",
+        "resource_type",
+    )
+
+    # A partial error returned with a 200 response, e.g. an ID that was not found
+    def __init__(self, data: Dict) -> None:
+        self.title: str = data["title"]
+        self.detail: Optional[str] = get_additional_field(data, "detail")
+        self.type: Optional[str] = get_additional_field(data, "type")
+
+        self.value: Optional[str] = get_additional_field(data, "value")
+        self.parameter: Optional[str] = get_additional_field(data, "parameter")
+        self.resource_id: Optional[str] = get_additional_field(data, "resource_id")
+        self.resource_type: Optional[str] = get_additional_field(data, "resource_type")
+
+
+class TwitterAPIError(Exception):
+    # Base of the exceptions raised when a request fails as a whole.
+    def __init__(self, message: str, endpoint: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.endpoint: Optional[str] = endpoint
+
+
+class ResponseError(TwitterAPIError):
+    # A response with an error status. Raised as one of the subclasses below
+    # when the status has one, see response_error().
+    def __init__(
+        self,
+        endpoint: Optional[str],
+        status: int,
+        text: str,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        super().__init__(f"Request returned an error: {status} {text}", endpoint)
+        self.status: int = status
+        self.text: str = text
+
+        headers = headers or {}
+        # Seconds to wait before retrying, from the Retry-After header
+        self.retry_after: Optional[float] = parse_retry_after(
+            headers.get("retry-after")
+        )
+        # Epoch seconds at which the rate limit window resets
+        self.reset: Optional[float] = None
+        if (reset := headers.get("x-rate-limit-reset")) is not None:
+            self.reset = float(reset)
+
+
+class BadRequestError(ResponseError):
+    # 400
+    pass
+
+
+class AuthError(ResponseError):
+    # 401 and 403: a missing or invalid token, or access to the endpoint is
+    # not allowed.
+    pass
+
+
+class NotFoundError(ResponseError):
+    # 404
+    pass
+
+
+class RateLimitError(ResponseError):
+    # 429: the quota of the endpoint is used up until reset.
+    pass
+
+
+class ServerError(ResponseError):
+    # 5xx: the API is failing or overloaded.
+    pass
+
+
+class ResourceError(TwitterAPIError):
+    # An object which a successful response could not return, e.g. a deleted
+    # tweet or a suspended user. error holds the partial error.
+    def __init__(self, error: Error, endpoint: Optional[str] = None) -> None:
+        super().__init__(
+            f"Request returned an error: {error.detail or error.title}", endpoint
+        )
+        self.error: Error = error
+
+
+class CircuitOpenError(TwitterAPIError):
+    # Raised without sending a request while the endpoint's circuit breaker is
+    # open. retry_after is the number of seconds until it lets a request in.
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        super().__init__(
+            f"Circuit of {endpoint} is open for {retry_after:.1f} more seconds.",
+            endpoint,
+        )
+        self.retry_after: float = retry_after
+
+
+RESPONSE_ERRORS: Dict[int, Type[ResponseError]] = {
+    400: BadRequestError,
+    401: AuthError,
+    403: AuthError,
+    404: NotFoundError,
+    429: RateLimitError,
+}
+
+
+def response_error(
+    endpoint: Optional[str],
+    status: int,
+    text: str,
+    headers: Optional[Mapping[str, str]] = None,
+) -> ResponseError:
+    error_class: Type[ResponseError] = RESPONSE_ERRORS.get(status, ResponseError)
+    if status >= 500:
+        error_class = ServerError
+
+    return error_class(endpoint, status, text, headers)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After is either seconds or an HTTP date.
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
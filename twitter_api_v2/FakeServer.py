@@ -0,0 +1,604 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Pattern, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+# Requests per 15 minutes window with app auth, per endpoint
+DEFAULT_RATE_LIMITS: Dict[str, int] = {
+    "/tweets": 300,
+    "/tweets/:id": 300,
+    "/users": 300,
+    "/users/:id": 300,
+    "/users/by": 300,
+    "/users/by/username/:username": 300,
+    "/users/:id/tweets": 1500,
+    "/users/:id/mentions": 450,
+    "/users/:id/followers": 15,
+    "/users/:id/following": 15,
+    "/tweets/search/recent": 450,
+    "/tweets/search/stream": 50,
+    "/tweets/search/stream/rules": 450,
+    "/tweets/sample/stream": 50,
+}
+
+# Fields returned without being requested
+DEFAULT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "tweet": ("id", "text"),
+    "user": ("id", "name", "username"),
+    "media": ("media_key", "type"),
+    "poll": ("id", "options"),
+}
+
+# Expansion -> field of the tweet it needs
+EXPANSION_FIELDS: Dict[str, str] = {
+    "author_id": "author_id",
+    "attachments.media_keys": "attachments",
+    "attachments.poll_ids": "attachments",
+    "in_reply_to_user_id": "in_reply_to_user_id",
+    "referenced_tweets.id": "referenced_tweets",
+}
+
+# (status code, body, extra headers)
+Reply = Tuple[int, Any, Dict[str, str]]
+Query = Dict[str, str]
+
+
+def select(obj: Dict, kind: str, query: Query, extra: Set[str] = set()) -> Dict:
+    # Keeps the default fields and the ones requested by <kind>.fields.
+    fields: Set[str] = set(DEFAULT_FIELDS[kind]) | extra
+    if requested := query.get(f"{kind}.fields"):
+        fields.update(requested.split(","))
+
+    return {key: value for key, value in obj.items() if key in fields}
+
+
+def not_found(kind: str, parameter: str, value: str) -> Dict:
+    return {
+        "value": value,
+        "detail": f"Could not find {kind} with {parameter}: [{value}].",
+        "title": "Not Found Error",
+        "resource_type": kind,
+        "parameter": parameter,
+        "resource_id": value,
+        "type": "https://api.twitter.com/2/problems/resource-not-found",
+    }
+
+
+class Cassette:
+    # Recorded responses keyed on method, path and sorted query.
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.replies: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.replies = {reply["key"]: reply for reply in json.load(f)}
+
+    @staticmethod
+    def key(method: str, path: str, query: Query) -> str:
+        return (
+            f"{method} {path}?{'&'.join(f'{k}={v}' for k, v in sorted(query.items()))}"
+        )
+
+    def save(self) -> None:
+        with open(self.path, "w") as f:
+            json.dump(list(self.replies.values()), f, indent=2)
+
+
+class FakeServer:
+    # Local stand-in for the Twitter API v2, for hermetic tests and load tests.
+    #
+    # It serves the lookup, batch, timeline, search, follows and stream
+    # endpoints from fixture objects, returning only requested fields and
+    # expansions like the real API, and counts requests per endpoint to send
+    # x-rate-limit-* headers and 429s. latency, error_rate and inject() add
+    # slowness and failures; IDs without a fixture give partial "errors".
+    #
+    # With a cassette, recorded replies are served first. With record=True,
+    # requests without a recorded reply are forwarded to upstream and
+    # recorded, and the cassette is saved on stop().
+    #
+    #   with FakeServer(tweets=[...], users=[...]) as server:
+    #       client = TwitterAPI("token", api_url=server.url)
+
+    def __init__(
+        self,
+        tweets: List[Dict] = [],
+        users: List[Dict] = [],
+        media: List[Dict] = [],
+        polls: List[Dict] = [],
+        following: Dict[str, List[str]] = {},
+        rate_limits: Dict[str, int] = DEFAULT_RATE_LIMITS,
+        window: float = 15 * 60,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        cassette: Optional[str] = None,
+        record: bool = False,
+        upstream: str = "https://api.twitter.com",
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.tweets: Dict[str, Dict] = {tweet["id"]: tweet for tweet in tweets}
+        self.users: Dict[str, Dict] = {user["id"]: user for user in users}
+        self.media: Dict[str, Dict] = {item["media_key"]: item for item in media}
+        self.polls: Dict[str, Dict] = {poll["id"]: poll for poll in polls}
+        # user ID -> IDs of users they follow
+        self.following: Dict[str, List[str]] = following
+        self.rules: List[Dict] = []
+
+        self.rate_limits: Dict[str, int] = rate_limits
+        self.window: float = window
+        self.latency: float = latency
+        self.error_rate: float = error_rate
+        self.cassette: Optional[Cassette] = Cassette(cassette) if cassette else None
+        self.record: bool = record
+        self.upstream: str = upstream
+
+        # (method, endpoint) of every request received
+        self.requests: List[Tuple[str, str]] = []
+
+        self.__random: random.Random = random.Random(seed)
+        # endpoint -> (reset, remaining)
+        self.__quotas: Dict[str, Tuple[float, int]] = {}
+        self.__injected: List[int] = []
+        self.__rule_ids: int = 0
+        self.__lock: threading.Lock = threading.Lock()
+        # (method, path, endpoint, handler); streams have no handler.
+        self.__routes: List[
+            Tuple[str, Pattern, str, Optional[Callable[..., Reply]]]
+        ] = [
+            ("GET", re.compile(r"/2/tweets"), "/tweets", self.__get_tweets),
+            (
+                "GET",
+                re.compile(r"/2/tweets/search/recent"),
+                "/tweets/search/recent",
+                self.__search,
+            ),
+            (
+                "GET",
+                re.compile(r"/2/tweets/search/stream/rules"),
+                "/tweets/search/stream/rules",
+                self.__get_rules,
+            ),
+            (
+                "POST",
+                re.compile(r"/2/tweets/search/stream/rules"),
+                "/tweets/search/stream/rules",
+                self.__post_rules,
+            ),
+            (
+                "GET",
+                re.compile(r"/2/tweets/search/stream"),
+                "/tweets/search/stream",
+                None,
+            ),
+            (
+                "GET",
+                re.compile(r"/2/tweets/sample/stream"),
+                "/tweets/sample/stream",
+                None,
+            ),
+            ("GET", re.compile(r"/2/tweets/(\d+)"), "/tweets/:id", self.__get_tweet),
+            ("GET", re.compile(r"/2/users"), "/users", self.__get_users),
+            ("GET", re.compile(r"/2/users/by"), "/users/by", self.__get_users_by),
+            (
+                "GET",
+                re.compile(r"/2/users/by/username/(\w+)"),
+                "/users/by/username/:username",
+                self.__get_user_by_username,
+            ),
+            ("GET", re.compile(r"/2/users/(\d+)"), "/users/:id", self.__get_user),
+            (
+                "GET",
+                re.compile(r"/2/users/(\d+)/tweets"),
+                "/users/:id/tweets",
+                self.__get_timeline,
+            ),
+            (
+                "GET",
+                re.compile(r"/2/users/(\d+)/mentions"),
+                "/users/:id/mentions",
+                self.__get_mentions,
+            ),
+            (
+                "GET",
+                re.compile(r"/2/users/(\d+)/followers"),
+                "/users/:id/followers",
+                self.__get_followers,
+            ),
+            (
+                "GET",
+                re.compile(r"/2/users/(\d+)/following"),
+                "/users/:id/following",
+                self.__get_following,
+            ),
+        ]
+
+        server: FakeServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version: str = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                server._handle(self)
+
+            def do_POST(self) -> None:
+                server._handle(self)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.__httpd: ThreadingHTTPServer = ThreadingHTTPServer((host, port), Handler)
+        self.__httpd.daemon_threads = True
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        # Base URL to pass to TwitterAPI(api_url=...)
+        host: str = str(self.__httpd.server_address[0])
+        return f"http://{host}:{self.__httpd.server_port}/2"
+
+    def __enter__(self) -> "FakeServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self.__thread = threading.Thread(target=self.__httpd.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__httpd.shutdown()
+        self.__httpd.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
+        if self.cassette is not None and self.record:
+            self.cassette.save()
+
+    def inject(self, status: int, times: int = 1) -> None:
+        # Replies to the next `times` requests with `status`.
+        with self.__lock:
+            self.__injected.extend([status] * times)
+
+    def _handle(self, request: BaseHTTPRequestHandler) -> None:
+        url = urlsplit(request.path)
+        query: Query = dict(parse_qsl(url.query))
+        body: Optional[Dict] = None
+        if length := int(request.headers.get("Content-Length", 0)):
+            body = json.loads(request.rfile.read(length))
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme != "Bearer" or not token.strip():
+            self.__reply(request, 401, {"title": "Unauthorized"}, {})
+            return
+
+        if self.cassette is not None:
+            key: str = Cassette.key(request.command, url.path, query)
+            if key in self.cassette.replies:
+                reply: Dict = self.cassette.replies[key]
+                self.__reply(request, reply["status"], reply["body"], reply["headers"])
+                return
+            if self.record:
+                self.__forward(request, key, body)
+                return
+
+        for method, pattern, endpoint, handler in self.__routes:
+            if method == request.command and (match := pattern.fullmatch(url.path)):
+                break
+        else:
+            self.__reply(request, 404, {"title": "Not Found"}, {})
+            return
+
+        with self.__lock:
+            self.requests.append((method, endpoint))
+            injected: Optional[int] = (
+                self.__injected.pop(0) if self.__injected else None
+            )
+        headers: Dict[str, str] = self.__take_quota(endpoint)
+
+        if headers["x-rate-limit-remaining"] == "-1":
+            headers["x-rate-limit-remaining"] = "0"
+            self.__reply(request, 429, {"title": "Too Many Requests"}, headers)
+            return
+        if injected is None and self.__random.random() < self.error_rate:
+            injected = 503
+        if injected is not None:
+            self.__reply(request, injected, {"title": "Injected Error"}, headers)
+            return
+
+        if handler is None:
+            self.__stream(request, headers)
+            return
+
+        status, res_json, extra = handler(query, *match.groups(), body=body)
+        self.__reply(request, status, res_json, {**headers, **extra})
+
+    def __take_quota(self, endpoint: str) -> Dict[str, str]:
+        # Consumes one request; remaining is -1 once the quota is exhausted.
+        limit: int = self.rate_limits.get(endpoint, 300)
+        with self.__lock:
+            now: float = time.time()
+            reset, remaining = self.__quotas.get(endpoint, (now + self.window, limit))
+            if reset <= now:
+                reset, remaining = now + self.window, limit
+            remaining = max(-1, remaining - 1)
+            self.__quotas[endpoint] = (reset, remaining)
+
+        return {
+            "x-rate-limit-limit": str(limit),
+            "x-rate-limit-remaining": str(remaining),
+            "x-rate-limit-reset": str(int(reset)),
+        }
+
+    def __reply(
+        self,
+        request: BaseHTTPRequestHandler,
+        status: int,
+        res_json: Any,
+        headers: Dict[str, str],
+    ) -> None:
+        payload: bytes = json.dumps(res_json).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json; charset=utf-8")
+        request.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def __stream(
+        self, request: BaseHTTPRequestHandler, headers: Dict[str, str]
+    ) -> None:
+        # Sends every fixture tweet as one line, with a keep-alive, then closes.
+        request.send_response(200)
+        request.send_header("Content-Type", "application/json; charset=utf-8")
+        request.send_header("Connection", "close")
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.close_connection = True
+
+        request.wfile.write(b"\r\n")
+        for tweet in self.tweets.values():
+            line: Dict = {"data": {"id": tweet["id"], "text": tweet["text"]}}
+            request.wfile.write(json.dumps(line).encode("utf-8") + b"\r\n")
+            request.wfile.flush()
+
+    def __forward(
+        self, request: BaseHTTPRequestHandler, key: str, body: Optional[Dict]
+    ) -> None:
+        assert self.cassette is not None
+        response: requests.Response = requests.request(
+            request.command,
+            f"{self.upstream}{request.path}",
+            headers={"Authorization": request.headers["Authorization"]},
+            json=body,
+        )
+        reply: Dict = {
+            "key": key,
+            "status": response.status_code,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower().startswith("x-rate-limit-")
+            },
+            "body": response.json(),
+        }
+        with self.__lock:
+            self.cassette.replies[key] = reply
+        self.__reply(request, reply["status"], reply["body"], reply["headers"])
+
+    def __tweets_response(self, ids: List[str], query: Query, parameter: str) -> Dict:
+        expansions: List[str] = (
+            query["expansions"].split(",") if query.get("expansions") else []
+        )
+        extra: Set[str] = {
+            EXPANSION_FIELDS[name] for name in expansions if name in EXPANSION_FIELDS
+        }
+
+        data: List[Dict] = []
+        errors: List[Dict] = []
+        for id in ids:
+            if id in self.tweets:
+                data.append(select(self.tweets[id], "tweet", query, extra))
+            else:
+                errors.append(not_found("tweet", parameter, id))
+
+        includes: Dict[str, Dict[str, Dict]] = {
+            "users": {},
+            "tweets": {},
+            "media": {},
+            "polls": {},
+        }
+        for tweet in data:
+            attachments: Dict = tweet.get("attachments", {})
+            if "attachments.media_keys" in expansions:
+                for key in attachments.get("media_keys", []):
+                    if key in self.media:
+                        includes["media"][key] = select(self.media[key], "media", query)
+            if "attachments.poll_ids" in expansions:
+                for id in attachments.get("poll_ids", []):
+                    if id in self.polls:
+                        includes["polls"][id] = select(self.polls[id], "poll", query)
+            for expansion in ("author_id", "in_reply_to_user_id"):
+                if expansion in expansions and tweet.get(expansion) in self.users:
+                    user_id: str = tweet[expansion]
+                    includes["users"][user_id] = select(
+                        self.users[user_id], "user", query
+                    )
+            if "referenced_tweets.id" in expansions:
+                for reference in tweet.get("referenced_tweets", []):
+                    if (id := reference["id"]) in self.tweets:
+                        includes["tweets"][id] = select(
+                            self.tweets[id], "tweet", query, extra
+                        )
+
+        res_json: Dict = {}
+        if data:
+            res_json["data"] = data
+        if any(includes.values()):
+            res_json["includes"] = {
+                name: list(items.values()) for name, items in includes.items() if items
+            }
+        if errors:
+            res_json["errors"] = errors
+        return res_json
+
+    def __users_response(
+        self, users: List[Optional[Dict]], keys: List[str], query: Query, parameter: str
+    ) -> Dict:
+        res_json: Dict = {}
+        data: List[Dict] = [select(user, "user", query) for user in users if user]
+        errors: List[Dict] = [
+            not_found("user", parameter, key)
+            for user, key in zip(users, keys)
+            if user is None
+        ]
+        if data:
+            res_json["data"] = data
+        if errors:
+            res_json["errors"] = errors
+        return res_json
+
+    def __page(self, items: List[Any], query: Query, token: str) -> Tuple[List, Dict]:
+        # Paginates by offset; the token is the offset of the next page.
+        start: int = int(query.get(token, 0))
+        size: int = int(query.get("max_results", 10))
+        page: List[Any] = items[start : start + size]
+
+        meta: Dict[str, Any] = {"result_count": len(page)}
+        if start + size < len(items):
+            meta["next_token"] = str(start + size)
+        return page, meta
+
+    def __user_by_username(self, username: str) -> Optional[Dict]:
+        return next(
+            (
+                user
+                for user in self.users.values()
+                if user["username"].lower() == username.lower()
+            ),
+            None,
+        )
+
+    def __get_tweet(self, query: Query, id: str, body: Optional[Dict]) -> Reply:
+        res_json: Dict = self.__tweets_response([id], query, "id")
+        if "data" in res_json:
+            res_json["data"] = res_json["data"][0]
+        return 200, res_json, {}
+
+    def __get_tweets(self, query: Query, body: Optional[Dict]) -> Reply:
+        return 200, self.__tweets_response(query["ids"].split(","), query, "ids"), {}
+
+    def __get_user(self, query: Query, id: str, body: Optional[Dict]) -> Reply:
+        res_json: Dict = self.__users_response([self.users.get(id)], [id], query, "id")
+        if "data" in res_json:
+            res_json["data"] = res_json["data"][0]
+        return 200, res_json, {}
+
+    def __get_user_by_username(
+        self, query: Query, username: str, body: Optional[Dict]
+    ) -> Reply:
+        res_json: Dict = self.__users_response(
+            [self.__user_by_username(username)], [username], query, "username"
+        )
+        if "data" in res_json:
+            res_json["data"] = res_json["data"][0]
+        return 200, res_json, {}
+
+    def __get_users(self, query: Query, body: Optional[Dict]) -> Reply:
+        ids: List[str] = query["ids"].split(",")
+        users: List[Optional[Dict]] = [self.users.get(id) for id in ids]
+        return 200, self.__users_response(users, ids, query, "ids"), {}
+
+    def __get_users_by(self, query: Query, body: Optional[Dict]) -> Reply:
+        usernames: List[str] = query["usernames"].split(",")
+        users: List[Optional[Dict]] = [
+            self.__user_by_username(username) for username in usernames
+        ]
+        return 200, self.__users_response(users, usernames, query, "usernames"), {}
+
+    def __tweet_page(self, tweets: List[Dict], query: Query, token: str) -> Reply:
+        ids: List[str] = sorted(
+            (tweet["id"] for tweet in tweets), key=int, reverse=True
+        )
+        page, meta = self.__page(ids, query, token)
+        res_json: Dict = self.__tweets_response(page, query, "id")
+        res_json["meta"] = meta
+        return 200, res_json, {}
+
+    def __get_timeline(self, query: Query, id: str, body: Optional[Dict]) -> Reply:
+        tweets: List[Dict] = [
+            tweet for tweet in self.tweets.values() if tweet.get("author_id") == id
+        ]
+        return self.__tweet_page(tweets, query, "pagination_token")
+
+    def __get_mentions(self, query: Query, id: str, body: Optional[Dict]) -> Reply:
+        username: str = self.users[id]["username"].lower() if id in self.users else ""
+        tweets: List[Dict] = [
+            tweet
+            for tweet in self.tweets.values()
+            if any(
+                mention.get("username", mention.get("tag", "")).lower() == username
+                for mention in tweet.get("entities", {}).get("mentions", [])
+            )
+        ]
+        return self.__tweet_page(tweets, query, "pagination_token")
+
+    def __search(self, query: Query, body: Optional[Dict]) -> Reply:
+        # Only plain keywords are supported; each one has to be in the text.
+        keywords: List[str] = query["query"].lower().split()
+        tweets: List[Dict] = [
+            tweet
+            for tweet in self.tweets.values()
+            if all(keyword in tweet["text"].lower() for keyword in keywords)
+        ]
+        return self.__tweet_page(tweets, query, "next_token")
+
+    def __user_page(self, ids: List[str], query: Query) -> Reply:
+        page, meta = self.__page(ids, query, "pagination_token")
+        res_json: Dict = self.__users_response(
+            [self.users.get(id) for id in page], page, query, "id"
+        )
+        res_json["meta"] = meta
+        return 200, res_json, {}
+
+    def __get_following(self, query: Query, id: str, body: Optional[Dict]) -> Reply:
+        return self.__user_page(self.following.get(id, []), query)
+
+    def __get_followers(self, query: Query, id: str, body: Optional[Dict]) -> Reply:
+        followers: List[str] = [
+            follower for follower, ids in self.following.items() if id in ids
+        ]
+        return self.__user_page(followers, query)
+
+    def __get_rules(self, query: Query, body: Optional[Dict]) -> Reply:
+        return 200, {"data": self.rules, "meta": {"result_count": len(self.rules)}}, {}
+
+    def __post_rules(self, query: Query, body: Optional[Dict]) -> Reply:
+        body = body or {}
+        added: List[Dict] = []
+        with self.__lock:
+            for rule in body.get("add", []):
+                self.__rule_ids += 1
+                added.append({**rule, "id": str(self.__rule_ids)})
+            if query.get("dry_run") != "true":
+                self.rules.extend(added)
+            if "delete" in body:
+                ids: List[str] = body["delete"]["ids"]
+                self.rules = [rule for rule in self.rules if rule["id"] not in ids]
+
+        return 201 if added else 200, {"data": added} if added else {}, {}
@@ -0,0 +1,99 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import Callable, Dict, Generic, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Outcome(Generic[T, R]):
+    # Result of fetching one item: value when it succeeded, error when not.
+
+    __slots__ = ("index", "item", "value", "error")
+
+    def __init__(
+        self,
+        index: int,
+        item: T,
+        value: Optional[R] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        # Position of item in the input
+        self.index: int = index
+        self.item: T = item
+        self.value: Optional[R] = value
+        self.error: Optional[BaseException] = error
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return f"Outcome({self.item!r}, error={self.error!r})"
+        return f"Outcome({self.item!r}, {self.value!r})"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def fan_out(
+    fetch: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+    ordered: bool = True,
+    executor: Optional[Executor] = None,
+) -> Iterator[Outcome[T, R]]:
+    # Runs fetch(item) for every item on up to max_workers threads and yields
+    # an Outcome per item, in input order or as completed.
+    #
+    # Items are pulled lazily and at most 2 * max_workers of them are in
+    # flight or waiting for their turn, so a generator of millions of IDs is
+    # not submitted up front and a slow item does not let reordered results
+    # pile up. An exception of fetch fails only its own item. Closing the
+    # generator cancels the items which have not started.
+    #
+    # By default a thread pool of max_workers is used; a given executor, e.g.
+    # a ProcessPoolExecutor for CPU-bound work, is left open.
+    if max_workers < 1:
+        raise ValueError("max_workers must be positive.")
+
+    window: int = 2 * max_workers
+    iterator: Iterator[Tuple[int, T]] = enumerate(items)
+    pending: Dict["Future[R]", Tuple[int, T]] = {}
+    # Finished outcomes waiting for the ones before them
+    finished: Dict[int, Outcome[T, R]] = {}
+    next_index: int = 0
+
+    pool: Executor = executor or ThreadPoolExecutor(max_workers)
+    try:
+        while True:
+            for index, item in islice(iterator, window - len(pending) - len(finished)):
+                pending[pool.submit(fetch, item)] = (index, item)
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                outcome: Outcome[T, R] = (
+                    Outcome(index, item, error=error)
+                    if (error := future.exception()) is not None
+                    else Outcome(index, item, future.result())
+                )
+                if ordered:
+                    finished[index] = outcome
+                else:
+                    yield outcome
+
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown(wait=True)
@@ -0,0 +1,53 @@
+from threading import Lock
+from typing import Optional
+from weakref import WeakValueDictionary
+
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.User import User
+
+
+class IdentityMap:
+    # Keeps one Tweet/User instance per ID while it is referenced anywhere.
+    #
+    # When an ID is seen again, e.g. the same author expanded on every page of
+    # a timeline, the known instance is updated with the new fields and
+    # returned instead of the new one, so repeated objects are not duplicated
+    # and later updates are visible to every holder. Instances are held weakly
+    # and dropped once nothing else refers to them. Share one instance per
+    # client or crawl.
+
+    def __init__(self) -> None:
+        self.__tweets: "WeakValueDictionary[str, Tweet]" = WeakValueDictionary()
+        self.__users: "WeakValueDictionary[str, User]" = WeakValueDictionary()
+        self.__lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.__tweets) + len(self.__users)
+
+    def get_tweet(self, id: str) -> Optional[Tweet]:
+        return self.__tweets.get(id)
+
+    def get_user(self, id: str) -> Optional[User]:
+        return self.__users.get(id)
+
+    def tweet(self, tweet: Tweet) -> Tweet:
+        # Returns the shared instance for tweet.id, updated with tweet.
+        with self.__lock:
+            if (known := self.__tweets.get(tweet.id)) is None:
+                self.__tweets[tweet.id] = tweet
+                return tweet
+
+            if known is not tweet:
+                known.update(tweet)
+            return known
+
+    def user(self, user: User) -> User:
+        # Returns the shared instance for user.id, updated with user.
+        with self.__lock:
+            if (known := self.__users.get(user.id)) is None:
+                self.__users[user.id] = user
+                return user
+
+            if known is not user:
+                known.update(user)
+            return known
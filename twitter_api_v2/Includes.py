@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional
+
+from twitter_api_v2.IdentityMap import IdentityMap
+from twitter_api_v2.Media import Media
+from twitter_api_v2.Poll import Poll
+from twitter_api_v2.Tweet import ReferencedTweetPair, Tweet
+from twitter_api_v2.User import User
+
+
+class Includes:
+    # Index of the "includes" of one response.
+    #
+    # Expanded objects are parsed once per response and keyed by media_key,
+    # user ID, tweet ID and poll ID, so that resolve() links each tweet to its
+    # own attachments, author and referenced tweets with dict lookups instead
+    # of every tweet of a batch getting every included object.
+
+    __slots__ = ("media", "users", "tweets", "polls")
+
+    def __init__(
+        self,
+        includes: Optional[Dict] = None,
+        lazy: bool = False,
+        identity_map: Optional[IdentityMap] = None,
+    ) -> None:
+        includes = includes or {}
+
+        self.media: Dict[str, Media] = {
+            data["media_key"]: Media(data) for data in includes.get("media", [])
+        }
+        self.users: Dict[str, User] = {}
+        for data in includes.get("users", []):
+            user: User = User(**data)
+            if identity_map is not None:
+                user = identity_map.user(user)
+            self.users[user.id] = user
+
+        self.polls: Dict[str, Poll] = {
+            data["id"]: Poll(data) for data in includes.get("polls", [])
+        }
+        self.tweets: Dict[str, Tweet] = {}
+        for data in includes.get("tweets", []):
+            tweet: Tweet = Tweet(**data, lazy=lazy)
+            if identity_map is not None:
+                tweet = identity_map.tweet(tweet)
+            self.tweets[tweet.id] = tweet
+
+        # Included tweets may also point at included objects.
+        for tweet in self.tweets.values():
+            self.resolve(tweet)
+
+    def resolve(self, tweet: Tweet) -> Tweet:
+        # Links only the objects this response includes. A tweet shared by an
+        # IdentityMap keeps the links of earlier responses when this one was
+        # fetched without the expansions, and attachments stay None ("not
+        # requested") unless one of them is included.
+        if tweet.attachments:
+            media_keys: List[str] = tweet.attachments.get("media_keys", [])
+            if medias := [self.media[key] for key in media_keys if key in self.media]:
+                tweet.medias = medias
+            poll_ids: List[str] = tweet.attachments.get("poll_ids", [])
+            if polls := [self.polls[id] for id in poll_ids if id in self.polls]:
+                tweet.polls = polls
+
+        if (author := self.users.get(tweet.author_id or "")) is not None:
+            tweet.author = author
+        if (user := self.users.get(tweet.in_reply_to_user_id or "")) is not None:
+            tweet.in_reply_to_user = user
+
+        referenced: List[ReferencedTweetPair] = [
+            (reference["type"], self.tweets[reference["id"]])
+            for reference in tweet.referenced_tweets or []
+            if reference["id"] in self.tweets
+        ]
+        if referenced:
+            tweet.referenced = referenced
+
+        return tweet
+
+
+def select_includes(data: Dict, includes: Optional[Dict]) -> Dict:
+    # Returns the raw includes which data and its referenced tweets point at,
+    # so that one tweet of a batch can be stored with only its own expansions.
+    if not includes:
+        return {}
+
+    media: Dict[str, Dict] = {
+        item["media_key"]: item for item in includes.get("media", [])
+    }
+    users: Dict[str, Dict] = {item["id"]: item for item in includes.get("users", [])}
+    polls: Dict[str, Dict] = {item["id"]: item for item in includes.get("polls", [])}
+    tweets: Dict[str, Dict] = {item["id"]: item for item in includes.get("tweets", [])}
+
+    selected: Dict[str, Dict[str, Dict]] = {
+        "media": {},
+        "users": {},
+        "polls": {},
+        "tweets": {},
+    }
+    pending: List[Dict] = [data]
+    while pending:
+        tweet: Dict = pending.pop()
+        attachments: Dict = tweet.get("attachments", {})
+        for key in attachments.get("media_keys", []):
+            if key in media:
+                selected["media"][key] = media[key]
+        for id in attachments.get("poll_ids", []):
+            if id in polls:
+                selected["polls"][id] = polls[id]
+        for field in ("author_id", "in_reply_to_user_id"):
+            if (id := tweet.get(field)) in users:
+                selected["users"][id] = users[id]
+        for reference in tweet.get("referenced_tweets", []):
+            if (id := reference["id"]) in tweets and id not in selected["tweets"]:
+                selected["tweets"][id] = tweets[id]
+                pending.append(tweets[id])
+
+    return {name: list(items.values()) for name, items in selected.items() if items}
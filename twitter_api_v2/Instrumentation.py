@@ -0,0 +1,262 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from logging import Logger
+from typing import Callable, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover
+    prometheus_client = None  # type: ignore
+
+logger: Logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the latency histograms
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Upper bounds in bytes of the response size histogram
+SIZE_BUCKETS: Tuple[float, ...] = (
+    256,
+    1024,
+    4096,
+    16384,
+    65536,
+    262144,
+    1048576,
+    4194304,
+)
+
+
+class RequestMetrics:
+    # Measurements of one request, handed to every hook once it is done.
+    #
+    # Times are in seconds. wait is the time spent in the rate limiter and
+    # total runs from sending the request until the body is read. dns and
+    # connect are only known with aiohttp and are 0.0 on a pooled connection;
+    # ttfb is the time until the response headers arrived. Fields of phases
+    # which were not reached, e.g. parse after an error status, stay None.
+
+    __slots__ = (
+        "endpoint",
+        "method",
+        "status",
+        "wait",
+        "dns",
+        "connect",
+        "ttfb",
+        "total",
+        "response_bytes",
+        "decode",
+        "parse",
+        "rate_limit_limit",
+        "rate_limit_remaining",
+        "rate_limit_reset",
+        "error",
+    )
+
+    def __init__(self, endpoint: str, method: str = "GET") -> None:
+        self.endpoint: str = endpoint
+        self.method: str = method
+        # 0 when no response was received, see error
+        self.status: int = 0
+        self.wait: float = 0.0
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.total: Optional[float] = None
+        self.response_bytes: int = 0
+        self.decode: Optional[float] = None
+        self.parse: Optional[float] = None
+        self.rate_limit_limit: Optional[int] = None
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[float] = None
+        # Class name of the exception which failed the request, if any
+        self.error: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestMetrics({self.method} {self.endpoint} {self.status} "
+            f"total={self.total} bytes={self.response_bytes})"
+        )
+
+    def read_headers(self, headers: Mapping[str, str]) -> None:
+        # Takes the quota from the x-rate-limit-* headers.
+        if (limit := headers.get("x-rate-limit-limit")) is not None:
+            self.rate_limit_limit = int(limit)
+        if (remaining := headers.get("x-rate-limit-remaining")) is not None:
+            self.rate_limit_remaining = int(remaining)
+        if (reset := headers.get("x-rate-limit-reset")) is not None:
+            self.rate_limit_reset = float(reset)
+
+
+Hook = Callable[[RequestMetrics], None]
+
+# Metrics held back by Instrumentation.defer() in the current thread or task
+_deferred: "ContextVar[Optional[List[RequestMetrics]]]" = ContextVar(
+    "deferred", default=None
+)
+
+
+class Instrumentation:
+    # Calls every hook with the RequestMetrics of each request.
+    #
+    # Hooks run on the thread (or event loop) which made the request, so they
+    # should only record, e.g. increment counters. An exception in a hook is
+    # logged and does not fail the request.
+
+    def __init__(self, hooks: Iterable[Hook] = ()) -> None:
+        self.hooks: List[Hook] = list(hooks)
+
+    def add(self, hook: Hook) -> None:
+        self.hooks.append(hook)
+
+    def emit(self, metrics: RequestMetrics) -> None:
+        if (deferred := _deferred.get()) is not None:
+            deferred.append(metrics)
+            return
+
+        for hook in self.hooks:
+            try:
+                hook(metrics)
+            except Exception:
+                logger.exception("Instrumentation hook failed")
+
+    @contextmanager
+    def defer(self) -> Iterator[List[RequestMetrics]]:
+        # Holds back metrics emitted inside the block, so that the caller can
+        # add the parse time of the response before emitting them.
+        deferred: List[RequestMetrics] = []
+        token: Token = _deferred.set(deferred)
+        try:
+            yield deferred
+        except BaseException:
+            # A failed request is not parsed, so it is reported right away.
+            _deferred.reset(token)
+            self.flush(deferred)
+            raise
+        _deferred.reset(token)
+
+    def flush(
+        self, deferred: List[RequestMetrics], parse: Optional[float] = None
+    ) -> None:
+        for metrics in deferred:
+            metrics.parse = parse
+            self.emit(metrics)
+
+
+class PrometheusHook:
+    # Records RequestMetrics as Prometheus counters, histograms and gauges,
+    # labelled by endpoint:
+    #
+    #   <namespace>_requests_total{endpoint, method, status}
+    #   <namespace>_request_errors_total{endpoint, error}
+    #   <namespace>_request_{wait,dns,connect,ttfb,total}_seconds{endpoint}
+    #   <namespace>_response_{decode,parse}_seconds{endpoint}
+    #   <namespace>_response_bytes{endpoint}
+    #   <namespace>_rate_limit_{remaining,reset_timestamp_seconds}{endpoint}
+    #
+    # Pass an instance as a hook: Instrumentation([PrometheusHook()]).
+
+    def __init__(
+        self,
+        namespace: str = "twitter_api",
+        registry: Optional["prometheus_client.CollectorRegistry"] = None,
+        latency_buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+        size_buckets: Tuple[float, ...] = SIZE_BUCKETS,
+    ) -> None:
+        if prometheus_client is None:
+            raise ImportError(
+                "PrometheusHook requires prometheus_client to be installed."
+            )
+
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+
+        def histogram(
+            name: str, description: str, buckets: Tuple[float, ...]
+        ) -> "prometheus_client.Histogram":
+            return prometheus_client.Histogram(
+                name,
+                description,
+                ["endpoint"],
+                namespace=namespace,
+                registry=registry,
+                buckets=buckets,
+            )
+
+        self.requests: "prometheus_client.Counter" = prometheus_client.Counter(
+            "requests_total",
+            "Requests by endpoint and response status",
+            ["endpoint", "method", "status"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.errors: "prometheus_client.Counter" = prometheus_client.Counter(
+            "request_errors_total",
+            "Requests which got no response",
+            ["endpoint", "error"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.latencies: List[Tuple[str, "prometheus_client.Histogram"]] = [
+            (
+                phase,
+                histogram(f"request_{phase}_seconds", description, latency_buckets),
+            )
+            for phase, description in (
+                ("wait", "Time waited for the rate limiter"),
+                ("dns", "Time resolving the host name"),
+                ("connect", "Time establishing the connection"),
+                ("ttfb", "Time until the response headers arrived"),
+                ("total", "Time until the response body was read"),
+                ("decode", "Time decoding the JSON body"),
+                ("parse", "Time building models from the body"),
+            )
+        ]
+        self.response_bytes: "prometheus_client.Histogram" = histogram(
+            "response_bytes", "Size of response bodies", size_buckets
+        )
+        self.rate_limit_remaining: "prometheus_client.Gauge" = prometheus_client.Gauge(
+            "rate_limit_remaining",
+            "Requests left in the current rate limit window",
+            ["endpoint"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.rate_limit_reset: "prometheus_client.Gauge" = prometheus_client.Gauge(
+            "rate_limit_reset_timestamp_seconds",
+            "Time at which the rate limit window resets",
+            ["endpoint"],
+            namespace=namespace,
+            registry=registry,
+        )
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        endpoint: str = metrics.endpoint
+        if metrics.error is not None:
+            self.errors.labels(endpoint, metrics.error).inc()
+        else:
+            self.requests.labels(endpoint, metrics.method, str(metrics.status)).inc()
+            self.response_bytes.labels(endpoint).observe(metrics.response_bytes)
+
+        for phase, histogram in self.latencies:
+            if (seconds := getattr(metrics, phase)) is not None:
+                histogram.labels(endpoint).observe(seconds)
+
+        if metrics.rate_limit_remaining is not None:
+            self.rate_limit_remaining.labels(endpoint).set(metrics.rate_limit_remaining)
+        if metrics.rate_limit_reset is not None:
+            self.rate_limit_reset.labels(endpoint).set(metrics.rate_limit_reset)
@@ -0,0 +1,45 @@
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Decodes a JSON document from the raw bytes of a response body
+Loads = Callable[[bytes], Any]
+
+BACKENDS: Dict[str, Loads] = {"json": json.loads}
+
+try:
+    import orjson
+
+    BACKENDS["orjson"] = orjson.loads
+except ImportError:  # pragma: no cover
+    pass
+
+try:
+    import simdjson  # type: ignore
+
+    BACKENDS["simdjson"] = simdjson.loads
+except ImportError:  # pragma: no cover
+    pass
+
+try:
+    import ujson  # type: ignore
+
+    BACKENDS["ujson"] = ujson.loads
+except ImportError:  # pragma: no cover
+    pass
+
+# Fastest first; the stdlib json is always available.
+PREFERENCE: Tuple[str, ...] = ("orjson", "simdjson", "ujson", "json")
+
+
+def get_loads(backend: Optional[str] = None) -> Loads:
+    # Returns the named backend, or the fastest installed one.
+    if backend is None:
+        return next(BACKENDS[name] for name in PREFERENCE if name in BACKENDS)
+
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"JSON backend '{backend}' is not installed. "
+            f"Available: {', '.join(BACKENDS.keys())}"
+        )
+
+    return BACKENDS[backend]
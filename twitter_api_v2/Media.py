@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import Optional
+from typing import Dict, Optional
 
-from twitter_api_v2.util import get_additional_field
+from twitter_api_v2.util import get_additional_field, slots_from_dict, slots_to_dict
 
 
 class Type(Enum):
@@ -27,6 +27,16 @@ class Field(Enum):
 
 
 class Media:
+    __slots__ = (
+        "media_key",
+        "type",
+        "height",
+        "width",
+        "duration_ms",
+        "preview_image_url",
+        "view_count",
+    )
+
     def __init__(self, data: dict) -> None:
 
         # default
@@ -47,3 +57,14 @@ class Media:
         public_metric = get_additional_field(data, Field.VIEW_COUNT.value)
         if public_metric:
             self.view_count = int(public_metric["view_count"])
+
+    def to_dict(self) -> Dict:
+        data: Dict = slots_to_dict(self)
+        data["type"] = self.type.value
+        return data
+
+    @staticmethod
+    def from_dict(data: Dict) -> "Media":
+        media: Media = slots_from_dict(Media, data)
+        media.type = Type(media.type)
+        return media
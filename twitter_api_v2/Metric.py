@@ -2,10 +2,12 @@ from abc import ABCMeta
 
 
 class Metric(metaclass=ABCMeta):
-    pass
+    __slots__ = ()
 
 
 class PublicMetric:
+    __slots__ = ("retweet_count", "quote_count", "like_count", "reply_count")
+
     def __init__(self, data: dict) -> None:
 
         self.retweet_count: int = int(data["retweet_count"])
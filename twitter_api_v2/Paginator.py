@@ -0,0 +1,94 @@
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Fetches the page after the given next_token (None for the first page).
+FetchPage = Callable[[Optional[str]], Dict]
+
+
+def paginate(
+    fetch_page: FetchPage,
+    parse: Callable[[Dict], List[T]],
+    prefetch: int = 0,
+) -> Iterator[T]:
+    # Yields objects of each page in order, following meta.next_token until
+    # the last page.
+    #
+    # With prefetch > 0, up to `prefetch` pages are fetched on a background
+    # thread ahead of the caller, so the next request is in flight while the
+    # current page is consumed. Closing the generator stops the thread.
+    pages: Iterator[Dict] = (
+        _prefetch_pages(fetch_page, prefetch) if prefetch > 0 else _pages(fetch_page)
+    )
+
+    for res_json in pages:
+        yield from parse(res_json)
+
+
+def _next_token(res_json: Dict) -> Optional[str]:
+    return res_json.get("meta", {}).get("next_token")
+
+
+def _pages(fetch_page: FetchPage) -> Iterator[Dict]:
+    next_token: Optional[str] = None
+    while True:
+        res_json: Dict = fetch_page(next_token)
+        yield res_json
+
+        if (next_token := _next_token(res_json)) is None:
+            return
+
+
+def _prefetch_pages(fetch_page: FetchPage, prefetch: int) -> Iterator[Dict]:
+    # (page, None) for a page, (None, exception) for a failure and
+    # (None, None) after the last page.
+    queue: "Queue[Tuple[Optional[Dict], Optional[BaseException]]]" = Queue(prefetch)
+    stopped: Event = Event()
+
+    def put(item: Tuple[Optional[Dict], Optional[BaseException]]) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for res_json in _pages(fetch_page):
+                if not put((res_json, None)):
+                    return
+        except BaseException as e:
+            put((None, e))
+            return
+        put((None, None))
+
+    thread: Thread = Thread(target=produce, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            res_json, error = queue.get()
+            if error is not None:
+                raise error
+            if res_json is None:
+                return
+            yield res_json
+    finally:
+        # The producer gives up putting once stopped, so it exits after the
+        # request in flight (if any) without being joined here.
+        stopped.set()
+
+
+def with_token(
+    params: Optional[Dict[str, str]], name: str, next_token: Optional[str]
+) -> Dict[str, str]:
+    # Adds the pagination token, which is `pagination_token` on timelines and
+    # follows lookups and `next_token` on search.
+    if next_token is None:
+        return {**(params or {})}
+
+    return {**(params or {}), name: next_token}
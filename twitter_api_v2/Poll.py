@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional
 
-from twitter_api_v2.util import get_additional_field
+from twitter_api_v2.util import get_additional_field, slots_from_dict, slots_to_dict
 
 
 class Status(Enum):
@@ -15,6 +15,8 @@ class Status(Enum):
 
 
 class Option:
+    __slots__ = ("position", "label", "votes")
+
     def __init__(self, data: Dict) -> None:
         self.position: int = int(data["position"])
         self.label: str = data["label"]
@@ -32,6 +34,8 @@ class Field(Enum):
 
 
 class Poll:
+    __slots__ = ("id", "options", "duration_minutes", "end_datetime", "voting_status")
+
     def __init__(self, data: Dict) -> None:
         # default
         self.id: str = data["id"]
@@ -51,3 +55,22 @@ class Poll:
         self.voting_status: Optional[Status] = get_additional_field(
             data, "voting_status", Status
         )
+
+    def to_dict(self) -> Dict:
+        data: Dict = slots_to_dict(self)
+        data["options"] = [slots_to_dict(option) for option in self.options]
+        if self.end_datetime is not None:
+            data["end_datetime"] = self.end_datetime.isoformat()
+        if self.voting_status is not None:
+            data["voting_status"] = self.voting_status.value
+        return data
+
+    @staticmethod
+    def from_dict(data: Dict) -> "Poll":
+        poll: Poll = slots_from_dict(Poll, data)
+        poll.options = [slots_from_dict(Option, option) for option in data["options"]]
+        if poll.end_datetime is not None:
+            poll.end_datetime = datetime.fromisoformat(data["end_datetime"])
+        if poll.voting_status is not None:
+            poll.voting_status = Status(data["voting_status"])
+        return poll
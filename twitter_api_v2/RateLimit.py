@@ -0,0 +1,123 @@
+import asyncio
+import time
+from threading import Lock
+from typing import Callable, Dict, Mapping, Optional
+
+# Twitter API v2 rate limits are counted in fixed 15 minutes windows.
+DEFAULT_WINDOW: float = 15 * 60
+
+
+class Bucket:
+    # Quota of one endpoint, e.g. "/tweets/:id".
+    #
+    # Requests are spread evenly over what is left of the window: each reserved
+    # slot is `(reset - now) / remaining` seconds after the previous one, with
+    # up to `burst` slots allowed back to back. When the quota is exhausted,
+    # callers are scheduled from the reset time on.
+
+    def __init__(
+        self,
+        burst: int = 1,
+        window: float = DEFAULT_WINDOW,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset: Optional[float] = None
+
+        self.__burst: int = max(1, burst)
+        self.__window: float = window
+        self.__clock: Callable[[], float] = clock
+        # Theoretical time at which the next request may be sent
+        self.__next_at: float = 0.0
+        self.__lock: Lock = Lock()
+
+    def reserve(self) -> float:
+        # Consumes one request and returns how many seconds to wait before it.
+        with self.__lock:
+            if self.limit is None or self.remaining is None or self.reset is None:
+                return 0.0
+
+            now: float = self.__clock()
+            not_before: float = now
+            if now >= self.reset:
+                self.__roll(now)
+            if self.remaining <= 0:
+                not_before = self.reset
+                self.__next_at = max(self.__next_at, self.reset)
+                self.__roll(self.reset)
+
+            self.__next_at = max(now, self.__next_at)
+            interval: float = max(0.0, self.reset - self.__next_at) / max(
+                1, self.remaining
+            )
+            start: float = max(
+                not_before, self.__next_at - (self.__burst - 1) * interval
+            )
+            self.__next_at += interval
+            self.remaining -= 1
+
+            return start - now
+
+    def update(self, headers: Mapping[str, str], status_code: int) -> None:
+        if "x-rate-limit-reset" not in headers:
+            return
+
+        with self.__lock:
+            reset: float = float(headers["x-rate-limit-reset"])
+            remaining: int = int(headers.get("x-rate-limit-remaining", 0))
+            if status_code == 429:
+                remaining = 0
+
+            self.limit = int(headers.get("x-rate-limit-limit", remaining))
+            # Responses of concurrent requests arrive out of order, so within
+            # the same window the lowest known remaining wins.
+            if self.reset == reset and self.remaining is not None:
+                self.remaining = min(self.remaining, remaining)
+            else:
+                self.remaining = remaining
+                self.reset = reset
+
+    def __roll(self, at: float) -> None:
+        assert self.reset is not None
+        while self.reset <= at:
+            self.reset += self.__window
+        self.remaining = self.limit
+
+
+class RateLimiter:
+    # Rate limits are per endpoint and per token, so share one instance between
+    # clients using the same bearer token.
+
+    def __init__(
+        self,
+        burst: int = 1,
+        window: float = DEFAULT_WINDOW,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.__burst: int = burst
+        self.__window: float = window
+        self.__clock: Callable[[], float] = clock
+        self.__buckets: Dict[str, Bucket] = {}
+        self.__lock: Lock = Lock()
+
+    def bucket(self, endpoint: str) -> Bucket:
+        with self.__lock:
+            if endpoint not in self.__buckets:
+                self.__buckets[endpoint] = Bucket(
+                    self.__burst, self.__window, self.__clock
+                )
+            return self.__buckets[endpoint]
+
+    def acquire(self, endpoint: str) -> None:
+        if (delay := self.bucket(endpoint).reserve()) > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, endpoint: str) -> None:
+        if (delay := self.bucket(endpoint).reserve()) > 0:
+            await asyncio.sleep(delay)
+
+    def update(
+        self, endpoint: str, headers: Mapping[str, str], status_code: int
+    ) -> None:
+        self.bucket(endpoint).update(headers, status_code)
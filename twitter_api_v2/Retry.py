@@ -0,0 +1,159 @@
+import asyncio
+import random
+import time
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple, Type
+
+import requests
+
+from twitter_api_v2.Error import CircuitOpenError, RateLimitError, ServerError
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+# Failures to get a response at all, which may succeed when tried again
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (
+    requests.ConnectionError,
+    requests.Timeout,
+    asyncio.TimeoutError,
+)
+if aiohttp is not None:
+    TRANSIENT_ERRORS += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+
+def is_transient(error: BaseException) -> bool:
+    # Whether the error means the API (or the way to it) is degraded, as
+    # opposed to a problem of the request itself.
+    return isinstance(error, (ServerError, *TRANSIENT_ERRORS))
+
+
+class RetryPolicy:
+    # Decides whether a failed request is sent again and after how long.
+    #
+    # 5xx responses and connection errors are retried with exponential backoff
+    # and full jitter: a random wait of up to backoff * 2 ** attempt, capped at
+    # max_backoff, so that a fleet of clients failing together does not retry
+    # in lockstep. A 429 waits for Retry-After or until x-rate-limit-reset,
+    # plus up to `backoff` of jitter, unless that is longer than
+    # max_rate_limit_wait. Other errors are raised at once, as are methods not
+    # in `methods`, e.g. adding stream rules is not safe to repeat.
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        max_rate_limit_wait: float = 15 * 60,
+        methods: Tuple[str, ...] = ("GET",),
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        self.max_retries: int = max_retries
+        self.backoff: float = backoff
+        self.max_backoff: float = max_backoff
+        self.max_rate_limit_wait: float = max_rate_limit_wait
+        self.methods: Tuple[str, ...] = methods
+        # Used by TwitterAPI; AsyncTwitterAPI awaits asyncio.sleep.
+        self.sleep: Callable[[float], None] = sleep
+
+        self.__clock: Callable[[], float] = clock
+        self.__jitter: Callable[[], float] = jitter
+
+    def delay(
+        self, attempt: int, error: BaseException, method: str = "GET"
+    ) -> Optional[float]:
+        # Seconds to wait before retry number attempt + 1, or None to raise.
+        if attempt >= self.max_retries or method not in self.methods:
+            return None
+
+        if isinstance(error, RateLimitError):
+            wait: Optional[float] = error.retry_after
+            if wait is None and error.reset is not None:
+                wait = max(0.0, error.reset - self.__clock())
+            if wait is None:
+                wait = min(self.max_backoff, self.backoff * 2**attempt)
+            if wait > self.max_rate_limit_wait:
+                return None
+            return wait + self.__jitter() * self.backoff
+
+        if is_transient(error):
+            return self.__jitter() * min(self.max_backoff, self.backoff * 2**attempt)
+
+        return None
+
+
+class Circuit:
+    __slots__ = ("failures", "opened_at", "trial_at")
+
+    def __init__(self) -> None:
+        # Transient failures in a row
+        self.failures: int = 0
+        self.opened_at: Optional[float] = None
+        # When the trial request of a half-open circuit was let through
+        self.trial_at: Optional[float] = None
+
+
+class CircuitBreaker:
+    # Fails requests fast while an endpoint is degraded.
+    #
+    # After `threshold` transient failures in a row (see is_transient), the
+    # circuit of the endpoint opens and requests raise CircuitOpenError
+    # without being sent. After `cooldown` seconds one trial request is let
+    # through: its success closes the circuit and another failure opens it
+    # again. Share one instance between the clients of a process.
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.threshold: int = max(1, threshold)
+        self.cooldown: float = cooldown
+
+        self.__circuits: Dict[str, Circuit] = {}
+        self.__clock: Callable[[], float] = clock
+        self.__lock: Lock = Lock()
+
+    def state(self, endpoint: str) -> str:
+        # "closed", "open" or "half-open"
+        with self.__lock:
+            circuit: Optional[Circuit] = self.__circuits.get(endpoint)
+            if circuit is None or circuit.opened_at is None:
+                return "closed"
+            if self.__clock() - circuit.opened_at < self.cooldown:
+                return "open"
+            return "half-open"
+
+    def before(self, endpoint: str) -> None:
+        # Raises CircuitOpenError unless a request to endpoint may be sent.
+        with self.__lock:
+            circuit: Optional[Circuit] = self.__circuits.get(endpoint)
+            if circuit is None or circuit.opened_at is None:
+                return
+
+            now: float = self.__clock()
+            retry_after: float = circuit.opened_at + self.cooldown - now
+            # A trial which never reported back, e.g. was cancelled, expires
+            # after another cooldown.
+            if circuit.trial_at is not None and now - circuit.trial_at < self.cooldown:
+                retry_after = max(retry_after, circuit.trial_at + self.cooldown - now)
+            if retry_after > 0:
+                raise CircuitOpenError(endpoint, retry_after)
+
+            circuit.trial_at = now
+
+    def success(self, endpoint: str) -> None:
+        with self.__lock:
+            self.__circuits.pop(endpoint, None)
+
+    def failure(self, endpoint: str) -> None:
+        with self.__lock:
+            circuit: Circuit = self.__circuits.setdefault(endpoint, Circuit())
+            circuit.failures += 1
+            if circuit.trial_at is not None or circuit.failures >= self.threshold:
+                circuit.opened_at = self.__clock()
+                circuit.trial_at = None
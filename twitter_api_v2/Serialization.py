@@ -0,0 +1,140 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from twitter_api_v2.Tweet import Tweet
+from twitter_api_v2.User import User
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+# Version of the layout of dumps(), including the fields below and the values
+# of Tweet.to_dict() and User.to_dict(). Bump it when the layout changes, so
+# that data written by another version is refused rather than misread.
+SCHEMA_VERSION: int = 1
+
+# Order of the values of to_dict() in the encoded data, which leaves the keys
+# out
+TWEET_FIELDS: Tuple[str, ...] = (
+    "id",
+    "text",
+    "author_id",
+    "conversation_id",
+    "created_at",
+    "lang",
+    "source",
+    "possibly_sensitive",
+    "public_metrics",
+    "in_reply_to_user_id",
+    "referenced_tweets",
+    "attachments",
+    "context_annotations",
+    "entities",
+    "media",
+    "polls",
+    "geo",
+    "truncated",
+    "withheld",
+)
+
+USER_FIELDS: Tuple[str, ...] = (
+    "id",
+    "name",
+    "username",
+    "created_at",
+    "description",
+    "location",
+    "pinned_tweet_id",
+    "profile_image_url",
+    "protected",
+    "public_metrics",
+    "url",
+    "verified",
+    "withheld",
+)
+
+Model = Union[Tweet, User]
+
+
+def dumps(models: Iterable[Model]) -> bytes:
+    # Encodes tweets and users with msgpack, e.g. to cache hydrated objects or
+    # to send them to another process, as [SCHEMA_VERSION, items, users].
+    #
+    # An item is ["user", values] or ["tweet", values, author,
+    # in_reply_to_user, referenced], where values are the values of to_dict()
+    # in the order of USER_FIELDS or TWEET_FIELDS, the expanded users are
+    # indexes into users, so that an author shared by many tweets is stored
+    # once, and referenced is a list of [type, item].
+    if msgpack is None:
+        raise ImportError("dumps requires msgpack to be installed.")
+
+    # id() of each expanded user to its index in users
+    indexes: Dict[int, int] = {}
+    users: List[List] = []
+
+    def index(user: Optional[User]) -> Optional[int]:
+        if user is None:
+            return None
+        if (found := indexes.get(id(user))) is not None:
+            return found
+        indexes[id(user)] = len(users)
+        users.append(to_values(user.to_dict(), USER_FIELDS))
+        return len(users) - 1
+
+    def encode(model: Model) -> List:
+        if isinstance(model, User):
+            return ["user", to_values(model.to_dict(), USER_FIELDS)]
+        return [
+            "tweet",
+            to_values(model.to_dict(expanded=False), TWEET_FIELDS),
+            index(model.author),
+            index(model.in_reply_to_user),
+            model.referenced
+            and [[type, encode(tweet)] for type, tweet in model.referenced],
+        ]
+
+    items: List[List] = [encode(model) for model in models]
+    return msgpack.packb([SCHEMA_VERSION, items, users])
+
+
+def loads(data: bytes) -> List[Model]:
+    # Decodes the models of dumps() without parsing or checking their fields
+    # again.
+    if msgpack is None:
+        raise ImportError("loads requires msgpack to be installed.")
+
+    unpacked: List[Any] = msgpack.unpackb(data)
+    if unpacked[0] != SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported schema version: {unpacked[0]}, expected {SCHEMA_VERSION}."
+        )
+    users: List[User] = [
+        User.from_dict(dict(zip(USER_FIELDS, user))) for user in unpacked[2]
+    ]
+
+    def decode(item: List) -> Model:
+        if item[0] == "user":
+            return User.from_dict(dict(zip(USER_FIELDS, item[1])))
+
+        _, values, author, in_reply_to_user, referenced = item
+        tweet: Tweet = Tweet.from_dict(dict(zip(TWEET_FIELDS, values)))
+        if author is not None:
+            tweet.author = users[author]
+        if in_reply_to_user is not None:
+            tweet.in_reply_to_user = users[in_reply_to_user]
+        if referenced is not None:
+            tweet.referenced = [
+                (type, decode(referenced_tweet))  # type: ignore
+                for type, referenced_tweet in referenced
+            ]
+        return tweet
+
+    return [decode(item) for item in unpacked[1]]
+
+
+def to_values(data: Dict, fields: Tuple[str, ...]) -> List:
+    # Values of data in the order of fields, without the trailing missing ones.
+    values: List = [data.get(name) for name in fields]
+    while values and values[-1] is None:
+        values.pop()
+    return values
@@ -0,0 +1,59 @@
+import asyncio
+from concurrent.futures import Future
+from threading import Lock
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    # Concurrent calls with the same key wait for the first one and share its
+    # result (or exception) instead of sending identical requests.
+
+    def __init__(self) -> None:
+        self.__calls: Dict[Hashable, Future] = {}
+        self.__lock: Lock = Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self.__lock:
+            if (future := self.__calls.get(key)) is not None:
+                leader: bool = False
+            else:
+                future = self.__calls[key] = Future()
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result: T = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+
+class AsyncSingleFlight:
+    # asyncio version of SingleFlight for one event loop.
+
+    def __init__(self) -> None:
+        self.__calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        # fn() runs in its own task and every caller, the first one included,
+        # waits on it through shield(), so that a cancelled caller neither
+        # stops the call nor cancels it for the others.
+        if (task := self.__calls.get(key)) is None:
+            task = self.__calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self.__done(key, done))
+        return await asyncio.shield(task)
+
+    def __done(self, key: Hashable, task: asyncio.Future) -> None:
+        del self.__calls[key]
+        if not task.cancelled():
+            # Mark as retrieved so a failure nobody waits for is not logged.
+            task.exception()
@@ -0,0 +1,263 @@
+import logging
+import time
+from logging import Logger
+from queue import Full, Queue
+from threading import Thread
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+from requests.models import Response
+
+from twitter_api_v2 import Error, Json, Media, Poll, Tweet, TwitterAPI
+from twitter_api_v2.util import get_additional_field
+
+logger: Logger = logging.getLogger(__name__)
+
+# A single line longer than this means the stream is broken.
+MAX_LINE_BYTES: int = 1024 * 1024
+
+
+class Rule:
+    __slots__ = ("value", "tag", "id")
+
+    def __init__(
+        self, value: str, tag: Optional[str] = None, id: Optional[str] = None
+    ) -> None:
+        self.value: str = value
+        self.tag: Optional[str] = tag
+        self.id: Optional[str] = id
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # Splits a chunked body into lines as chunks arrive. Blank keep-alive
+    # lines are skipped and only the unfinished line is buffered. Every line
+    # of a stream ends in \r\n, so an unfinished line left when the body
+    # ends was cut off by a disconnect and is dropped.
+    buffer: bytes = b""
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line := line.strip():
+                yield line
+
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValueError("Stream line is too long.")
+
+
+class Stream:
+    # Consumer of the filtered stream (/2/tweets/search/stream) and the
+    # sampled stream (/2/tweets/sample/stream).
+    #
+    # sample() and filter() are generators which reconnect on disconnection,
+    # backing off as Twitter asks: linearly up to 16 seconds on network
+    # errors, exponentially from 5 seconds up to 320 seconds on HTTP errors
+    # and from 1 minute on 429.
+
+    def __init__(
+        self,
+        client: TwitterAPI.TwitterAPI,
+        max_retries: Optional[int] = None,
+        json_backend: Optional[str] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.__client: TwitterAPI.TwitterAPI = client
+        self.__max_retries: Optional[int] = max_retries
+        self.__loads: Json.Loads = Json.get_loads(json_backend)
+        self.__sleep: Callable[[float], None] = sleep
+
+        # Number of tweets dropped by consume() because workers were busy
+        self.dropped: int = 0
+
+    def get_rules(self) -> List[Rule]:
+        res_json: Dict = self.__client._request(
+            "/tweets/search/stream/rules", "/tweets/search/stream/rules", None
+        )
+
+        return [
+            Rule(rule["value"], get_additional_field(rule, "tag"), rule["id"])
+            for rule in res_json.get("data", [])
+        ]
+
+    def add_rules(self, rules: List[Rule], dry_run: bool = False) -> List[Rule]:
+        res_json: Dict = self.__client._request(
+            "/tweets/search/stream/rules",
+            "/tweets/search/stream/rules",
+            {"dry_run": "true"} if dry_run else None,
+            method="POST",
+            body={
+                "add": [
+                    (
+                        {"value": rule.value, "tag": rule.tag}
+                        if rule.tag
+                        else {"value": rule.value}
+                    )
+                    for rule in rules
+                ]
+            },
+        )
+
+        if "errors" in res_json.keys():
+            raise Error.ResourceError(
+                Error.Error(res_json["errors"][0]), "/tweets/search/stream/rules"
+            )
+
+        return [
+            Rule(rule["value"], get_additional_field(rule, "tag"), rule["id"])
+            for rule in res_json.get("data", [])
+        ]
+
+    def delete_rules(self, ids: List[str]) -> None:
+        self.__client._request(
+            "/tweets/search/stream/rules",
+            "/tweets/search/stream/rules",
+            None,
+            method="POST",
+            body={"delete": {"ids": ids}},
+        )
+
+    def sample(
+        self,
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+    ) -> Iterator[Tweet.Tweet]:
+        return self.__stream(
+            "/tweets/sample/stream",
+            TwitterAPI.TwitterAPI._make_params(
+                expansions, tweet_fields, media_fields, poll_fields
+            ),
+        )
+
+    def filter(
+        self,
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+    ) -> Iterator[Tweet.Tweet]:
+        return self.__stream(
+            "/tweets/search/stream",
+            TwitterAPI.TwitterAPI._make_params(
+                expansions, tweet_fields, media_fields, poll_fields
+            ),
+        )
+
+    def consume(
+        self,
+        tweets: Iterable[Tweet.Tweet],
+        handler: Callable[[Tweet.Tweet], None],
+        workers: int = 4,
+        queue_size: int = 10000,
+        block: bool = True,
+    ) -> None:
+        # Reads tweets on this thread and runs handler on worker threads.
+        # When the queue is full, reading waits for the handlers. With block
+        # unset, tweets are dropped instead (counted in self.dropped and
+        # logged), so that slow handlers do not stall reading and get the
+        # stream disconnected.
+        queue: Queue = Queue(queue_size)
+
+        def work() -> None:
+            while (tweet := queue.get()) is not None:
+                try:
+                    handler(tweet)
+                except Exception:
+                    logger.exception(f"Failed to handle tweet {tweet.id}")
+
+        threads: List[Thread] = [
+            Thread(target=work, daemon=True) for _ in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        # When dropped tweets were last logged, at most once a minute
+        warned: float = -60.0
+        try:
+            for tweet in tweets:
+                if block:
+                    queue.put(tweet)
+                    continue
+                try:
+                    queue.put_nowait(tweet)
+                except Full:
+                    self.dropped += 1
+                    if time.monotonic() - warned >= 60.0:
+                        warned = time.monotonic()
+                        logger.warning(
+                            f"Handlers are behind, {self.dropped} tweets dropped."
+                        )
+        finally:
+            for _ in threads:
+                queue.put(None)
+            for thread in threads:
+                thread.join()
+
+    def __stream(
+        self, path: str, params: Optional[Dict[str, str]]
+    ) -> Iterator[Tweet.Tweet]:
+        network_errors: int = 0
+        http_errors: int = 0
+        rate_limits: int = 0
+
+        while True:
+            failures: int = network_errors + http_errors + rate_limits
+            if self.__max_retries is not None and failures > self.__max_retries:
+                raise Error.TwitterAPIError(
+                    f"Stream {path} failed {failures} times in a row.", path
+                )
+
+            try:
+                response: Response = self.__client._send(
+                    "GET", path, params, stream=True
+                )
+            except requests.RequestException as e:
+                network_errors += 1
+                logger.warning(f"Failed to connect to {path}: {e}")
+                self.__sleep(min(0.25 * network_errors, 16.0))
+                continue
+
+            with response:
+                if response.status_code == 429:
+                    rate_limits += 1
+                    self.__sleep(min(60.0 * 2 ** (rate_limits - 1), 960.0))
+                    continue
+                if response.status_code >= 500:
+                    http_errors += 1
+                    self.__sleep(min(5.0 * 2 ** (http_errors - 1), 320.0))
+                    continue
+                if response.status_code != 200:
+                    raise Error.response_error(
+                        path, response.status_code, response.text, response.headers
+                    )
+
+                # Failures are reset only once a line arrives, so that a server
+                # which accepts connections and drops them at once still gets
+                # backed off from and counted towards max_retries.
+                received: bool = False
+                try:
+                    for line in iter_lines(response.iter_content(chunk_size=None)):
+                        if not received:
+                            received = True
+                            network_errors = http_errors = rate_limits = 0
+                        res_json: Dict = self.__loads(line)
+                        if "data" in res_json.keys():
+                            yield TwitterAPI.TwitterAPI._parse_tweet(
+                                res_json["data"],
+                                self.__client._parse_includes(res_json),
+                                self.__client.lazy,
+                                self.__client.identity_map,
+                            )
+                        elif "errors" in res_json.keys():
+                            logger.warning(res_json["errors"])
+                    # A clean end of the body is a disconnect all the same.
+                    logger.warning(f"Stream {path} was closed by the server.")
+                except requests.RequestException as e:
+                    logger.warning(f"Disconnected from {path}: {e}")
+                except ValueError as e:
+                    # A line which does not decode, or never ends, means the
+                    # stream is broken, so it is reconnected to as well.
+                    logger.warning(f"Broken stream {path}: {e}")
+                network_errors += 1
+                self.__sleep(min(0.25 * network_errors, 16.0))
@@ -1,14 +1,14 @@
-import logging
+import sys
 from datetime import datetime
 from enum import Enum
-from logging import Logger
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from twitter_api_v2 import ContextAnnotation, Entity
 from twitter_api_v2.Media import Media
 from twitter_api_v2.Metric import PublicMetric
 from twitter_api_v2.Poll import Poll
-from twitter_api_v2.util import get_additional_field
+from twitter_api_v2.User import User
+from twitter_api_v2.util import get_additional_field, slots_from_dict, slots_to_dict
 
 
 class Field(Enum):
@@ -51,6 +51,8 @@ class Expantion(Enum):
 
 
 class Entities:
+    __slots__ = ("annotations", "cashtags", "hashtags", "mentions", "urls")
+
     def __init__(self) -> None:
         self.annotations: Optional[List[Entity.Annotation]] = None
         self.cashtags: Optional[List[Entity.CashTag]] = None
@@ -59,126 +61,102 @@ class Entities:
         self.urls: Optional[List[Entity.Url]] = None
 
 
-class Tweet:
-    def __init__(self, id: str, text: str, *args, **kwargs) -> None:
+ContextAnnotationPair = Tuple[
+    Optional[ContextAnnotation.Domain], Optional[ContextAnnotation.Entity]
+]
+
+# (type of the reference, e.g. "quoted", referenced tweet)
+ReferencedTweetPair = Tuple[str, "Tweet"]
+
+# Fields which are parsed on first access in lazy mode
+LAZY_FIELDS: Tuple[str, ...] = (
+    "context_annotations",
+    "created_at",
+    "entities",
+    "media",
+    "polls",
+)
+
+# Properties of LAZY_FIELDS, in the same order
+LAZY_PROPERTIES: Tuple[str, ...] = (
+    "context_annotations",
+    "created_at",
+    "entities",
+    "medias",
+    "polls",
+)
+
+# Fields which to_dict() keeps as they are
+PLAIN_FIELDS: Tuple[str, ...] = (
+    "id",
+    "text",
+    "attachments",
+    "author_id",
+    "conversation_id",
+    "geo",
+    "in_reply_to_user_id",
+    "lang",
+    "possibly_sensitive",
+    "referenced_tweets",
+    "source",
+    "truncated",
+    "withheld",
+)
+
+# Raw fields of a fully parsed tweet. It is only ever popped from, so it stays empty.
+PARSED: Dict = {}
 
-        self.logger: Logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
+
+class Tweet:
+    __slots__ = (
+        "id",
+        "text",
+        "attachments",
+        "author_id",
+        "conversation_id",
+        "geo",
+        "in_reply_to_user_id",
+        "lang",
+        "public_metrics",
+        "possibly_sensitive",
+        "referenced_tweets",
+        "source",
+        "truncated",
+        "withheld",
+        "author",
+        "in_reply_to_user",
+        "referenced",
+        "_raw",
+        "_context_annotations",
+        "_created_at",
+        "_entities",
+        "_medias",
+        "_polls",
+        "__weakref__",
+    )
+
+    def __init__(self, id: str, text: str, *args, lazy: bool = False, **kwargs) -> None:
 
         # Default fields
         self.id: str = id
         self.text: str = text
 
         # Additional field
+        self.attachments: Optional[Dict[str, Any]] = get_additional_field(
+            kwargs, "attachments"
+        )
         self.author_id: Optional[str] = get_additional_field(kwargs, "author_id")
 
-        # self.context_annotations = get_additional_field(kwargs, "context_annotations")
-        self.context_annotations: Optional[
-            List[
-                Tuple[
-                    Optional[ContextAnnotation.Domain],
-                    Optional[ContextAnnotation.Entity],
-                ]
-            ]
-        ] = None
-        if "context_annotations" in kwargs.keys():
-            self.context_annotations = []
-            for context_annotation_res in kwargs["context_annotations"]:
-                domain: Optional[ContextAnnotation.Domain] = None
-                if (
-                    domain_res := get_additional_field(context_annotation_res, "domain")
-                ) :
-                    domain = ContextAnnotation.Domain(
-                        domain_res["id"],
-                        domain_res["name"],
-                        get_additional_field(domain_res, "description"),
-                    )
-
-                context_entity: Optional[ContextAnnotation.Entity] = None
-                if (
-                    entity_res := get_additional_field(context_annotation_res, "entity")
-                ) :
-                    context_entity = ContextAnnotation.Entity(
-                        entity_res["id"],
-                        entity_res["name"],
-                        get_additional_field(entity_res, "description"),
-                    )
-
-                self.context_annotations.append((domain, context_entity))
-
         self.conversation_id = get_additional_field(kwargs, "conversation_id")
 
-        self.created_at: Optional[datetime] = None
-        if (created_at := get_additional_field(kwargs, "created_at")) is not None:
-            self.created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-
-        # TODO: Implement entities
-        self.entities: Optional[Entities] = None
-        if "entities" in kwargs.keys():
-            tweet_entities: Entities = Entities()
-            entities_res: Dict = kwargs["entities"]
-
-            if "annotations" in entities_res.keys():
-                tweet_entities.annotations = []
-                annotations: List[Dict] = entities_res["annotations"]
-                for annotation in annotations:
-                    tweet_entities.annotations.append(
-                        Entity.Annotation(
-                            annotation["start"],
-                            annotation["end"],
-                            annotation["probability"],
-                            annotation["type"],
-                            annotation["normalized_text"],
-                        )
-                    )
-
-            if "cashtags" in entities_res.keys():
-                tweet_entities.cashtags = []
-                cashtags: List[Dict] = entities_res["cashtags"]
-                for cashtag in cashtags:
-                    tweet_entities.cashtags.append(
-                        Entity.CashTag(cashtag["start"], cashtag["end"], cashtag["tag"])
-                    )
-
-            if "hashtags" in entities_res.keys():
-                tweet_entities.hashtags = []
-                hashtags: List[Dict] = entities_res["hashtags"]
-                for hashtag in hashtags:
-                    tweet_entities.hashtags.append(
-                        Entity.HashTag(hashtag["start"], hashtag["end"], hashtag["tag"])
-                    )
-
-            if "mentions" in entities_res.keys():
-                tweet_entities.mentions = []
-                mentions: List[Dict] = entities_res["mentions"]
-                for mention in mentions:
-                    tweet_entities.mentions.append(
-                        Entity.Mention(mention["start"], mention["end"], mention["tag"])
-                    )
-
-            if "urls" in entities_res.keys():
-                tweet_entities.urls = []
-                urls: List[Dict] = entities_res["urls"]
-                for url in urls:
-                    tweet_entities.urls.append(
-                        Entity.Url(
-                            url["start"],
-                            url["end"],
-                            url["url"],
-                            url["expanded_url"],
-                            url["display_url"],
-                        )
-                    )
-
-            self.entities = tweet_entities
-
         # TODO: Implement Place Object
         self.geo = get_additional_field(kwargs, "geo")
 
         self.in_reply_to_user_id: Optional[str] = get_additional_field(
             kwargs, "in_reply_to_user_id"
         )
-        self.lang: Optional[str] = get_additional_field(kwargs, "lang")
+        # Few distinct values repeated on many tweets, so share one string each.
+        self.lang: Optional[str] = get_additional_field(kwargs, "lang", sys.intern)
 
         self.public_metrics: Optional[PublicMetric] = get_additional_field(
             kwargs, "public_metrics", PublicMetric
@@ -190,19 +168,293 @@ class Tweet:
             else False
         )
         self.referenced_tweets = get_additional_field(kwargs, "referenced_tweets")
-        self.source: Optional[str] = get_additional_field(kwargs, "source")
+        self.source: Optional[str] = get_additional_field(kwargs, "source", sys.intern)
         self.truncated: Optional[bool] = get_additional_field(kwargs, "truncated")
         self.withheld = get_additional_field(kwargs, "withheld")
 
-        # attachment
-        self.medias: Optional[List[Media]] = None
-        if "media" in kwargs.keys():
-            self.medias = []
-            for media in kwargs["media"]:
-                self.medias.append(Media(media))
-
-        self.polls: Optional[List[Poll]] = None
-        if "polls" in kwargs.keys():
-            self.polls = []
-            for poll in kwargs["polls"]:
-                self.polls.append(Poll(poll))
+        # Expanded objects, linked by Includes.resolve()
+        self.author: Optional[User] = None
+        self.in_reply_to_user: Optional[User] = None
+        self.referenced: Optional[List[ReferencedTweetPair]] = None
+
+        # context_annotations, created_at, entities and attachments are built
+        # from the raw response on first access. Each raw field is dropped once
+        # it is parsed, so the parsed value is memoized. It is dropped only
+        # after the parsed value is stored, so that another thread reading the
+        # field meanwhile parses it again rather than getting None.
+        self._raw: Dict = {
+            key: kwargs[key] for key in LAZY_FIELDS if key in kwargs
+        } or PARSED
+        self._context_annotations: Optional[List[ContextAnnotationPair]] = None
+        self._created_at: Optional[datetime] = None
+        self._entities: Optional[Entities] = None
+        self._medias: Optional[List[Media]] = None
+        self._polls: Optional[List[Poll]] = None
+
+        if not lazy:
+            self.parse()
+            # Share one empty dict instead of keeping one per tweet.
+            self._raw = PARSED
+
+    def parse(self) -> None:
+        # Builds every lazy field now.
+        self.context_annotations
+        self.created_at
+        self.entities
+        self.medias
+        self.polls
+
+    def update(self, other: "Tweet") -> None:
+        # Takes the fields other has, keeping the ones it was fetched without.
+        for name in self.__slots__:
+            if not name.startswith("_") and (value := getattr(other, name)) is not None:
+                setattr(self, name, value)
+
+        for key, name in zip(LAZY_FIELDS, LAZY_PROPERTIES):
+            if key in other._raw:
+                if self._raw is PARSED:
+                    self._raw = {}
+                self._raw[key] = other._raw[key]
+            elif (value := getattr(other, name)) is not None:
+                setattr(self, name, value)
+
+    def to_dict(self, expanded: bool = True) -> Dict:
+        # The fields which are set, as plain values for JSON or msgpack; lazy
+        # fields are parsed first. Expanded objects, linked by
+        # Includes.resolve(), are included unless expanded=False.
+        data: Dict = {
+            name: value
+            for name in PLAIN_FIELDS
+            if (value := getattr(self, name)) is not None
+        }
+        if self.public_metrics is not None:
+            data["public_metrics"] = slots_to_dict(self.public_metrics)
+        if (created_at := self.created_at) is not None:
+            data["created_at"] = created_at.isoformat()
+        if (context_annotations := self.context_annotations) is not None:
+            data["context_annotations"] = [
+                [
+                    domain and (domain.id, domain.name, domain.description),
+                    entity and (entity.id, entity.name, entity.description),
+                ]
+                for domain, entity in context_annotations
+            ]
+        if (entities := self.entities) is not None:
+            data["entities"] = Entity.lists_to_dict(entities)
+        if (medias := self.medias) is not None:
+            data["media"] = [media.to_dict() for media in medias]
+        if (polls := self.polls) is not None:
+            data["polls"] = [poll.to_dict() for poll in polls]
+
+        if expanded:
+            if self.author is not None:
+                data["author"] = self.author.to_dict()
+            if self.in_reply_to_user is not None:
+                data["in_reply_to_user"] = self.in_reply_to_user.to_dict()
+            if self.referenced is not None:
+                data["referenced"] = [
+                    [type, tweet.to_dict()] for type, tweet in self.referenced
+                ]
+        return data
+
+    @staticmethod
+    def from_dict(data: Dict) -> "Tweet":
+        # Rebuilds a tweet of to_dict() without parsing its fields again.
+        tweet: Tweet = Tweet.__new__(Tweet)
+        for name in PLAIN_FIELDS:
+            setattr(tweet, name, data.get(name))
+        if tweet.lang is not None:
+            tweet.lang = sys.intern(tweet.lang)
+        if tweet.source is not None:
+            tweet.source = sys.intern(tweet.source)
+
+        tweet.public_metrics = None
+        if (public_metrics := data.get("public_metrics")) is not None:
+            tweet.public_metrics = slots_from_dict(PublicMetric, public_metrics)
+
+        tweet._raw = PARSED
+        tweet._created_at = None
+        if (created_at := data.get("created_at")) is not None:
+            tweet._created_at = datetime.fromisoformat(created_at)
+
+        tweet._context_annotations = None
+        if (context_annotations := data.get("context_annotations")) is not None:
+            tweet._context_annotations = [
+                (
+                    domain and ContextAnnotation.Domain(*domain),
+                    entity and ContextAnnotation.Entity(*entity),
+                )
+                for domain, entity in context_annotations
+            ]
+
+        tweet._entities = None
+        if (entities := data.get("entities")) is not None:
+            tweet._entities = Entities()
+            Entity.lists_from_dict(tweet._entities, entities)
+
+        tweet._medias = None
+        if (medias := data.get("media")) is not None:
+            tweet._medias = [Media.from_dict(media) for media in medias]
+        tweet._polls = None
+        if (polls := data.get("polls")) is not None:
+            tweet._polls = [Poll.from_dict(poll) for poll in polls]
+
+        tweet.author = None
+        if (author := data.get("author")) is not None:
+            tweet.author = User.from_dict(author)
+        tweet.in_reply_to_user = None
+        if (in_reply_to_user := data.get("in_reply_to_user")) is not None:
+            tweet.in_reply_to_user = User.from_dict(in_reply_to_user)
+        tweet.referenced = None
+        if (referenced := data.get("referenced")) is not None:
+            tweet.referenced = [
+                (type, Tweet.from_dict(referenced_tweet))
+                for type, referenced_tweet in referenced
+            ]
+
+        return tweet
+
+    @property
+    def context_annotations(self) -> Optional[List[ContextAnnotationPair]]:
+        if (data := self._raw.get("context_annotations")) is not None:
+            self._context_annotations = parse_context_annotations(data)
+            self._raw.pop("context_annotations", None)
+        return self._context_annotations
+
+    @context_annotations.setter
+    def context_annotations(self, value: Optional[List[ContextAnnotationPair]]) -> None:
+        self._raw.pop("context_annotations", None)
+        self._context_annotations = value
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        if (created_at := self._raw.get("created_at")) is not None:
+            self._created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+            self._raw.pop("created_at", None)
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value: Optional[datetime]) -> None:
+        self._raw.pop("created_at", None)
+        self._created_at = value
+
+    @property
+    def entities(self) -> Optional[Entities]:
+        if (data := self._raw.get("entities")) is not None:
+            self._entities = parse_entities(data)
+            self._raw.pop("entities", None)
+        return self._entities
+
+    @entities.setter
+    def entities(self, value: Optional[Entities]) -> None:
+        self._raw.pop("entities", None)
+        self._entities = value
+
+    # attachment
+    @property
+    def medias(self) -> Optional[List[Media]]:
+        if (data := self._raw.get("media")) is not None:
+            self._medias = [Media(media) for media in data]
+            self._raw.pop("media", None)
+        return self._medias
+
+    @medias.setter
+    def medias(self, value: Optional[List[Media]]) -> None:
+        self._raw.pop("media", None)
+        self._medias = value
+
+    @property
+    def polls(self) -> Optional[List[Poll]]:
+        if (data := self._raw.get("polls")) is not None:
+            self._polls = [Poll(poll) for poll in data]
+            self._raw.pop("polls", None)
+        return self._polls
+
+    @polls.setter
+    def polls(self, value: Optional[List[Poll]]) -> None:
+        self._raw.pop("polls", None)
+        self._polls = value
+
+
+def parse_context_annotations(
+    context_annotations_res: List[Dict],
+) -> List[ContextAnnotationPair]:
+    context_annotations: List[ContextAnnotationPair] = []
+    for context_annotation_res in context_annotations_res:
+        domain: Optional[ContextAnnotation.Domain] = None
+        if (domain_res := get_additional_field(context_annotation_res, "domain")) :
+            domain = ContextAnnotation.Domain(
+                sys.intern(domain_res["id"]),
+                sys.intern(domain_res["name"]),
+                get_additional_field(domain_res, "description", sys.intern),
+            )
+
+        context_entity: Optional[ContextAnnotation.Entity] = None
+        if (entity_res := get_additional_field(context_annotation_res, "entity")) :
+            context_entity = ContextAnnotation.Entity(
+                sys.intern(entity_res["id"]),
+                sys.intern(entity_res["name"]),
+                get_additional_field(entity_res, "description", sys.intern),
+            )
+
+        context_annotations.append((domain, context_entity))
+
+    return context_annotations
+
+
+def parse_entities(entities_res: Dict) -> Entities:
+    tweet_entities: Entities = Entities()
+
+    if "annotations" in entities_res.keys():
+        tweet_entities.annotations = []
+        annotations: List[Dict] = entities_res["annotations"]
+        for annotation in annotations:
+            tweet_entities.annotations.append(
+                Entity.Annotation(
+                    annotation["start"],
+                    annotation["end"],
+                    annotation["probability"],
+                    annotation["type"],
+                    annotation["normalized_text"],
+                )
+            )
+
+    if "cashtags" in entities_res.keys():
+        tweet_entities.cashtags = []
+        cashtags: List[Dict] = entities_res["cashtags"]
+        for cashtag in cashtags:
+            tweet_entities.cashtags.append(
+                Entity.CashTag(cashtag["start"], cashtag["end"], cashtag["tag"])
+            )
+
+    if "hashtags" in entities_res.keys():
+        tweet_entities.hashtags = []
+        hashtags: List[Dict] = entities_res["hashtags"]
+        for hashtag in hashtags:
+            tweet_entities.hashtags.append(
+                Entity.HashTag(hashtag["start"], hashtag["end"], hashtag["tag"])
+            )
+
+    if "mentions" in entities_res.keys():
+        tweet_entities.mentions = []
+        mentions: List[Dict] = entities_res["mentions"]
+        for mention in mentions:
+            tweet_entities.mentions.append(
+                Entity.Mention(mention["start"], mention["end"], mention["tag"])
+            )
+
+    if "urls" in entities_res.keys():
+        tweet_entities.urls = []
+        urls: List[Dict] = entities_res["urls"]
+        for url in urls:
+            tweet_entities.urls.append(
+                Entity.Url(
+                    url["start"],
+                    url["end"],
+                    url["url"],
+                    url["expanded_url"],
+                    url["display_url"],
+                )
+            )
+
+    return tweet_entities
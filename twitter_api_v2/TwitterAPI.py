@@ -1,25 +1,144 @@
-import json
 import logging
+import time
 from logging import Logger
-from typing import Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.models import Response
 
-from twitter_api_v2 import Media, Poll, Tweet, User
+from twitter_api_v2 import Error, Json, Media, Poll, Tweet, User
+from twitter_api_v2.Cache import ResponseCache, make_field_set
+from twitter_api_v2.DiskCache import DiskCache
+from twitter_api_v2.FanOut import Outcome, fan_out
+from twitter_api_v2.IdentityMap import IdentityMap
+from twitter_api_v2.Includes import Includes, select_includes
+from twitter_api_v2.Instrumentation import Instrumentation, RequestMetrics
+from twitter_api_v2.Paginator import paginate, with_token
+from twitter_api_v2.RateLimit import RateLimiter
+from twitter_api_v2.Retry import CircuitBreaker, RetryPolicy, is_transient
+from twitter_api_v2.SingleFlight import SingleFlight
+from twitter_api_v2.util import chunked, unique
 
 logger: Logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+
+# (connect timeout, read timeout) in seconds
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 30.0)
+
+API_URL: str = "https://api.twitter.com/2"
+
+# Maximum number of IDs accepted by the multi-object lookup endpoints
+MAX_IDS_PER_REQUEST: int = 100
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def check_data(res_json: Dict) -> None:
+    # A single object lookup answers a missing object with 200 and errors.
+    if "data" not in res_json and res_json.get("errors"):
+        raise Error.ResourceError(Error.Error(res_json["errors"][0]))
 
 
 class TwitterAPI:
-    def __init__(self, bearer_token: str) -> None:
+    def __init__(
+        self,
+        bearer_token: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        timeout: Optional[Union[float, Tuple[float, float]]] = DEFAULT_TIMEOUT,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = False,
+        lazy: bool = False,
+        json_backend: Optional[str] = None,
+        identity_map: Optional[IdentityMap] = None,
+        disk_cache: Optional[DiskCache] = None,
+        api_url: str = API_URL,
+        instrumentation: Optional[Instrumentation] = None,
+        retry: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
         self.__BEARER_TOKEN: str = bearer_token
         self.__REQUEST_HEADERS: Dict = {
             "Authorization": f"Bearer {self.__BEARER_TOKEN}"
         }
 
-        self.__API_URL: str = "https://api.twitter.com/2"
+        self.__API_URL: str = api_url
+
+        # One long-lived session keeps TCP+TLS connections alive between calls.
+        # pool_connections is the number of per-host pools to keep and
+        # pool_maxsize is the maximum number of connections kept per host.
+        # The session is never mutated after this point, and headers are sent
+        # per request, so one instance can be shared across threads.
+        self.__timeout: Optional[Union[float, Tuple[float, float]]] = timeout
+        self.__session: requests.Session = requests.Session()
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+        self.__pool_maxsize: int = pool_maxsize
+
+        # Response bodies are decoded straight from bytes, by default with the
+        # fastest installed backend (see Json.PREFERENCE).
+        self.__loads: Json.Loads = Json.get_loads(json_backend)
+
+        # When set, requests are paced per endpoint by x-rate-limit-* headers
+        # and callers block until their slot instead of running into a 429.
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+
+        # When set, parsed tweets and users are served from memory until expired.
+        self.cache: Optional[ResponseCache] = cache
+
+        # When set, raw responses are stored on disk and read back before the
+        # network, also after a restart. It is consulted after `cache`.
+        self.disk_cache: Optional[DiskCache] = disk_cache
+
+        # When set, tweets parse entities, context annotations, attachments and
+        # created_at on first access instead of on construction.
+        self.lazy: bool = lazy
+
+        # When set, a tweet or user seen again is merged into the instance
+        # already returned instead of being duplicated.
+        self.identity_map: Optional[IdentityMap] = identity_map
+
+        # When set, every request is reported to its hooks with timings, sizes
+        # and the remaining quota.
+        self.instrumentation: Optional[Instrumentation] = instrumentation
+
+        # When set, failed requests are retried (see RetryPolicy) and requests
+        # to an endpoint which keeps failing raise CircuitOpenError at once.
+        self.retry: Optional[RetryPolicy] = retry
+        self.circuit_breaker: Optional[CircuitBreaker] = circuit_breaker
+
+        # When set, concurrent identical single lookups share one request.
+        self.__single_flight: Optional[SingleFlight] = (
+            SingleFlight() if coalesce else None
+        )
+
+    def __enter__(self) -> "TwitterAPI":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__session.close()
 
     def get_tweet(
         self,
@@ -33,73 +152,641 @@ class TwitterAPI:
         params: Optional[Dict[str, str]] = self._make_params(
             expansions, tweet_fields, media_fields, poll_fields
         )
-        logger.debug(params)
-        response: Response = requests.get(
-            url=f"{self.__API_URL}/tweets/{id}",
-            params=params,
-            headers=self.__REQUEST_HEADERS,
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(params)
+        if self.cache is not None and (
+            cached := self.cache.get("/tweets/:id", id, params)
+        ):
+            return cached
+
+        return self._coalesce(
+            "/tweets/:id", id, params, lambda: self._fetch_tweet(id, params)
+        )
+
+    def get_tweets(
+        self,
+        ids: Iterable[str],
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+    ) -> Tuple[List[Tweet.Tweet], List[Error.Error]]:
+        # Returns found tweets in the order of ids and the errors of missing ones.
+
+        ids = list(ids)
+        params: Dict[str, str] = (
+            self._make_params(expansions, tweet_fields, media_fields, poll_fields) or {}
         )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(params)
+
+        tweets: Dict[str, Tweet.Tweet] = {}
+        errors: List[Error.Error] = []
+        missing: List[str] = unique(ids)
+        if self.cache is not None:
+            cached, missing = self.cache.get_many("/tweets/:id", missing, params)
+            tweets.update(cached)
+        if self.disk_cache is not None:
+            stored, missing = self.disk_cache.get_many("/tweets/:id", missing, params)
+            for entry in stored.values():
+                stored_tweet: Tweet.Tweet = self._parse_tweet(
+                    entry["data"],
+                    self._parse_includes(entry),
+                    self.lazy,
+                    self.identity_map,
+                )
+                tweets[stored_tweet.id] = stored_tweet
+                if self.cache is not None:
+                    self.cache.set("/tweets/:id", stored_tweet.id, params, stored_tweet)
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Request returned an error: {response.status_code} {response.text}"
+        for chunk in chunked(missing, MAX_IDS_PER_REQUEST):
+            res_json, chunk_tweets = self._call(
+                "/tweets",
+                "/tweets",
+                {**params, "ids": ",".join(chunk)},
+                self._parse_tweets,
             )
+            self._store_tweets(params, res_json)
 
-        res_json = json.loads(response.text)
-        logger.debug(res_json)
-        if "includes" in res_json.keys():
-            return Tweet.Tweet(**res_json["data"], **res_json["includes"])
-        else:
-            return Tweet.Tweet(**res_json["data"])
+            for tweet in chunk_tweets:
+                tweets[tweet.id] = tweet
+                if self.cache is not None:
+                    self.cache.set("/tweets/:id", tweet.id, params, tweet)
+            for error in res_json.get("errors", []):
+                errors.append(Error.Error(error))
+
+        return [tweets[id] for id in ids if id in tweets], errors
 
     def get_user_by_id(self, id: str, user_fields: List[User.Field] = []) -> User.User:
-        params: Optional[Dict[str, str]] = None
-        if user_fields:
-            params = {}
-            params["user.fields"] = ",".join(list(map(str, user_fields)))
+        params: Optional[Dict[str, str]] = self._make_user_params(user_fields)
+        if self.cache is not None and (
+            cached := self.cache.get("/users/:id", id, params)
+        ):
+            return cached
+
+        return self._coalesce(
+            "/users/:id",
+            id,
+            params,
+            lambda: self._fetch_user("/users/:id", id, f"/users/{id}", params),
+        )
 
-        response: Response = requests.get(
-            f"{self.__API_URL}/users/{id}",
+    def get_user_by_username(
+        self, username: str, user_fields: List[User.Field] = []
+    ) -> User.User:
+        params: Optional[Dict[str, str]] = self._make_user_params(user_fields)
+        if self.cache is not None and (
+            cached := self.cache.get(
+                "/users/by/username/:username", username.lower(), params
+            )
+        ):
+            return cached
+
+        return self._coalesce(
+            "/users/by/username/:username",
+            username.lower(),
+            params,
+            lambda: self._fetch_user(
+                "/users/by/username/:username",
+                username.lower(),
+                f"/users/by/username/{username}",
+                params,
+            ),
+        )
+
+    def get_users_by_ids(
+        self, ids: Iterable[str], user_fields: List[User.Field] = []
+    ) -> Tuple[Dict[str, User.User], List[Error.Error]]:
+        # Returns found users keyed by ID and the errors of missing ones.
+
+        params: Dict[str, str] = self._make_user_params(user_fields) or {}
+
+        users: Dict[str, User.User] = {}
+        errors: List[Error.Error] = []
+        missing: List[str] = unique(ids)
+        if self.cache is not None:
+            cached, missing = self.cache.get_many("/users/:id", missing, params)
+            users.update(cached)
+        if self.disk_cache is not None:
+            stored, missing = self.disk_cache.get_many("/users/:id", missing, params)
+            for entry in stored.values():
+                stored_user: User.User = self._parse_user(
+                    entry["data"], self.identity_map
+                )
+                users[stored_user.id] = stored_user
+                self._cache_user(params, stored_user)
+
+        for chunk in chunked(missing, MAX_IDS_PER_REQUEST):
+            res_json, chunk_users = self._call(
+                "/users",
+                "/users",
+                {**params, "ids": ",".join(chunk)},
+                self._parse_users,
+            )
+            self._store_users(params, res_json)
+
+            for user in chunk_users:
+                users[user.id] = user
+                self._cache_user(params, user)
+            for error in res_json.get("errors", []):
+                errors.append(Error.Error(error))
+
+        return users, errors
+
+    def get_users_by_usernames(
+        self, usernames: Iterable[str], user_fields: List[User.Field] = []
+    ) -> Tuple[Dict[str, User.User], List[Error.Error]]:
+        # Returns found users keyed by the given username and the errors of missing
+        # ones. Usernames are case-insensitive, so they are matched as lowercase.
+
+        params: Dict[str, str] = self._make_user_params(user_fields) or {}
+
+        requested: Dict[str, str] = {
+            username.lower(): username for username in usernames
+        }
+        users: Dict[str, User.User] = {}
+        errors: List[Error.Error] = []
+        missing: List[str] = list(requested.keys())
+        if self.cache is not None:
+            cached, missing = self.cache.get_many(
+                "/users/by/username/:username", missing, params
+            )
+            users.update({requested[key]: value for key, value in cached.items()})
+        if self.disk_cache is not None:
+            stored, missing = self.disk_cache.get_many(
+                "/users/by/username/:username", missing, params
+            )
+            for key, entry in stored.items():
+                stored_user: User.User = self._parse_user(
+                    entry["data"], self.identity_map
+                )
+                users[requested[key]] = stored_user
+                self._cache_user(params, stored_user)
+
+        for chunk in chunked(missing, MAX_IDS_PER_REQUEST):
+            res_json, chunk_users = self._call(
+                "/users/by",
+                "/users/by",
+                {**params, "usernames": ",".join(chunk)},
+                self._parse_users,
+            )
+            self._store_users(params, res_json)
+
+            for user in chunk_users:
+                users[requested.get(user.username.lower(), user.username)] = user
+                self._cache_user(params, user)
+            for error in res_json.get("errors", []):
+                errors.append(Error.Error(error))
+
+        return users, errors
+
+    def get_user_tweets(
+        self,
+        id: str,
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+        max_results: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[Tweet.Tweet]:
+        # Yields tweets of the user's timeline, newest first, across all pages.
+        # With prefetch > 0, that many pages are fetched ahead in background.
+
+        return self._paginate(
+            "/users/:id/tweets",
+            f"/users/{id}/tweets",
+            self._make_page_params(
+                self._make_params(expansions, tweet_fields, media_fields, poll_fields),
+                max_results,
+            ),
+            "pagination_token",
+            self._parse_tweets,
+            prefetch,
+        )
+
+    def get_user_mentions(
+        self,
+        id: str,
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+        max_results: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[Tweet.Tweet]:
+        return self._paginate(
+            "/users/:id/mentions",
+            f"/users/{id}/mentions",
+            self._make_page_params(
+                self._make_params(expansions, tweet_fields, media_fields, poll_fields),
+                max_results,
+            ),
+            "pagination_token",
+            self._parse_tweets,
+            prefetch,
+        )
+
+    def search_recent_tweets(
+        self,
+        query: str,
+        expansions: List[Tweet.Expantion] = [],
+        tweet_fields: List[Tweet.Field] = [],
+        media_fields: List[Media.Field] = [],
+        poll_fields: List[Poll.Field] = [],
+        max_results: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[Tweet.Tweet]:
+        return self._paginate(
+            "/tweets/search/recent",
+            "/tweets/search/recent",
+            {
+                **self._make_page_params(
+                    self._make_params(
+                        expansions, tweet_fields, media_fields, poll_fields
+                    ),
+                    max_results,
+                ),
+                "query": query,
+            },
+            "next_token",
+            self._parse_tweets,
+            prefetch,
+        )
+
+    def get_followers(
+        self,
+        id: str,
+        user_fields: List[User.Field] = [],
+        max_results: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[User.User]:
+        return self._paginate(
+            "/users/:id/followers",
+            f"/users/{id}/followers",
+            self._make_page_params(self._make_user_params(user_fields), max_results),
+            "pagination_token",
+            self._parse_users,
+            prefetch,
+        )
+
+    def get_following(
+        self,
+        id: str,
+        user_fields: List[User.Field] = [],
+        max_results: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[User.User]:
+        return self._paginate(
+            "/users/:id/following",
+            f"/users/{id}/following",
+            self._make_page_params(self._make_user_params(user_fields), max_results),
+            "pagination_token",
+            self._parse_users,
+            prefetch,
+        )
+
+    def fetch_many(
+        self,
+        fetch: Callable[[T], R],
+        items: Iterable[T],
+        max_workers: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[Outcome[T, R]]:
+        # Runs a lookup without a batch form, e.g. get_tweet, for each item in
+        # parallel and yields an Outcome per item, with the value or the error
+        # of the item, in input order or as completed. A failed item does not
+        # stop the others.
+        #
+        #   for outcome in client.fetch_many(client.get_user_by_username, names):
+        #
+        # Workers share this client, so its connection pool, rate_limiter,
+        # retry and circuit_breaker apply to all of them. max_workers defaults
+        # to pool_maxsize, since connections beyond it are not kept alive.
+
+        return fan_out(fetch, items, max_workers or self.__pool_maxsize, ordered)
+
+    def _request(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, str]],
+        method: str = "GET",
+        body: Optional[Dict] = None,
+    ) -> Dict:
+        attempt: int = 0
+        while True:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before(endpoint)
+
+            try:
+                res_json: Dict = self._attempt(endpoint, path, params, method, body)
+            except Exception as e:
+                if self.circuit_breaker is not None:
+                    if is_transient(e):
+                        self.circuit_breaker.failure(endpoint)
+                    else:
+                        self.circuit_breaker.success(endpoint)
+
+                delay: Optional[float] = (
+                    self.retry.delay(attempt, e, method)
+                    if self.retry is not None
+                    else None
+                )
+                if self.retry is None or delay is None:
+                    raise
+                logger.warning(f"Retrying {endpoint} in {delay:.2f}s: {e}")
+                self.retry.sleep(delay)
+                attempt += 1
+                continue
+
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.success(endpoint)
+            return res_json
+
+    def _attempt(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, str]],
+        method: str,
+        body: Optional[Dict],
+    ) -> Dict:
+        metrics: Optional[RequestMetrics] = (
+            RequestMetrics(endpoint, method)
+            if self.instrumentation is not None
+            else None
+        )
+        started: float = time.perf_counter()
+        try:
+            if self.rate_limiter:
+                self.rate_limiter.acquire(endpoint)
+
+            sent: float = time.perf_counter()
+            if metrics is not None:
+                metrics.wait = sent - started
+            response: Response = self._send(method, path, params, body)
+            if metrics is not None:
+                metrics.total = time.perf_counter() - sent
+                metrics.status = response.status_code
+                # requests only measures until the headers were parsed.
+                metrics.ttfb = response.elapsed.total_seconds()
+                metrics.response_bytes = len(response.content)
+                metrics.read_headers(response.headers)
+
+            if self.rate_limiter:
+                self.rate_limiter.update(
+                    endpoint, response.headers, response.status_code
+                )
+
+            if response.status_code not in (200, 201):
+                raise Error.response_error(
+                    endpoint, response.status_code, response.text, response.headers
+                )
+
+            decoding: float = time.perf_counter()
+            res_json: Dict = self.__loads(response.content)
+            if metrics is not None:
+                metrics.decode = time.perf_counter() - decoding
+        except Exception as e:
+            if metrics is not None and metrics.status == 0:
+                metrics.error = type(e).__name__
+            raise
+        finally:
+            if metrics is not None and self.instrumentation is not None:
+                self.instrumentation.emit(metrics)
+
+        # Formatting a whole response is costly, so only when it is logged.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(res_json)
+
+        return res_json
+
+    def _call(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, str]],
+        parse: Callable[[Dict], T],
+    ) -> Tuple[Dict, T]:
+        # Requests and parses the response, reporting the parse time with the
+        # metrics of the request.
+        if self.instrumentation is None:
+            res_json: Dict = self._request(endpoint, path, params)
+            return res_json, parse(res_json)
+
+        with self.instrumentation.defer() as deferred:
+            res_json = self._request(endpoint, path, params)
+
+        started: float = time.perf_counter()
+        try:
+            return res_json, parse(res_json)
+        finally:
+            self.instrumentation.flush(deferred, time.perf_counter() - started)
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, str]] = None,
+        body: Optional[Dict] = None,
+        stream: bool = False,
+    ) -> Response:
+        return self.__session.request(
+            method,
+            f"{self.__API_URL}{path}",
             params=params,
+            json=body,
             headers=self.__REQUEST_HEADERS,
+            timeout=self.__timeout,
+            stream=stream,
         )
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Request returned an error: {response.status_code} {response.text}"
+    def _fetch_tweet(self, id: str, params: Optional[Dict[str, str]]) -> Tweet.Tweet:
+        tweet: Tweet.Tweet
+        stored: Optional[Dict] = None
+        if self.disk_cache is not None:
+            stored = self.disk_cache.get("/tweets/:id", id, params)
+        if stored is not None:
+            tweet = self._parse_tweet_response(stored)
+        else:
+            res_json, tweet = self._call(
+                "/tweets/:id", f"/tweets/{id}", params, self._parse_tweet_response
             )
+            self._store_tweets(params, res_json)
 
-        res_json = json.loads(response.text)
-        logger.debug(res_json)
+        if self.cache is not None:
+            self.cache.set("/tweets/:id", id, params, tweet)
 
-        return User.User(**res_json["data"])
+        return tweet
 
-    def get_user_by_username(
-        self, username: str, user_fields: List[User.Field] = []
+    def _fetch_user(
+        self, endpoint: str, key: str, path: str, params: Optional[Dict[str, str]]
     ) -> User.User:
-        params: Optional[Dict[str, str]] = None
-        if user_fields:
-            params = {}
-            params["user.fields"] = ",".join(list(map(str, user_fields)))
+        user: User.User
+        stored: Optional[Dict] = None
+        if self.disk_cache is not None:
+            stored = self.disk_cache.get(endpoint, key, params)
+        if stored is not None:
+            user = self._parse_user_response(stored)
+        else:
+            res_json, user = self._call(
+                endpoint, path, params, self._parse_user_response
+            )
+            self._store_users(params, res_json)
 
-        response: Response = requests.get(
-            f"{self.__API_URL}/users/by/username/{username}",
-            params=params,
-            headers=self.__REQUEST_HEADERS,
+        self._cache_user(params, user)
+
+        return user
+
+    def _store_tweets(self, params: Optional[Dict[str, str]], res_json: Dict) -> None:
+        # Stores each tweet of a response with only its own includes.
+        if self.disk_cache is None:
+            return
+
+        data: Union[Dict, List[Dict]] = res_json.get("data", [])
+        self.disk_cache.set_many(
+            "/tweets/:id",
+            params,
+            {
+                tweet["id"]: {
+                    "data": tweet,
+                    "includes": select_includes(tweet, res_json.get("includes")),
+                }
+                for tweet in ([data] if isinstance(data, dict) else data)
+            },
+        )
+
+    def _store_users(self, params: Optional[Dict[str, str]], res_json: Dict) -> None:
+        # Users are stored by ID and by username so either lookup can hit.
+        if self.disk_cache is None:
+            return
+
+        data: Union[Dict, List[Dict]] = res_json.get("data", [])
+        users: List[Dict] = [data] if isinstance(data, dict) else data
+        self.disk_cache.set_many(
+            "/users/:id", params, {user["id"]: {"data": user} for user in users}
+        )
+        self.disk_cache.set_many(
+            "/users/by/username/:username",
+            params,
+            {user["username"].lower(): {"data": user} for user in users},
         )
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Request returned an error: {response.status_code} {response.text}"
+    def _paginate(
+        self,
+        endpoint: str,
+        path: str,
+        params: Dict[str, str],
+        token_name: str,
+        parse: Callable[[Dict], List[T]],
+        prefetch: int,
+    ) -> Iterator[T]:
+        # Pages are parsed as they are fetched, i.e. on the prefetch thread.
+        def fetch_page(next_token: Optional[str]) -> Dict:
+            res_json, items = self._call(
+                endpoint, path, with_token(params, token_name, next_token), parse
             )
+            return {"data": items, "meta": res_json.get("meta", {})}
 
-        res_json = json.loads(response.text)
-        logger.debug(res_json)
+        return paginate(fetch_page, lambda page: page["data"], prefetch)
 
-        return User.User(**res_json["data"])
+    def _parse_tweets(self, res_json: Dict) -> List[Tweet.Tweet]:
+        includes: Includes = self._parse_includes(res_json)
 
-    def _make_params(
+        return [
+            self._parse_tweet(data, includes, self.lazy, self.identity_map)
+            for data in res_json.get("data", [])
+        ]
+
+    def _parse_users(self, res_json: Dict) -> List[User.User]:
+        return [
+            self._parse_user(data, self.identity_map)
+            for data in res_json.get("data", [])
+        ]
+
+    def _parse_tweet_response(self, res_json: Dict) -> Tweet.Tweet:
+        check_data(res_json)
+        return self._parse_tweet(
+            res_json["data"],
+            self._parse_includes(res_json),
+            self.lazy,
+            self.identity_map,
+        )
+
+    def _parse_user_response(self, res_json: Dict) -> User.User:
+        check_data(res_json)
+        return self._parse_user(res_json["data"], self.identity_map)
+
+    def _parse_includes(self, res_json: Dict) -> Includes:
+        return Includes(res_json.get("includes"), self.lazy, self.identity_map)
+
+    def _coalesce(
         self,
+        endpoint: str,
+        key: str,
+        params: Optional[Dict[str, str]],
+        fetch: Callable[[], T],
+    ) -> T:
+        if self.__single_flight is None:
+            return fetch()
+
+        return self.__single_flight.do((endpoint, key, make_field_set(params)), fetch)
+
+    def _cache_user(self, params: Optional[Dict[str, str]], user: User.User) -> None:
+        # Users are cached by ID and by username so either lookup can hit.
+        if self.cache is not None:
+            self.cache.set("/users/:id", user.id, params, user)
+            self.cache.set(
+                "/users/by/username/:username", user.username.lower(), params, user
+            )
+
+    @staticmethod
+    def _parse_tweet(
+        data: Dict,
+        includes: Optional[Includes] = None,
+        lazy: bool = False,
+        identity_map: Optional[IdentityMap] = None,
+    ) -> Tweet.Tweet:
+        # Build one Includes per response and share it between its tweets.
+        tweet: Tweet.Tweet = Tweet.Tweet(**data, lazy=lazy)
+        if identity_map is not None:
+            tweet = identity_map.tweet(tweet)
+        if includes is not None:
+            includes.resolve(tweet)
+
+        return tweet
+
+    @staticmethod
+    def _parse_user(
+        data: Dict, identity_map: Optional[IdentityMap] = None
+    ) -> User.User:
+        user: User.User = User.User(**data)
+        if identity_map is not None:
+            user = identity_map.user(user)
+
+        return user
+
+    @staticmethod
+    def _make_user_params(user_fields: List[User.Field]) -> Optional[Dict[str, str]]:
+
+        if not user_fields:
+            return None
+
+        return {"user.fields": ",".join(list(map(str, user_fields)))}
+
+    @staticmethod
+    def _make_page_params(
+        params: Optional[Dict[str, str]], max_results: Optional[int]
+    ) -> Dict[str, str]:
+
+        if max_results is None:
+            return {**(params or {})}
+
+        return {**(params or {}), "max_results": str(max_results)}
+
+    @staticmethod
+    def _make_params(
         expansions: List[Tweet.Expantion],
         tweet_fields: List[Tweet.Field],
         media_fields: List[Media.Field],
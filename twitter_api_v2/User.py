@@ -1,10 +1,10 @@
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from twitter_api_v2 import Entity
 from twitter_api_v2.Metric import Metric
-from twitter_api_v2.util import get_additional_field
+from twitter_api_v2.util import get_additional_field, slots_from_dict, slots_to_dict
 
 
 class Field(Enum):
@@ -26,6 +26,8 @@ class Field(Enum):
 
 
 class Description:
+    __slots__ = ("text", "cashtags", "hashtags", "mentions", "urls")
+
     def __init__(
         self,
         text: str = "",
@@ -40,6 +42,8 @@ class Description:
 
 
 class PublicMetric(Metric):
+    __slots__ = ("followers_count", "following_count", "tweet_count", "listed_count")
+
     def __init__(self, data: Dict[str, int]) -> None:
         self.followers_count: int = data["followers_count"]
         self.following_count: int = data["following_count"]
@@ -47,7 +51,38 @@ class PublicMetric(Metric):
         self.listed_count: int = data["listed_count"]
 
 
+# Fields which to_dict() keeps as they are
+PLAIN_FIELDS: Tuple[str, ...] = (
+    "id",
+    "name",
+    "username",
+    "location",
+    "pinned_tweet_id",
+    "profile_image_url",
+    "protected",
+    "verified",
+    "withheld",
+)
+
+
 class User:
+    __slots__ = (
+        "id",
+        "name",
+        "username",
+        "created_at",
+        "description",
+        "location",
+        "pinned_tweet_id",
+        "profile_image_url",
+        "protected",
+        "public_metrics",
+        "url",
+        "verified",
+        "withheld",
+        "__weakref__",
+    )
+
     def __init__(self, id: str, name: str, username: str, *args, **kwargs) -> None:
         self.id: str = id
         self.name: str = name
@@ -141,3 +176,59 @@ class User:
 
         # TODO: Check https://help.twitter.com/en/rules-and-policies/tweet-withheld-by-country
         self.withheld: Optional[Dict] = None
+
+    def update(self, other: "User") -> None:
+        # Takes the fields other has, keeping the ones it was fetched without.
+        for name in self.__slots__:
+            if not name.startswith("_") and (value := getattr(other, name)) is not None:
+                setattr(self, name, value)
+
+    def to_dict(self) -> Dict:
+        # The fields which are set, as plain values for JSON or msgpack.
+        data: Dict = {
+            name: value
+            for name in PLAIN_FIELDS
+            if (value := getattr(self, name)) is not None
+        }
+        if self.created_at is not None:
+            data["created_at"] = self.created_at.isoformat()
+        if self.description is not None:
+            data["description"] = {
+                "text": self.description.text,
+                **Entity.lists_to_dict(self.description),
+            }
+        if self.public_metrics is not None:
+            data["public_metrics"] = slots_to_dict(self.public_metrics)
+        if self.url is not None:
+            data["url"] = (
+                self.url
+                if isinstance(self.url, str)
+                else Entity.ARGUMENTS["urls"](self.url)
+            )
+        return data
+
+    @staticmethod
+    def from_dict(data: Dict) -> "User":
+        # Rebuilds a user of to_dict() without parsing its fields again.
+        user: User = User.__new__(User)
+        for name in PLAIN_FIELDS:
+            setattr(user, name, data.get(name))
+
+        user.created_at = None
+        if (created_at := data.get("created_at")) is not None:
+            user.created_at = datetime.fromisoformat(created_at)
+
+        user.description = None
+        if (description := data.get("description")) is not None:
+            user.description = Description(description["text"])
+            Entity.lists_from_dict(user.description, description)
+
+        user.public_metrics = None
+        if (public_metrics := data.get("public_metrics")) is not None:
+            user.public_metrics = slots_from_dict(PublicMetric, public_metrics)
+
+        user.url = data.get("url")
+        if user.url is not None and not isinstance(user.url, str):
+            user.url = Entity.Url(*user.url)
+
+        return user
@@ -1,4 +1,7 @@
-from typing import Any, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type, TypeVar
+
+T = TypeVar("T")
 
 
 def get_additional_field(data: dict, key: str, converter=None) -> Optional[Any]:
@@ -10,3 +13,30 @@ def get_additional_field(data: dict, key: str, converter=None) -> Optional[Any]:
             return data[key]
     else:
         return None
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    iterator: Iterator[T] = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def unique(iterable: Iterable[T]) -> List[T]:
+    return list(dict.fromkeys(iterable))
+
+
+def slots_to_dict(obj: Any) -> Dict[str, Any]:
+    # The set slots of a flat object, e.g. an Entity.Url, by name.
+    return {
+        name: value
+        for name in obj.__slots__
+        if (value := getattr(obj, name)) is not None
+    }
+
+
+def slots_from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+    # Rebuilds an object of slots_to_dict() without running its __init__.
+    obj: T = cls.__new__(cls)  # type: ignore
+    for name in cls.__slots__:  # type: ignore
+        setattr(obj, name, data.get(name))
+    return obj